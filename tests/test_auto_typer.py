@@ -0,0 +1,19 @@
+"""minimal_edit: what to retype when a draft is replaced."""
+from voxflow.auto_typer import minimal_edit
+
+
+def test_shared_prefix_is_kept():
+    assert minimal_edit("Ala ma kota", "Ala ma psa") == (4, "psa")
+
+
+def test_identical_text_needs_nothing():
+    assert minimal_edit("tekst", "tekst") == (0, "")
+
+
+def test_extension_only_types_the_tail():
+    assert minimal_edit("Ala", "Ala ma kota.") == (0, " ma kota.")
+
+
+def test_nothing_in_common_replaces_everything():
+    assert minimal_edit("abc", "xyz") == (3, "xyz")
+    assert minimal_edit("", "nowy") == (0, "nowy")
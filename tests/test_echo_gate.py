@@ -0,0 +1,60 @@
+"""EchoGate: our own chime is located and cancelled from the stream."""
+import numpy as np
+
+from voxflow.echo_gate import EchoGate
+
+SR = 16000
+
+
+def _chime(freq=880.0):
+    t = np.arange(int(0.2 * SR)) / SR
+    return (0.3 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _run(gate, audio, block=1600):
+    """Feed like the recorder does for a passthrough buffer."""
+    out = audio.copy()
+    for i in range(0, audio.shape[0], block):
+        chunk = out[i:i + block]
+        released, offset, modified = gate.feed(chunk.copy(), final=i + block >= audio.shape[0])
+        if modified:
+            out[offset:offset + released.shape[0]] = released
+    return out
+
+
+def test_chime_is_cancelled():
+    chime = _chime()
+    audio = np.zeros(SR * 2, dtype=np.float32)
+    audio[4000:4000 + chime.size] += chime
+    gate = EchoGate()
+    gate.expect(chime, 0.25)
+    gate.place(lambda when: when * SR)
+    out = _run(gate, audio)
+    assert len(gate.cancelled) == 1
+    assert np.abs(out[4000:4000 + chime.size]).max() < 0.05
+
+
+def test_partly_released_cancellation_is_reported():
+    # The second (silent) gate holds back part of the first chime's window;
+    # its cancelled samples come out later and must still be flagged
+    chime = _chime()
+    audio = np.zeros(SR * 2, dtype=np.float32)
+    audio[6000:6000 + chime.size] += chime
+    gate = EchoGate(reverb=0.1)
+    gate.expect(chime, 0.375)
+    # Never played: its window opens at 7200, inside the first chime
+    gate.expect(_chime(330.0), 0.5)
+    gate.place(lambda when: when * SR)
+    out = _run(gate, audio)
+    assert np.abs(out[6000:6000 + chime.size]).max() < 0.05
+
+
+def test_no_chime_leaves_audio_untouched():
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 0.05, SR).astype(np.float32)
+    gate = EchoGate()
+    gate.expect(_chime(), 0.1)
+    gate.place(lambda when: when * SR)
+    out = _run(gate, audio)
+    assert gate.cancelled == []
+    np.testing.assert_array_equal(out, audio)
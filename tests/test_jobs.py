@@ -0,0 +1,31 @@
+"""TranscriptionQueue delivers results in submission order."""
+import threading
+import time
+
+from voxflow.jobs import TranscriptionQueue
+
+
+def test_results_arrive_in_submission_order():
+    delivered = []
+    done = threading.Event()
+
+    def on_result(job):
+        delivered.append(job.result["n"] if job.error is None else "error")
+        if len(delivered) == 4:
+            done.set()
+
+    jobs = TranscriptionQueue(on_result, workers=2)
+
+    def job(n, delay):
+        def run():
+            time.sleep(delay)
+            if n == 2:
+                raise RuntimeError("decode failed")
+            return {"n": n}
+        return run
+
+    for n, delay in enumerate((0.2, 0.01, 0.05, 0.0)):
+        jobs.submit(job(n, delay))
+    assert done.wait(5)
+    assert delivered == [0, 1, "error", 3]
+    assert jobs.depth == 0
@@ -0,0 +1,94 @@
+"""ModelCache eviction rules and the transcriber's model swap."""
+import pytest
+
+from voxflow.model_cache import ModelCache
+from voxflow.transcriber import VoxTranscriber
+
+LARGE = ("large-v3", "int8", "cuda")
+SMALL = ("small", "int8", "cuda")
+BASE = ("base", "int8", "cuda")
+TINY = ("tiny", "int8", "cuda")
+
+
+class FakeModel:
+    """Stands in for a WhisperModel; decoding always fails (warmup logs it)."""
+
+    def __init__(self, key):
+        self.key = key
+
+    def transcribe(self, *args, **kwargs):
+        raise RuntimeError("fake model")
+
+
+def make_cache(budget_mb=0):
+    loads = []
+
+    def load(key):
+        loads.append(key[0])
+        return FakeModel(key)
+
+    return ModelCache(load, budget_mb), loads
+
+
+def test_swap_releases_the_old_model():
+    transcriber = VoxTranscriber(model_size="large-v3", device="cuda")
+    transcriber.models, _loads = make_cache()
+    transcriber.load_model(warmup=False)
+    before = transcriber.models.resident_mb()
+
+    transcriber.swap_model("small")
+
+    assert LARGE not in transcriber.models
+    assert transcriber.models.resident == [SMALL]
+    assert transcriber.models.resident_mb() < before
+
+
+def test_swap_keeps_the_old_model_within_a_budget():
+    transcriber = VoxTranscriber(model_size="small", device="cuda")
+    transcriber.models, _loads = make_cache(budget_mb=8192)
+    transcriber.load_model(warmup=False)
+
+    transcriber.swap_model("base")
+
+    assert transcriber.models.resident == [SMALL, BASE]
+
+
+def test_zero_budget_keeps_one_spare_model():
+    cache, loads = make_cache()
+    cache.get(LARGE, pin=True)
+    cache.get(BASE)
+    cache.get(TINY)  # takes the spare slot from base
+    assert cache.resident == [LARGE, TINY]
+    cache.get(TINY)
+    assert loads == ["large-v3", "base", "tiny"]
+
+
+def test_loading_a_pinned_model_keeps_the_spare():
+    cache, _loads = make_cache()
+    cache.get(LARGE, pin=True)
+    cache.get(BASE)
+    cache.get(SMALL, pin=True)
+    assert cache.resident == [LARGE, BASE, SMALL]
+    cache.unpin(LARGE)  # now two unpinned: only the most recent stays
+    assert cache.resident == [BASE, SMALL]
+
+
+def test_budget_evicts_least_recently_used():
+    cache, _loads = make_cache(budget_mb=1000)
+    cache.get(BASE)
+    cache.get(TINY)
+    cache.get(BASE)  # tiny is now the least recently used
+    cache.get(SMALL)  # 650 MB: tiny has to go
+    assert cache.resident == [BASE, SMALL]
+
+
+def test_refused_load_evicts_nothing(monkeypatch):
+    from voxflow import memory
+    monkeypatch.setattr(memory, "available_mb", lambda: 100)
+    cache, _loads = make_cache()
+    cache.get(TINY)
+    with pytest.raises(RuntimeError):
+        cache.get(("large-v3", "int8", "cpu"), pin=True)
+    assert cache.resident == [TINY]
+    cache.unpin(("large-v3", "int8", "cpu"))
+    assert cache.resident == [TINY]
@@ -0,0 +1,33 @@
+"""Selective re-decoding: weak regions, scoring and splicing."""
+from voxflow import redecode
+
+
+def _seg(start, end, logprob=-0.2, **kwargs):
+    seg = {"start": start, "end": end, "avg_logprob": logprob, "compression_ratio": 1.2,
+           "temperature": 0.0, "no_speech_prob": 0.1, "text": f"{start}"}
+    seg.update(kwargs)
+    return seg
+
+
+def test_weak_run_becomes_one_region_within_neighbours():
+    segments = [_seg(0, 2), _seg(2, 3, -1.2), _seg(3, 4, temperature=0.4), _seg(4, 6)]
+    assert redecode.weak_regions(segments, 6.0) == [(1, 2, 2.0, 4.0)]
+
+
+def test_silence_is_never_weak():
+    assert not redecode.is_weak(_seg(0, 1, -2.0, no_speech_prob=0.9))
+
+
+def test_better_needs_a_higher_score_and_sane_text():
+    old = [_seg(0, 1, -1.2)]
+    assert redecode.better(old, [_seg(0, 1, -0.4)])
+    assert not redecode.better(old, [_seg(0, 1, -1.5)])
+    assert not redecode.better(old, [_seg(0, 1, -0.1, compression_ratio=3.0)])
+    assert not redecode.better(old, [])
+
+
+def test_splice_replaces_the_region():
+    segments = [_seg(0, 1), _seg(1, 2), _seg(2, 3)]
+    new = [_seg(1, 1.5), _seg(1.5, 2)]
+    spliced = redecode.splice(segments, 1, 1, new)
+    assert [s["start"] for s in spliced] == [0, 1, 1.5, 2]
@@ -0,0 +1,57 @@
+"""StreamingVAD spans, including quiet microphones."""
+import numpy as np
+
+from voxflow.vad import StreamingVAD, collect_speech
+
+SR = 16000
+
+
+def _tone(seconds, level, rng):
+    t = np.arange(int(seconds * SR)) / SR
+    return (level * np.sin(2 * np.pi * 220 * t) + rng.normal(0, 0.0003, t.size)).astype(np.float32)
+
+
+def _noise(seconds, rng):
+    return rng.normal(0, 0.0003, int(seconds * SR)).astype(np.float32)
+
+
+def _spans(audio, **kwargs):
+    vad = StreamingVAD(**kwargs)
+    for i in range(0, audio.shape[0], 480):  # ~30 ms blocks, like the recorder
+        vad.process(audio[i:i + 480])
+    vad.flush()
+    return vad.spans_seconds()
+
+
+def test_finds_speech_between_silences():
+    rng = np.random.default_rng(0)
+    audio = np.concatenate([_noise(1, rng), _tone(1, 0.2, rng), _noise(1, rng)])
+    spans = _spans(audio)
+    assert len(spans) == 1
+    start, end = spans[0]
+    assert abs(start - 1.0) < 0.1 and abs(end - 2.0) < 0.1
+
+
+def test_silence_has_no_spans():
+    rng = np.random.default_rng(1)
+    assert _spans(_noise(2, rng), peak_ratio=0.1) == []
+
+
+def test_quiet_mic_needs_peak_ratio():
+    rng = np.random.default_rng(2)
+    audio = np.concatenate([_noise(1, rng), _tone(1, 0.004, rng), _noise(1, rng)])
+    assert _spans(audio, threshold=0.01) == []
+    assert len(_spans(audio, threshold=0.01, peak_ratio=0.1)) == 1
+
+
+def test_short_pause_stays_inside_one_span():
+    rng = np.random.default_rng(3)
+    audio = np.concatenate([_tone(0.5, 0.2, rng), _noise(0.1, rng), _tone(0.5, 0.2, rng)])
+    assert len(_spans(audio)) == 1
+
+
+def test_collect_speech_merges_close_spans():
+    audio = np.arange(SR * 4, dtype=np.float32)
+    out = collect_speech(audio, [(1.0, 1.5), (1.6, 2.0)], pad=0.25)
+    assert out.shape[0] == int(1.5 * SR)
+    assert out[0] == 0.75 * SR
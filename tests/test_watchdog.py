@@ -0,0 +1,37 @@
+"""DecodeWatchdog verdicts on synthetic segments."""
+from voxflow.watchdog import DecodeWatchdog, _phrase_loop
+
+
+def _seg(text, start=0.0, end=1.0, **kwargs):
+    seg = {"text": text, "start": start, "end": end, "compression_ratio": 1.2,
+           "no_speech_prob": 0.1, "avg_logprob": -0.3}
+    seg.update(kwargs)
+    return seg
+
+
+def test_emphatic_word_is_not_a_loop():
+    assert not _phrase_loop("nie nie nie nie".split())
+    assert _phrase_loop(("nie " * 8).split())
+    assert _phrase_loop(("to jest " * 4).split())
+
+
+def test_repeated_segments_stop_the_decode():
+    watchdog = DecodeWatchdog(max_copies=3)
+    assert watchdog.accept(_seg("Dzień dobry.", 0, 1))
+    assert watchdog.accept(_seg("Dzień dobry.", 1, 2))
+    assert not watchdog.accept(_seg("Dzień dobry.", 2, 3))
+    assert watchdog.reason == "repetition"
+    assert watchdog.cut == 1 and watchdog.rewind == 1
+
+
+def test_confident_text_over_silence_is_dropped():
+    watchdog = DecodeWatchdog()
+    assert not watchdog.accept(_seg("Dziękuję za uwagę.", no_speech_prob=0.95, avg_logprob=-0.2))
+    assert not watchdog.tripped and watchdog.dropped == 1
+    assert watchdog.accept(_seg("Dalszy tekst.", 1, 2))
+
+
+def test_high_compression_is_dropped():
+    watchdog = DecodeWatchdog()
+    assert not watchdog.accept(_seg("la la la", compression_ratio=3.0))
+    assert watchdog.reason == "compression"
@@ -8,6 +8,7 @@ import sys
 import threading
 import time
 import math
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -17,11 +18,19 @@ import numpy as np
 
 from voxflow.config import VoxFlowConfig, get_config_dir
 from voxflow.audio_ducker import AudioDucker
+from voxflow.devices import DeviceRegistry
+from voxflow.handsfree import SpeechTrigger
+from voxflow.streaming import StreamingSession
+from voxflow.captions import LiveCaptioner
+from voxflow.jobs import TranscriptionQueue
+from voxflow.langid import EarlyLanguageID
 from voxflow.recorder import AudioRecorder
 from voxflow.transcriber import VoxTranscriber
+from voxflow.worker import RemoteTranscriber
 from voxflow.hotkey_manager import HotkeyManager
-from voxflow.auto_typer import AutoTyper
+from voxflow.auto_typer import AutoTyper, MAX_AUTO_TYPE_LENGTH, minimal_edit
 from voxflow import sounds
+from voxflow import spill
 from voxflow.overlay import RecordingOverlay
 from voxflow import __version__, __author__
 
@@ -78,6 +87,10 @@ PLACEHOLDER = PLACEHOLDER_PREFIX + " — możesz go edytować przed skopiowaniem
 MAX_HISTORY_SAVED = 50   # entries persisted to disk
 MAX_HISTORY_SHOWN = 10   # entries rendered in the UI
 
+# A two-pass correction is typed into the window only this soon after the
+# draft (s) — later, focus has likely moved on and the text stays as is
+REFINE_EDIT_WINDOW_S = 20.0
+
 
 def _blend(hex_color: str, target: str, factor: float) -> str:
     """Blend hex_color towards target (another hex) by factor 0–1."""
@@ -118,7 +131,11 @@ class VoxFlowApp(ctk.CTk):
 
         # ─── State ────────────────────────────────────────────────
         self._recording = False
-        self._processing = False
+        self._stopping = False  # recorder still capturing the tail
+        self._reopen_after_stop = False  # stream settings changed mid-recording
+        self._typing_thread: Optional[threading.Thread] = None
+        self._typed_count = 0  # texts auto-typed so far
+        self._refining: dict[int, dict] = {}  # refine job seq → its draft
         self._level = 0.0
         self._phase = 0.0
         self._history: list[dict] = []
@@ -131,29 +148,92 @@ class VoxFlowApp(ctk.CTk):
         self._last_timer_text = ""
 
         # ─── Engine ───────────────────────────────────────────────
+        # Device list comes from the last session's cache; the registry
+        # rescans in the background once services start.
+        self.devices = DeviceRegistry(
+            on_change=lambda devs: self.after(0, lambda: self._on_devices_changed(devs)),
+        )
+        self._audio_devices = self.devices.devices
+        self._rescan_requested = False
+        self._hands_free_rec = False  # current recording was started by voice
+        self._profile: Optional[dict] = None  # hotkey profile of the current recording
+        self._langid: Optional[EarlyLanguageID] = None
+        self._stream_session: Optional[StreamingSession] = None
         self.recorder = AudioRecorder(
-            sample_rate=self.config.sample_rate,
+            capture_rate=None if self.config.capture_native_rate else self.config.sample_rate,
             channels=self.config.channels,
             silence_threshold=self.config.silence_threshold,
             silence_duration=self.config.silence_duration,
-            max_duration=self.config.max_recording_duration,
+            max_duration=self.config.recording_limit,
             device_index=self.config.audio_device_index,
             on_level_change=self._on_level,
             on_device_fallback=self._on_device_fallback,
             on_max_duration=self._on_max_duration,
+            vad_enabled=self.config.vad_enabled,
+            vad_silence_ms=self.config.vad_silence_ms,
+            block_duration=self.config.audio_block_ms / 1000.0,
+            latency=self.config.audio_latency,
+            warm_stream=self._warm_stream_wanted(),
+            preroll=self._preroll_seconds(),
+            tail=self.config.tail_ms / 1000.0,
+            spill=self.config.spill_to_disk,
+            device_info=self.devices.get,
+        )
+        self.devices.quiesce = self._quiesce_audio
+        self.recorder.on_endpoint = lambda: self.after(0, self._on_endpoint)
+
+        self.hands_free = SpeechTrigger(
+            source=self.recorder.recent_audio,
+            stream_rate=lambda: self.recorder.stream_rate,
+            on_speech=lambda: self.after(0, self._on_hands_free_speech),
+            is_paused=lambda: (self._recording or self._stopping
+                               or not self.transcriber.is_loaded),
+            threshold=self.config.silence_threshold,
+            cpu_budget=self.config.hands_free_cpu_budget,
         )
 
-        self.transcriber = VoxTranscriber(
+        # Optionally keep Whisper in its own process (off the GIL, freeable)
+        transcriber_cls = (RemoteTranscriber if self.config.worker_process_enabled
+                           else VoxTranscriber)
+        self.transcriber = transcriber_cls(
             model_size=self.config.model_size,
             device=self.config.device,
             compute_type=self.config.compute_type,
         )
+        # Two-pass mode: fast draft model, always in-process
+        self.drafter = VoxTranscriber(
+            model_size=self.config.draft_model,
+            device=self.config.device,
+            compute_type=self.config.compute_type,
+            num_workers=1,
+        )
+        self._apply_transcriber_settings()
+        # Decodes overlap the next recording, up to the model's worker count
+        self.jobs = TranscriptionQueue(
+            on_result=lambda job: self.after(0, lambda: self._on_job_done(job)),
+            workers=self.transcriber.num_workers,
+        )
+        # Second-pass decodes of typed drafts, one at a time, in order
+        self.refines = TranscriptionQueue(
+            on_result=lambda job: self.after(0, lambda: self._on_refined(job)),
+            workers=1,
+        )
+
+        self.captioner = LiveCaptioner(
+            model_size=self.config.caption_model,
+            compute_type="int8",
+            cpu_budget=self.config.caption_cpu_budget,
+        )
 
         self.hotkey_manager = HotkeyManager(
             hotkey=self.config.hotkey,
             on_press=self._on_hotkey_press,
             on_release=self._on_hotkey_release,
+            on_prepare=self._on_hotkey_prepare,
+            on_prepare_cancel=self._on_hotkey_prepare_cancel,
+            speculative_window=self._speculative_window(),
         )
+        self.profile_hotkeys = self._make_profile_hotkeys()
 
         if _TRAY_AVAILABLE:
             self.tray = TrayManager(
@@ -171,7 +251,6 @@ class VoxFlowApp(ctk.CTk):
         self.ducker = AudioDucker(duck_level=self.config.duck_audio_level)
 
         # ─── Build ────────────────────────────────────────────────
-        self._load_audio_devices()
         self._load_history()
         self._build_ui()
         if self._history:
@@ -191,35 +270,50 @@ class VoxFlowApp(ctk.CTk):
         """Dropdown label for a language code, e.g. '🇵🇱 pl'."""
         return f"{LANG_FLAGS.get(code, '🌍')} {code}"
 
-    def _load_audio_devices(self):
-        """Load list of available audio input devices."""
-        try:
-            self._audio_devices = AudioRecorder.list_devices()
-        except Exception:
-            self._audio_devices = []
+    @contextmanager
+    def _quiesce_audio(self):
+        """Recorder and chimes both off PortAudio for a restart (registry thread)."""
+        with sounds.quiesced() as idle:
+            if not idle:
+                yield False
+                return
+            with self.recorder.quiesced() as ok:
+                yield ok
 
     def _refresh_devices(self):
-        """Re-scan audio hardware and update the microphone dropdown."""
-        if self._recording or self._processing:
-            return
-        try:
-            self._audio_devices = AudioRecorder.refresh_device_list()
-        except Exception:
-            self._audio_devices = []
+        """Ask the device registry for a rescan (🔄 button)."""
+        self._rescan_requested = True
+        self.devices.request_rescan()
+        self.status.configure(text="🔄 Szukam urządzeń audio...", text_color=C["txt2"])
+
+    def _on_devices_changed(self, devices: list[dict]):
+        """Registry finished a scan (startup, hotplug or 🔄) — sync the dropdown."""
+        idx = self.config.audio_device_index
+        if idx >= 0:
+            # PortAudio renumbers devices after a hotplug; follow the
+            # selected microphone by name
+            old = next((d for d in self._audio_devices if d["index"] == idx), None)
+            new = next((d for d in devices if old and d["name"] == old["name"]), None)
+            if new is None and not any(d["index"] == idx for d in devices):
+                idx = -1  # selected device disappeared — use system default
+            elif new is not None:
+                idx = new["index"]
+            if idx != self.config.audio_device_index:
+                self.config.audio_device_index = idx
+                self.config.save()
+                # Reopening a warm stream blocks on PortAudio — not here
+                threading.Thread(target=self._follow_device, args=(idx,), daemon=True).start()
+
+        self._audio_devices = devices
         names = self._get_device_names()
         self.mic_menu.configure(values=names)
-        current = self._get_current_device_label()
-        if current not in names:
-            # Selected device disappeared — fall back to system default
-            current = names[0]
-            self.config.audio_device_index = -1
-            self.config.save()
-            self.recorder.set_device(-1)
-        self.mic_var.set(current)
-        self.status.configure(
-            text=f"🔄 Znaleziono {len(self._audio_devices)} urządzeń audio",
-            text_color=C["ok"],
-        )
+        self.mic_var.set(self._get_current_device_label())
+        if self._rescan_requested and not (self._recording or self._processing):
+            self.status.configure(
+                text=f"🔄 Znaleziono {len(devices)} urządzeń audio",
+                text_color=C["ok"],
+            )
+        self._rescan_requested = False
 
     def _get_device_names(self) -> list[str]:
         """Return device display names for UI dropdown."""
@@ -734,10 +828,61 @@ class VoxFlowApp(ctk.CTk):
         self.vad_var = ctk.BooleanVar(value=self.config.vad_enabled)
         sw_row(inner, "🎯 Detekcja mowy (VAD)", self.vad_var, self._on_vad_toggle)
 
+        self.worker_var = ctk.BooleanVar(value=self.config.worker_process_enabled)
+        sw_row(inner, "🧩 Model w osobnym procesie", self.worker_var,
+               self._on_worker_toggle)
+
+        self.short_ctx_var = ctk.BooleanVar(value=self.config.short_context_enabled)
+        sw_row(inner, "✂️ Krótki kontekst dla krótkich nagrań", self.short_ctx_var,
+               self._on_short_context_toggle)
+
+        self.two_pass_var = ctk.BooleanVar(value=self.config.two_pass_enabled)
+        sw_row(inner, "✏️ Szybki szkic, potem poprawka", self.two_pass_var,
+               self._on_two_pass_toggle)
+
+        self.draft_model_var = ctk.StringVar(value=self.config.draft_model)
+        opt_row(inner, "✏️ Model szkicu", ["tiny", "base", "small"],
+                self.draft_model_var, self._on_draft_model, width=80)
+
+        self.langid_var = ctk.BooleanVar(value=self.config.early_language_id)
+        sw_row(inner, "🗣️ Rozpoznawaj język już w trakcie mówienia", self.langid_var,
+               self._on_langid_toggle)
+
+        self.streaming_var = ctk.BooleanVar(value=self.config.streaming_enabled)
+        sw_row(inner, "🌊 Transkrypcja w trakcie mówienia", self.streaming_var,
+               self._on_streaming_toggle)
+
+        self.captions_var = ctk.BooleanVar(value=self.config.live_captions_enabled)
+        sw_row(inner, "💬 Napisy na żywo w nakładce", self.captions_var,
+               self._on_captions_toggle)
+
         self.beam_var = ctk.StringVar(value=str(self.config.beam_size))
         opt_row(inner, "🔬 Beam size (dokładność)", ["1", "3", "5", "8", "10"],
                 self.beam_var, self._on_beam_change, width=80)
 
+        target = self.config.latency_target_s
+        self.latency_var = ctk.StringVar(value=f"{target:g} s" if target else "wył.")
+        opt_row(inner, "⏱️ Docelowy czas transkrypcji", ["wył.", "1 s", "2 s", "3 s", "5 s"],
+                self.latency_var, self._on_latency_target, width=80)
+
+        budget = self.config.model_cache_mb
+        self.model_cache_var = ctk.StringVar(
+            value=f"{budget / 1024:g} GB" if budget else "+1 model")
+        opt_row(inner, "🧠 Pamięć na modele", ["+1 model", "2 GB", "4 GB", "8 GB"],
+                self.model_cache_var, self._on_model_cache, width=80)
+
+        self.routing_var = ctk.BooleanVar(value=self.config.routing_enabled)
+        sw_row(inner, "🚦 Krótkie nagrania mniejszym modelem", self.routing_var,
+               self._on_routing_toggle)
+
+        self.redecode_var = ctk.BooleanVar(value=self.config.redecode_weak_enabled)
+        sw_row(inner, "🔁 Popraw niepewne fragmenty", self.redecode_var,
+               self._on_redecode_toggle)
+
+        self.redecode_model_var = ctk.StringVar(value=self.config.redecode_model or "ten sam")
+        opt_row(inner, "🔁 Model poprawek", ["ten sam", "small", "medium", "large-v3"],
+                self.redecode_model_var, self._on_redecode_model, width=80)
+
         self.autocorrect_var = ctk.BooleanVar(value=self.config.auto_correct)
         sw_row(inner, "✨ Autokorekta tekstu", self.autocorrect_var, self._on_autocorrect_toggle)
 
@@ -754,6 +899,22 @@ class VoxFlowApp(ctk.CTk):
                 ["0%", "20%", "40%", "60%"],
                 self.duck_level_var, self._on_duck_level, width=80)
 
+        self.speculative_var = ctk.BooleanVar(value=self.config.speculative_open_enabled)
+        sw_row(inner, "🏎️ Otwieraj mikrofon przy 1. klawiszu skrótu", self.speculative_var,
+               self._on_speculative_toggle)
+
+        self.warm_var = ctk.BooleanVar(value=self.config.warm_stream_enabled)
+        sw_row(inner, "⚡ Mikrofon zawsze gotowy (bez utraty sylab)", self.warm_var,
+               self._on_warm_stream_toggle)
+
+        self.hands_free_var = ctk.BooleanVar(value=self.config.hands_free_enabled)
+        sw_row(inner, "🗣️ Tryb bez rąk (dyktowanie głosem, bez klawisza)",
+               self.hands_free_var, self._on_hands_free_toggle)
+
+        self.spill_var = ctk.BooleanVar(value=self.config.spill_to_disk)
+        sw_row(inner, "💾 Długie nagrania na dysk (odporne na awarie)", self.spill_var,
+               self._on_spill_toggle)
+
         if sys.platform == "win32" and _AUTOSTART_AVAILABLE:
             self.autostart_var = ctk.BooleanVar(value=is_autostart_enabled())
             sw_row(inner, "🚀 Uruchamiaj z Windows", self.autostart_var, self._on_autostart_toggle)
@@ -922,7 +1083,7 @@ class VoxFlowApp(ctk.CTk):
     def _update_rec_timer(self):
         """Show elapsed recording time in the status label (updates 1×/s)."""
         elapsed = int(time.time() - self._rec_start)
-        remaining = int(self.config.max_recording_duration) - elapsed
+        remaining = int(self.config.recording_limit) - elapsed
         mins, secs = divmod(max(0, elapsed), 60)
         if remaining <= 30:
             text = f"🔴 Nagrywam... {mins}:{secs:02d} — koniec za {max(0, remaining)}s!"
@@ -1018,13 +1179,40 @@ class VoxFlowApp(ctk.CTk):
             except (ValueError, IndexError):
                 idx = -1
 
-        self.config.audio_device_index = idx
-        self.config.save()
-        self.recorder.set_device(idx)
-
+        previous = self._get_current_device_label()
         dev_name = label if idx < 0 else label[label.index("]") + 2:]
         self.status.configure(
-            text=f"🎙 Mikrofon: {dev_name[:40]}", text_color=C["ok"]
+            text=f"🎙 Przełączam mikrofon: {dev_name[:40]}...", text_color=C["txt2"]
+        )
+
+        def switch():
+            # Open the new device first: if it fails, the old one stays
+            try:
+                self.recorder.switch_device(idx)
+            except Exception as e:
+                self.after(0, lambda err=str(e): self._on_mic_switch_failed(previous, err))
+                return
+            self.config.audio_device_index = idx
+            self.config.save()
+            self.after(0, lambda: self.status.configure(
+                text=f"🎙 Mikrofon: {dev_name[:40]}", text_color=C["ok"]
+            ))
+
+        threading.Thread(target=switch, daemon=True).start()
+
+    def _follow_device(self, idx: int):
+        """Move the recorder to the renumbered microphone (worker thread)."""
+        try:
+            self.recorder.switch_device(idx)
+        except Exception as e:
+            # Not openable right now: start() retries (and falls back)
+            print(f"[Devices] switching to device {idx} failed: {e}")
+            self.recorder.device_index = idx
+
+    def _on_mic_switch_failed(self, previous: str, err: str):
+        self.mic_var.set(previous)
+        self.status.configure(
+            text=f"❌ Mikrofon niedostępny: {err[:60]}", text_color=C["rec_red"]
         )
 
     def _on_device_fallback(self, fallback_index: int):
@@ -1081,30 +1269,96 @@ class VoxFlowApp(ctk.CTk):
     def _on_hotkey_press(self):
         self.after(0, self._start_rec)
 
+    def _make_profile_hotkeys(self) -> list[HotkeyManager]:
+        """One hold-to-record hotkey per profile (config.profiles)."""
+        managers = []
+        for profile in self.config.profiles:
+            if profile["hotkey"] == self.config.hotkey:
+                print(f"[Profiles] '{profile['hotkey']}' is the main hotkey — profile ignored")
+                continue
+            managers.append(HotkeyManager(
+                hotkey=profile["hotkey"],
+                on_press=lambda p=profile: self.after(0, lambda: self._start_rec(profile=p)),
+                # Only the profile's own key ends its recording
+                on_release=lambda p=profile: self.after(
+                    0, lambda: self._stop_rec() if self._profile is p else None),
+            ))
+        return managers
+
     def _on_hotkey_release(self):
         self.after(0, self._stop_rec)
 
+    def _speculative_window(self) -> float:
+        """Speculation window for combo hotkeys in seconds (0 = disabled)."""
+        if not self.config.speculative_open_enabled:
+            return 0.0
+        return self.config.speculative_window_ms / 1000.0
+
+    def _on_hotkey_prepare(self):
+        """First key of a combo hotkey is down (hotkey thread) — pre-open the mic."""
+        if self._recording or self._stopping or self._capturing_hotkey:
+            return
+        if not self.transcriber.is_loaded or self.jobs.is_full:
+            return
+        self.recorder.prepare()
+
+    def _on_hotkey_prepare_cancel(self):
+        """Combo wasn't completed in time — drop the pre-opened stream."""
+        self.recorder.discard_prepared()
+
+    @property
+    def _processing(self) -> bool:
+        """A recording is being wrapped up or transcriptions are pending."""
+        return self._stopping or self.jobs.depth > 0
+
     def _toggle_recording(self):
-        if self._processing:
+        if self._stopping:
             return
         if self._recording:
             self._stop_rec()
         else:
             self._start_rec()
 
+    def _on_hands_free_speech(self):
+        """Listener heard speech start — begin a voice-triggered recording."""
+        if not self.config.hands_free_enabled or self._capturing_hotkey:
+            return
+        if self._recording or self._stopping:
+            return
+        self._start_rec(hands_free=True)
+
+    def _on_endpoint(self):
+        """Recorder saw silence_duration of silence after speech."""
+        if self._recording and self._hands_free_rec:
+            self._stop_rec()
+
     def _on_max_duration(self):
         """Recording hit the time limit (called from the audio thread)."""
         self.after(0, self._stop_rec)
 
-    def _start_rec(self):
-        if self._recording or self._processing or self._capturing_hotkey:
+    def _start_rec(self, hands_free: bool = False, profile: Optional[dict] = None):
+        if self._recording or self._stopping or self._capturing_hotkey:
+            self.recorder.discard_prepared()
+            return
+        if self.jobs.is_full:
+            self.recorder.discard_prepared()
+            self.status.configure(
+                text=f"⏳ W kolejce {self.jobs.depth} nagrania — poczekaj chwilę...",
+                text_color=C["warn"],
+            )
             return
         if not self.transcriber.is_loaded:
+            self.recorder.discard_prepared()
             self.status.configure(
                 text="⏳ Model AI jeszcze się ładuje — spróbuj za chwilę...",
                 text_color=C["warn"],
             )
             return
+        # Voice-started recordings end themselves after a pause
+        self.recorder.endpoint_silence = self.config.silence_duration if hands_free else None
+        self._hands_free_rec = hands_free
+        self._profile = profile
+        options = self._decode_options(profile)
         try:
             self.recorder.start()
         except Exception as e:
@@ -1114,67 +1368,242 @@ class VoxFlowApp(ctk.CTk):
             if self.config.play_sounds:
                 sounds.play("error")
             return
+        if self.recorder.start_latency is not None:
+            print(f"[Recorder] press-to-capture latency: {self.recorder.start_latency * 1000:.1f} ms")
+        if self.config.streaming_enabled and self.config.vad_enabled:
+            self._stream_session = StreamingSession(
+                self.transcriber, self.recorder,
+                min_chunk=self.config.stream_chunk_s,
+                max_chunk=self.config.stream_chunk_s * 2.5,
+                **options,
+            )
+            self._stream_session.start()
+        self._langid = None
+        if self.config.early_language_id and options["language"] == "auto":
+            session = self._stream_session
+            self._langid = EarlyLanguageID(
+                self.transcriber, self.recorder, self.config.language_candidates,
+                model_size=options["model_size"],
+                on_language=session.set_language if session else None,
+            )
+            self._langid.start()
         self._recording = True
         self._rec_start = time.time()
         self._last_timer_text = ""
-        self.status.configure(text="🔴 Nagrywam... Mów teraz!", text_color=C["rec_red"])
+        label = f" ({self._profile_label(profile)})" if profile else ""
+        self.status.configure(text=f"🔴 Nagrywam{label}... Mów teraz!", text_color=C["rec_red"])
         if self.tray:
             self.tray.set_recording(True)
         if self.config.duck_audio_enabled:
             self.ducker.duck()
+        if self.config.live_captions_enabled and self.captioner.is_loaded:
+            self.overlay.captions = True
+            self.overlay.expected_language = (
+                None if options["language"] == "auto" else options["language"]
+            )
+            self.captioner.start(
+                self.recorder, options["language"],
+                on_caption=lambda s, t, lang: self.after(
+                    0, lambda: self.overlay.set_caption(s, t, lang)
+                ),
+            )
+        else:
+            self.overlay.captions = False
         if self.config.play_sounds:
-            sounds.play("start")
+            played = sounds.play("start")
+            if played is not None:
+                self.recorder.expect_playback(
+                    sounds.waveform("start", self.recorder.sample_rate), played
+                )
         self.overlay.show(self)
 
     def _stop_rec(self):
         if not self._recording:
             return
         self._recording = False
-        self._processing = True
+        self._stopping = True
+        # Captions must not compete with the final decode
+        self.captioner.stop()
         if self.tray:
             self.tray.set_recording(False)
         self.ducker.restore()
         self.overlay.hide()
         if self.config.play_sounds:
-            sounds.play("stop")
-        self.status.configure(text="⏳ Transkrybuję...", text_color=C["warn"])
-
-        audio = self.recorder.stop()
-        if audio is None or len(audio) < self.config.sample_rate * 0.3:
-            self._processing = False
+            played = sounds.play("stop")
+            if played is not None:
+                # A warm stream's tail would pick it up
+                self.recorder.expect_playback(
+                    sounds.waveform("stop", self.recorder.sample_rate), played
+                )
+        queued = self.jobs.depth
+        self.status.configure(
+            text=f"⏳ Transkrybuję... (w kolejce: {queued + 1})" if queued else "⏳ Transkrybuję...",
+            text_color=C["warn"],
+        )
+        # recorder.stop() may keep capturing a short tail (warm stream) —
+        # never block the Tk thread on it.
+        langid, self._langid = self._langid, None
+        threading.Thread(target=self._finish_recording,
+                         args=(self._decode_options(self._profile), langid),
+                         daemon=True).start()
+
+    def _finish_recording(self, options: dict, langid: Optional[EarlyLanguageID] = None):
+        self.recorder.last_spill_path = None
+        session, self._stream_session = self._stream_session, None
+        if session:
+            # The next recording may start before this one is decoded
+            session.stop()
+        if langid:
+            langid.stop()  # live audio is gone once the recorder stops
+        try:
+            audio = self.recorder.stop()
+            spans = self.recorder.last_speech_spans
+            spill_path = self.recorder.last_spill_path
+        finally:
+            # Everything this recording needs is captured — the mic is free
+            self._stopping = False
+            if self._reopen_after_stop:
+                self.after(0, self._reopen_warm_stream)
+        if audio is None or len(audio) < self.recorder.sample_rate * 0.3:
+            if session:
+                session.cancel()
+            self.after(0, self._on_too_short)
+            if spill_path is not None:
+                spill.discard(spill_path)
+        else:
+            if spans == [] and session:
+                # No speech heard — nothing was streamed; the full decode
+                # with Whisper's own VAD has the final say
+                session.cancel()
+                session = None
+            self.jobs.submit(lambda: self._transcribe(audio, spans, session, spill_path,
+                                                      options, langid))
+
+    def _on_too_short(self):
+        if not self._recording:
             self.status.configure(text="⚠️ Za krótkie nagranie", text_color=C["warn"])
-            return
 
-        threading.Thread(target=self._transcribe, args=(audio,), daemon=True).start()
+    def _decode_options(self, profile: Optional[dict] = None) -> dict:
+        """Decoding settings shared by full and streaming transcription.
+
+        Read from config, not the Tk variables — callers may run in a
+        background thread and Tk variables are not thread-safe. A hotkey
+        profile overrides model, language and task.
+        """
+        options = {
+            "language": self.config.language,
+            "beam_size": self.config.beam_size,
+            "task": "translate" if self.config.translate_enabled else "transcribe",
+            "auto_correct": self.config.auto_correct,
+            "model_size": None,  # the loaded model
+        }
+        if profile:
+            options.update(language=profile["language"], task=profile["task"],
+                           model_size=profile["model"])
+        return options
 
-    def _transcribe(self, audio: np.ndarray):
+    @staticmethod
+    def _identified_language(langid: EarlyLanguageID, audio: np.ndarray,
+                             speech_spans: Optional[list], options: dict,
+                             session: Optional[StreamingSession]) -> dict:
+        """Fix the language for the decode (and the rest of a streaming session)."""
         try:
-            task = "translate" if self.config.translate_enabled else "transcribe"
+            language, probability, stage = langid.finish(audio, speech_spans)
+        except Exception as e:
+            print(f"[LangID] falling back to Whisper's detection: {e}")
+            return options
+        print(f"[LangID] {language} ({probability:.0%}, {stage}, "
+              f"{langid.detect_time:.2f}s while recording)")
+        if session is not None:
+            session.set_language(language)
+        return dict(options, language=language)
+
+    @staticmethod
+    def _profile_label(profile: dict) -> str:
+        return f"{profile['hotkey'].upper()}: {profile['language']}/{profile['model']}"
+
+    def _transcribe(self, audio: np.ndarray, speech_spans: Optional[list] = None,
+                    session: Optional[StreamingSession] = None,
+                    spill_path: Optional[Path] = None,
+                    options: Optional[dict] = None,
+                    langid: Optional[EarlyLanguageID] = None) -> dict:
+        """Decode one recording (queue worker thread); raises on failure.
+
+        A spill file is discarded only once its text exists — otherwise it
+        is retried on the next start.
+        """
+        def on_progress(m: str):
+            # A newer recording owns the status line while it runs
+            self.after(0, lambda msg=m: self.status.configure(text=msg)
+                       if not self._recording else None)
+
+        if options is None:
+            options = self._decode_options()
+        if langid is not None:
+            options = self._identified_language(langid, audio, speech_spans, options, session)
+        result = None
+        if session is None and self._two_pass_ready():
+            # Draft now; the main model's pass follows once it is typed
+            result = self.drafter.transcribe(
+                audio,
+                vad_enabled=self.config.vad_enabled,
+                on_progress=on_progress,
+                speech_spans=speech_spans,
+                **dict(options, beam_size=1, model_size=None),
+            )
+            result["refine"] = (audio, speech_spans, spill_path, options)
+            return result
+        if session is not None:
+            try:
+                result = session.finish(audio, speech_spans, on_progress=on_progress)
+                print(f"[Streaming] {result['chunks']} chunk(s), "
+                      f"{session.background_time:.2f}s decoded while recording, "
+                      f"{session.tail_time:.2f}s after release")
+            except Exception as e:
+                print(f"[Streaming] falling back to a full decode: {e}")
+        if result is None:
             result = self.transcriber.transcribe(
                 audio,
-                # Read from config, not the Tk variable — this runs in a
-                # background thread and Tk variables are not thread-safe.
-                language=self.config.language,
-                beam_size=self.config.beam_size,
                 vad_enabled=self.config.vad_enabled,
-                auto_correct=self.config.auto_correct,
-                task=task,
-                on_progress=lambda m: self.after(
-                    0, lambda msg=m: self.status.configure(text=msg)
-                ),
+                on_progress=on_progress,
+                speech_spans=speech_spans,
+                **options,
             )
-            self.after(0, lambda: self._on_done(result))
-        except Exception as e:
-            # Bind the message now — the except variable is deleted when
-            # the block exits, so a plain closure would raise NameError.
-            self.after(0, lambda err=str(e): self._on_error(err))
-
-    def _on_done(self, result: dict):
-        self._processing = False
+        if spill_path is not None:
+            spill.discard(spill_path)
+        return result
+
+    def _on_job_done(self, job):
+        """Deliver one queued transcription — called in submission order."""
+        print(f"[Jobs] waited {job.wait:.2f}s, decoded in {job.run_time:.2f}s, "
+              f"{self.jobs.depth} still queued (avg wait {self.jobs.average_wait:.2f}s)")
+        if job.error is not None:
+            self._on_error(str(job.error))
+            return
+        refine = job.result.pop("refine", None)
+        entry = self._on_done(job.result, draft=refine is not None)
+        if refine is not None:
+            audio, spans, spill_path, options = refine
+            refine_job = self.refines.submit(
+                lambda: self._refine_decode(audio, spans, spill_path, options))
+            text = job.result.get("text", "").strip()
+            self._refining[refine_job.seq] = {
+                "entry": entry,
+                "text": text,
+                # Which typed text the draft is; a later one means the
+                # window no longer ends with the draft
+                "typed": self._typed_count if entry and self.config.auto_type_enabled else None,
+                "at": time.monotonic(),
+                "model": self.drafter.model_size,
+            }
+
+    def _on_done(self, result: dict, draft: bool = False) -> Optional[dict]:
+        """Show, copy and type one transcript; returns its history entry."""
         text = result.get("text", "").strip()
         if not text:
-            self.status.configure(text="🤔 Nie rozpoznano mowy", text_color=C["warn"])
-            return
+            if not self._recording and not draft:
+                self.status.configure(text="🤔 Nie rozpoznano mowy", text_color=C["warn"])
+            return None
 
         # Update transcript box (always editable — user can fix before copying)
         self.textbox.configure(state="normal")
@@ -1189,13 +1618,15 @@ class VoxFlowApp(ctk.CTk):
             except Exception:
                 pass
 
-        # Auto-type into active window
+        # Auto-type into active window — after any text still being typed
         if self.config.auto_type_enabled:
-            threading.Thread(
+            self._typing_thread = threading.Thread(
                 target=self._delayed_auto_type,
-                args=(text,),
+                args=(text, self._typing_thread),
                 daemon=True,
-            ).start()
+            )
+            self._typing_thread.start()
+            self._typed_count += 1
 
         lang = result.get("language", "?")
         translated = result.get("translated", False)
@@ -1208,17 +1639,159 @@ class VoxFlowApp(ctk.CTk):
             extras.append("📋")
         if translated:
             extras.append("🌐→EN")
+        if draft:
+            extras.append(f"✏️ szkic ({self.drafter.model_size}), poprawiam...")
+        if self.jobs.depth:
+            extras.append(f"⏳ {self.jobs.depth}")
         extra_str = " • " + " ".join(extras) if extras else ""
-        self.status.configure(
-            text=f"✅ {flag} {lang.upper()} • {dur:.1f}s{extra_str}",
-            text_color=C["ok"],
-        )
+        if not self._recording:
+            self.status.configure(
+                text=f"✅ {flag} {lang.upper()} • {dur:.1f}s{extra_str}",
+                text_color=C["ok"],
+            )
         if self.config.play_sounds:
             sounds.play("done")
 
-        self._add_history(text, lang, dur)
+        return self._add_history(text, lang, dur)
+
+    def _two_pass_ready(self) -> bool:
+        """Draft with the fast model first? Only if it is loaded and differs."""
+        return (self.config.two_pass_enabled and self.drafter.is_loaded
+                and self.drafter.model_size != self.transcriber.model_size)
+
+    def _refine_decode(self, audio: np.ndarray, speech_spans: Optional[list],
+                       spill_path: Optional[Path], options: dict) -> dict:
+        """Second pass of a two-pass recording (refine queue thread).
+
+        The spill file goes either way — the draft already holds the text.
+        """
+        # The point of this pass is the main model — never length-routed
+        options = dict(options, model_size=options["model_size"] or self.transcriber.model_size)
+        try:
+            return self.transcriber.transcribe(
+                audio,
+                vad_enabled=self.config.vad_enabled,
+                speech_spans=speech_spans,
+                **options,
+            )
+        finally:
+            if spill_path is not None:
+                spill.discard(spill_path)
+
+    def _on_refined(self, job):
+        """Replace a typed draft with the main model's text."""
+        ctx = self._refining.pop(job.seq, None)
+        if ctx is None:
+            return
+        print(f"[TwoPass] refined in {job.run_time:.2f}s (waited {job.wait:.2f}s)")
+        if job.error is not None:
+            print(f"[TwoPass] refine failed, keeping the draft: {job.error}")
+            if not (self._recording or self._processing):
+                self.status.configure(text="⚠️ Poprawka nieudana — zostaje szkic",
+                                      text_color=C["warn"])
+            return
+        if ctx["entry"] is None:
+            # The draft found nothing — deliver the main pass as usual
+            self._on_done(job.result)
+            return
 
-    def _delayed_auto_type(self, text: str):
+        draft = ctx["text"]
+        text = job.result.get("text", "").strip()
+        entry = ctx["entry"]
+        entry["draft"] = draft
+        entry["draft_model"] = ctx["model"]
+        if not text or text == draft:
+            self._save_history()
+            if not (self._recording or self._processing):
+                self.status.configure(text="✅ Szkic potwierdzony", text_color=C["ok"])
+            return
+        entry["text"] = text
+        self._save_history()
+        self._refresh_history()
+
+        # The box and clipboard only follow if the user hasn't changed them
+        if self.textbox.get("1.0", "end-1c").strip() == draft:
+            self.textbox.delete("1.0", "end")
+            self.textbox.insert("1.0", text)
+            self._update_text_stats()
+        if self.config.auto_copy_to_clipboard:
+            try:
+                if pyperclip.paste() == draft:
+                    pyperclip.copy(text)
+            except Exception:
+                pass
+
+        erase, tail = minimal_edit(draft, text)
+        in_window = (
+            ctx["typed"] is not None
+            and ctx["typed"] == self._typed_count
+            and time.monotonic() - ctx["at"] <= REFINE_EDIT_WINDOW_S
+            and len(draft) <= MAX_AUTO_TYPE_LENGTH
+        )
+        if in_window:
+            self._typing_thread = threading.Thread(
+                target=self._retype_tail,
+                args=(erase, tail, text, self._typing_thread),
+                daemon=True,
+            )
+            self._typing_thread.start()
+        if not (self._recording or self._processing):
+            where = f"−{erase} +{len(tail)} znaków" if in_window else "tylko w polu tekstu"
+            self.status.configure(text=f"✨ Poprawiono szkic ({where})", text_color=C["ok"])
+
+    def _retype_tail(self, erase: int, tail: str, text: str,
+                     previous: Optional[threading.Thread] = None):
+        if previous is not None:
+            previous.join()  # the draft must be fully typed first
+        try:
+            self.auto_typer.replace_tail(erase, tail, method=self.config.typing_method)
+            if self.config.auto_copy_to_clipboard and self.config.typing_method == "clipboard":
+                pyperclip.copy(text)  # pasting the tail replaced the clipboard
+        except Exception:
+            self.after(0, lambda: self.status.configure(
+                text="⚠️ Poprawka w oknie nieudana — sprawdź fokus okna",
+                text_color=C["warn"],
+            ))
+
+    def _recover_spills(self, leftovers: list):
+        """Transcribe recordings a crash or forced quit left on disk."""
+        for item in leftovers:
+            if len(item["audio"]) < item["sample_rate"] * 0.3:
+                spill.discard(item["path"])
+                continue
+            try:
+                result = self.transcriber.transcribe(
+                    item["audio"],
+                    language=self.config.language,
+                    beam_size=self.config.beam_size,
+                    vad_enabled=self.config.vad_enabled,
+                    auto_correct=self.config.auto_correct,
+                    sample_rate=item["sample_rate"],
+                )
+            except Exception as e:
+                print(f"[Spill] recovery of {item['path'].name} failed: {e}")
+                continue
+            spill.discard(item["path"])
+            if result.get("text", "").strip():
+                self.after(0, lambda r=result: self._on_recovered(r))
+
+    def _on_recovered(self, result: dict):
+        """Show a recovered transcript — never auto-typed, focus is unknown."""
+        text = result["text"].strip()
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("1.0", text)
+        self._update_text_stats()
+        if not (self._recording or self._processing):
+            self.status.configure(
+                text="♻️ Odzyskano przerwane nagranie — tekst poniżej",
+                text_color=C["ok"],
+            )
+        self._add_history(text, result.get("language", "?"), result.get("duration", 0))
+
+    def _delayed_auto_type(self, text: str, previous: Optional[threading.Thread] = None):
+        if previous is not None:
+            previous.join()  # keep typed text in dictation order
         time.sleep(0.15)
         try:
             self.auto_typer.type_text(text, method=self.config.typing_method)
@@ -1229,7 +1802,6 @@ class VoxFlowApp(ctk.CTk):
             ))
 
     def _on_error(self, err: str):
-        self._processing = False
         self.status.configure(text=f"❌ {err[:120]}", text_color=C["rec_red"])
         if self.config.play_sounds:
             sounds.play("error")
@@ -1279,16 +1851,18 @@ class VoxFlowApp(ctk.CTk):
                 pass
         return entry.get("time", "")
 
-    def _add_history(self, text: str, lang: str, dur: float):
-        self._history.insert(0, {
+    def _add_history(self, text: str, lang: str, dur: float) -> dict:
+        entry = {
             "text": text, "language": lang,
             "duration": dur,
             "ts": datetime.now().isoformat(timespec="seconds"),
-        })
+        }
+        self._history.insert(0, entry)
         if len(self._history) > MAX_HISTORY_SAVED:
             self._history = self._history[:MAX_HISTORY_SAVED]
         self._save_history()
         self._refresh_history()
+        return entry
 
     def _refresh_history(self):
         for w in self.hist_frame.winfo_children():
@@ -1361,10 +1935,11 @@ class VoxFlowApp(ctk.CTk):
 
     def _on_model(self, v):
         if v != self.config.model_size:
+            previous = self.config.model_size
             self.config.model_size = v
             self.config.save()
             self.status.configure(text=f"⏳ Ładuję model '{v}'...", text_color=C["warn"])
-            threading.Thread(target=self._reload_model, args=(v,), daemon=True).start()
+            threading.Thread(target=self._reload_model, args=(v, previous), daemon=True).start()
 
     def _on_autotype_toggle(self):
         self.config.auto_type_enabled = self.autotype_var.get()
@@ -1389,11 +1964,142 @@ class VoxFlowApp(ctk.CTk):
     def _on_vad_toggle(self):
         self.config.vad_enabled = self.vad_var.get()
         self.config.save()
+        self.recorder.vad_enabled = self.config.vad_enabled
+
+    def _on_worker_toggle(self):
+        self.config.worker_process_enabled = self.worker_var.get()
+        self.config.save()
+        self.status.configure(
+            text="🧩 Zmiana zadziała po ponownym uruchomieniu VoxFlow",
+            text_color=C["warn"],
+        )
+
+    def _on_short_context_toggle(self):
+        self.config.short_context_enabled = self.short_ctx_var.get()
+        self.config.save()
+        self._apply_transcriber_settings()
+
+    def _apply_transcriber_settings(self):
+        self.transcriber.short_context_max = (
+            self.config.short_context_max_s if self.config.short_context_enabled else 0.0
+        )
+        self.transcriber.batch_threshold = self.config.batch_threshold_s
+        self.transcriber.latency_target = self.config.latency_target_s
+        self.transcriber.watchdog_enabled = self.config.watchdog_enabled
+        self.transcriber.watchdog_retry = self.config.watchdog_retry_tail
+        self.transcriber.redecode_weak = self.config.redecode_weak_enabled
+        self.transcriber.redecode_model = self.config.redecode_model
+        self.transcriber.model_budget_mb = self.config.model_cache_mb
+        self.transcriber.routes = list(self.config.routes) if self.config.routing_enabled else []
+        self.drafter.short_context_max = self.transcriber.short_context_max
+
+    def _on_langid_toggle(self):
+        self.config.early_language_id = self.langid_var.get()
+        self.config.save()
+        if self.config.early_language_id:
+            langs = "/".join(c.upper() for c in self.config.language_candidates)
+            note = "" if self.config.language == "auto" else " (gdy język = auto)"
+            self.status.configure(text=f"🗣️ Wybór spośród: {langs}{note}", text_color=C["txt2"])
+
+    def _on_streaming_toggle(self):
+        self.config.streaming_enabled = self.streaming_var.get()
+        self.config.save()
+        if self.config.streaming_enabled and not self.config.vad_enabled:
+            self.status.configure(
+                text="🌊 Transkrypcja w trakcie mówienia wymaga detekcji mowy (VAD)",
+                text_color=C["warn"],
+            )
+
+    def _on_captions_toggle(self):
+        self.config.live_captions_enabled = self.captions_var.get()
+        self.config.save()
+        if self.config.live_captions_enabled and not self.captioner.is_loaded:
+            self.status.configure(
+                text=f"⏳ Ładowanie modelu napisów '{self.config.caption_model}'...",
+                text_color=C["warn"],
+            )
+            threading.Thread(target=self._load_captioner, daemon=True).start()
+
+    def _load_captioner(self, announce: bool = True):
+        """Load the small caption model (background thread)."""
+        try:
+            self.captioner.load()
+        except Exception as e:
+            print(f"[Captions] model load failed: {e}")
+            return
+        if announce:
+            self.after(0, lambda: self.status.configure(
+                text="💬 Napisy na żywo gotowe", text_color=C["ok"]
+            ) if not (self._recording or self._processing) else None)
+
+    def _on_two_pass_toggle(self):
+        self.config.two_pass_enabled = self.two_pass_var.get()
+        self.config.save()
+        if self.config.two_pass_enabled and not self.drafter.is_loaded:
+            self.status.configure(
+                text=f"⏳ Ładowanie modelu szkicu '{self.config.draft_model}'...",
+                text_color=C["warn"],
+            )
+            threading.Thread(target=self._load_drafter, daemon=True).start()
+
+    def _on_draft_model(self, v: str):
+        if v == self.config.draft_model:
+            return
+        self.config.draft_model = v
+        self.config.save()
+        if self.config.two_pass_enabled:
+            self.status.configure(text=f"⏳ Ładowanie modelu szkicu '{v}'...",
+                                  text_color=C["warn"])
+            threading.Thread(target=self._load_drafter, daemon=True).start()
+        else:
+            self.drafter.unload_model()
+            self.drafter.model_size = v
+
+    def _load_drafter(self, announce: bool = True):
+        """Load the two-pass draft model (background thread)."""
+        try:
+            self.drafter.load_model(self.config.draft_model)
+        except Exception as e:
+            print(f"[TwoPass] draft model load failed: {e}")
+            return
+        if announce:
+            self.after(0, lambda: self.status.configure(
+                text="✏️ Model szkicu gotowy", text_color=C["ok"]
+            ) if not (self._recording or self._processing) else None)
 
     def _on_beam_change(self, v):
         self.config.beam_size = int(v)
         self.config.save()
 
+    def _on_latency_target(self, v: str):
+        self.config.latency_target_s = 0.0 if v == "wył." else float(v.split()[0])
+        self.config.save()
+        self._apply_transcriber_settings()
+
+    def _on_model_cache(self, v: str):
+        self.config.model_cache_mb = 0 if v == "+1 model" else int(float(v.split()[0]) * 1024)
+        self.config.save()
+        self._apply_transcriber_settings()
+        if self.transcriber.is_loaded:
+            threading.Thread(target=self._preload_models, daemon=True).start()
+
+    def _on_routing_toggle(self):
+        self.config.routing_enabled = self.routing_var.get()
+        self.config.save()
+        self._apply_transcriber_settings()
+        if self.config.routing_enabled and self.transcriber.is_loaded:
+            threading.Thread(target=self._preload_models, daemon=True).start()
+
+    def _on_redecode_toggle(self):
+        self.config.redecode_weak_enabled = self.redecode_var.get()
+        self.config.save()
+        self._apply_transcriber_settings()
+
+    def _on_redecode_model(self, v: str):
+        self.config.redecode_model = "" if v == "ten sam" else v
+        self.config.save()
+        self._apply_transcriber_settings()
+
     def _on_autocorrect_toggle(self):
         self.config.auto_correct = self.autocorrect_var.get()
         self.config.save()
@@ -1450,21 +2156,70 @@ class VoxFlowApp(ctk.CTk):
                 text_color=C["txt2"],
             )
 
-    def _reload_model(self, sz):
+    def _on_speculative_toggle(self):
+        self.config.speculative_open_enabled = self.speculative_var.get()
+        self.config.save()
+        self.hotkey_manager.speculative_window = self._speculative_window()
+
+    def _on_spill_toggle(self):
+        self.config.spill_to_disk = self.spill_var.get()
+        self.config.save()
+        # Takes effect from the next recording
+        self.recorder.spill = self.config.spill_to_disk
+        self.recorder.max_duration = self.config.recording_limit
+        if self.config.spill_to_disk:
+            mins = int(self.config.recording_limit // 60)
+            self.status.configure(
+                text=f"💾 Nagrania zapisywane na dysk — limit {mins} min",
+                text_color=C["ok"],
+            )
+        else:
+            self.status.configure(
+                text="💾 Nagrania w pamięci RAM", text_color=C["txt2"]
+            )
+
+    def _on_warm_stream_toggle(self):
+        self.config.warm_stream_enabled = self.warm_var.get()
+        self.config.save()
+        self.recorder.warm_stream = self._warm_stream_wanted()
+        if self.config.warm_stream_enabled:
+            self._open_warm_stream()
+            self.status.configure(
+                text="⚡ Mikrofon gotowy — nagranie startuje bez opóźnienia",
+                text_color=C["ok"],
+            )
+        else:
+            # Mid-recording (or tail) stop() closes the cold stream itself
+            if not (self._recording or self._stopping) and not self.recorder.warm_stream:
+                self.recorder.close()
+            self.status.configure(
+                text="⚡ Mikrofon otwierany tylko podczas nagrywania",
+                text_color=C["txt2"],
+            )
+
+    def _reload_model(self, sz, previous=None):
+        """Swap in model `sz`; the current one keeps serving until it's warm."""
         try:
-            self.transcriber.load_model(
+            self.transcriber.swap_model(
                 sz,
                 on_progress=lambda m: self.after(
                     0, lambda msg=m: self.status.configure(text=msg)
                 ),
             )
         except Exception as e:
-            self.after(
-                0,
-                lambda err=str(e): self.status.configure(
-                    text=f"❌ Model: {err[:50]}", text_color=C["rec_red"]
-                ),
+            self.after(0, lambda err=str(e): self._on_model_swap_failed(err, previous))
+
+    def _on_model_swap_failed(self, err: str, previous):
+        if previous and self.transcriber.is_loaded:
+            # The old model is still serving — make the settings say so
+            self.config.model_size = previous
+            self.config.save()
+            self.model_var.set(previous)
+            self.status.configure(
+                text=f"❌ {err[:60]} — nadal używam '{previous}'", text_color=C["rec_red"]
             )
+        else:
+            self.status.configure(text=f"❌ Model: {err[:50]}", text_color=C["rec_red"])
 
     def _copy_text(self):
         t = self.textbox.get("1.0", "end").strip()
@@ -1551,14 +2306,75 @@ class VoxFlowApp(ctk.CTk):
         threading.Thread(target=self._init_model, daemon=True).start()
         try:
             self.hotkey_manager.start()
+            for manager in self.profile_hotkeys:
+                manager.start()
         except Exception:
             pass
         try:
             self.tray.start()
         except Exception:
             pass
+        self.devices.start()
+        self._open_warm_stream()
+        if self.config.hands_free_enabled:
+            self.hands_free.start()
+
+    def _warm_stream_wanted(self) -> bool:
+        """Hands-free listens on the warm stream, so it implies warm mode."""
+        return self.config.warm_stream_enabled or self.config.hands_free_enabled
+
+    def _preroll_seconds(self) -> float:
+        """Pre-roll length; hands-free needs room for the listener's reaction time."""
+        preroll = self.config.preroll_ms / 1000.0
+        if self.config.hands_free_enabled:
+            preroll = max(preroll, 1.0)
+        return preroll
+
+    def _on_hands_free_toggle(self):
+        self.config.hands_free_enabled = self.hands_free_var.get()
+        self.config.save()
+        self.recorder.warm_stream = self._warm_stream_wanted()
+        self._reopen_warm_stream()
+        if self.config.hands_free_enabled:
+            self.hands_free.start()
+            self.status.configure(
+                text=f"🗣️ Tryb bez rąk — mów, pauza {self.config.silence_duration:.1f}s "
+                     f"kończy wypowiedź",
+                text_color=C["ok"],
+            )
+        else:
+            self.hands_free.stop()
+            self.status.configure(text="🗣️ Tryb bez rąk wyłączony", text_color=C["txt2"])
+
+    def _reopen_warm_stream(self):
+        """Reopen the mic stream so the pre-roll ring gets its new size.
+
+        While a recording (or its tail) is still being captured, the
+        reopen waits until _finish_recording has handed the audio over.
+        """
+        if self._recording or self._stopping:
+            self._reopen_after_stop = True
+            return
+        self._reopen_after_stop = False
+        self.recorder.close()
+        self.recorder.preroll = self._preroll_seconds()
+        self._open_warm_stream()
+
+    def _open_warm_stream(self):
+        """Open the always-on mic stream when warm mode (or hands-free) is on."""
+        if not self._warm_stream_wanted():
+            return
+        try:
+            self.recorder.open_warm()
+        except Exception as e:
+            print(f"[Recorder] warm stream failed: {e}")
 
     def _init_model(self):
+        # Collect leftovers before any new recording can create a spill file
+        try:
+            leftovers = spill.find_recoverable()
+        except OSError:
+            leftovers = []
         try:
             self.transcriber.load_model(
                 on_progress=lambda m: self.after(
@@ -1575,6 +2391,13 @@ class VoxFlowApp(ctk.CTk):
                     text_color=C["ok"],
                 ),
             )
+            if leftovers:
+                self._recover_spills(leftovers)
+            if self.config.live_captions_enabled:
+                self._load_captioner(announce=False)
+            if self.config.two_pass_enabled:
+                self._load_drafter(announce=False)
+            self._preload_models()
         except Exception as e:
             self.after(
                 0,
@@ -1583,6 +2406,17 @@ class VoxFlowApp(ctk.CTk):
                 ),
             )
 
+    def _preload_models(self):
+        """Keep the profiles' and routes' models resident — no load on first use."""
+        sizes = {p["model"] for p in self.config.profiles}
+        if self.config.routing_enabled:
+            sizes |= {r["model"] for r in self.config.routes}
+        sizes -= {self.transcriber.model_size}
+        if self.config.model_cache_mb <= 0 and len(sizes) > 1:
+            return  # without a budget only one extra model stays resident
+        for size in sorted(sizes):
+            self.transcriber.preload(size)
+
     def _show(self):
         self.after(0, lambda: (self.deiconify(), self.lift(), self.focus_force()))
 
@@ -1596,11 +2430,17 @@ class VoxFlowApp(ctk.CTk):
 
     def _quit(self):
         self._alive = False
-        if self._recording:
-            self.recorder.stop()
+        self.hands_free.stop()
+        self.captioner.stop()
+        self.devices.stop()
+        self.recorder.close()
+        if isinstance(self.transcriber, RemoteTranscriber):
+            self.transcriber.unload_model()  # end the worker process
         # Restore other apps' volume if we quit mid-recording
         self.ducker.restore()
         self.hotkey_manager.stop()
+        for manager in self.profile_hotkeys:
+            manager.stop()
         if self.tray:
             self.tray.stop()
         self.config.save()
@@ -0,0 +1,206 @@
+"""VoxFlow Audio Buffers - Preallocated sample storage for the capture path.
+
+The PortAudio callback runs on a real-time thread, so everything it touches
+must be O(1) per block: no list growth, no re-summing of chunk lengths and
+no concatenation. These buffers are allocated once per recording and only
+ever advance a write cursor.
+"""
+import time
+
+import numpy as np
+
+
+class CaptureBuffer:
+    """Fixed-capacity, array-backed mono sample buffer with a write cursor.
+
+    The backing array is allocated with np.empty, so untouched pages are
+    never committed by the OS — reserving room for the maximum recording
+    length costs nothing until audio actually arrives.
+
+    Safe for one writer (the audio callback) and one reader (the worker)
+    without a lock: samples are copied in before the cursor moves, so
+    everything below len() is always fully written.
+
+    An optional prefix region in front of the cursor can be filled once,
+    out of band (a warm stream's pre-roll), while the callback is already
+    appending after it.
+    """
+
+    def __init__(self, capacity: int, prefix: int = 0):
+        self.prefix = max(0, int(prefix))
+        self.capacity = max(1, int(capacity))
+        self._data = np.empty(self.prefix + self.capacity, dtype=np.float32)
+        self._start = self.prefix
+        self._cursor = self.prefix
+
+    def __len__(self) -> int:
+        return self._cursor - self._start
+
+    @property
+    def prefix_length(self) -> int:
+        """Samples placed by write_prefix()."""
+        return self.prefix - self._start
+
+    @property
+    def is_full(self) -> bool:
+        return self._cursor >= self._data.shape[0]
+
+    @property
+    def remaining(self) -> int:
+        return self._data.shape[0] - self._cursor
+
+    def write(self, samples: np.ndarray) -> int:
+        """Append mono samples; returns how many fit (the rest is dropped)."""
+        cursor = self._cursor
+        n = min(samples.shape[0], self._data.shape[0] - cursor)
+        if n > 0:
+            self._data[cursor:cursor + n] = samples[:n]
+            self._cursor = cursor + n
+        return n
+
+    def write_prefix(self, samples: np.ndarray):
+        """Place samples right before the first appended one (once, early)."""
+        n = min(samples.shape[0], self.prefix)
+        if n > 0:
+            self._data[self.prefix - n:self.prefix] = samples[samples.shape[0] - n:]
+            self._start = self.prefix - n
+
+    def view(self) -> np.ndarray:
+        """Contiguous view of everything written so far — no copy."""
+        return self._data[self._start:self._cursor]
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Samples [start, end) of what was written (a view)."""
+        return self._data[self._start + start:self._start + end]
+
+    def reset(self):
+        self._start = self.prefix
+        self._cursor = self.prefix
+
+
+class RingBuffer:
+    """Fixed-capacity mono ring that always holds the most recent samples.
+
+    Used for the pre-roll of a warm input stream: the callback keeps
+    overwriting the oldest audio, and a recording starts by copying out
+    whatever the ring holds at the moment of the key press.
+
+    A sequence counter (odd while a write is in progress) lets a reader
+    take a consistent snapshot without a lock — see snapshot().
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        self._pos = 0       # next write index
+        self._filled = 0    # valid samples, saturates at capacity
+        self._written = 0   # samples ever written (a reader's bookmark)
+        self._seq = 0       # bumped before and after every write
+
+    def __len__(self) -> int:
+        return self._filled
+
+    def write(self, samples: np.ndarray):
+        """Append samples, overwriting the oldest ones when full."""
+        self._seq += 1
+        try:
+            self._write(samples)
+        finally:
+            self._seq += 1
+
+    def _write(self, samples: np.ndarray):
+        n = samples.shape[0]
+        if n >= self.capacity:
+            self._data[:] = samples[-self.capacity:]
+            self._pos = 0
+            self._filled = self.capacity
+            self._written += n
+            return
+        end = self._pos + n
+        if end <= self.capacity:
+            self._data[self._pos:end] = samples
+        else:
+            split = self.capacity - self._pos
+            self._data[self._pos:] = samples[:split]
+            self._data[:n - split] = samples[split:]
+        self._pos = end % self.capacity
+        self._filled = min(self.capacity, self._filled + n)
+        self._written += n
+
+    def latest(self) -> np.ndarray:
+        """Copy of the buffered samples in chronological order."""
+        if self._filled < self.capacity:
+            return self._data[:self._filled].copy()
+        return np.concatenate((self._data[self._pos:], self._data[:self._pos]))
+
+    def snapshot(self, retries: int = 50) -> np.ndarray:
+        """latest(), retried until no write overlapped the copy."""
+        return self._consistent(retries)[0]
+
+    def read_new(self, mark: int, retries: int = 50) -> tuple[np.ndarray, int]:
+        """Samples written since `mark` (a previous return value), and the new mark.
+
+        Samples that were already overwritten are skipped; a clear() in
+        between is not detected, the reader just gets what the ring holds.
+        """
+        data, written = self._consistent(retries)
+        n = max(0, min(written - mark, data.shape[0]))
+        return data[data.shape[0] - n:], written
+
+    def _consistent(self, retries: int) -> tuple[np.ndarray, int]:
+        data, written = self.latest(), self._written
+        for _ in range(retries):
+            seq = self._seq
+            if seq % 2 == 0:
+                data, written = self.latest(), self._written
+                if self._seq == seq:
+                    break
+            time.sleep(0.0005)
+        return data, written
+
+    def clear(self):
+        self._pos = 0
+        self._filled = 0
+
+
+class StreamRing:
+    """Bounded single-producer/single-consumer ring for unbounded streams.
+
+    Unlike CaptureBuffer it never fills up: the writer wraps around and
+    len() counts every sample ever written. The reader keeps its own
+    position and must keep up — if it falls more than `capacity` behind,
+    read() returns only what is still in the ring.
+    """
+
+    is_full = False
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._data = np.empty(self.capacity, dtype=np.float32)
+        self._written = 0
+
+    def __len__(self) -> int:
+        return self._written
+
+    def write(self, samples: np.ndarray) -> int:
+        n = samples.shape[0]
+        if n > self.capacity:
+            samples = samples[n - self.capacity:]
+        m = samples.shape[0]
+        pos = (self._written + n - m) % self.capacity
+        first = min(m, self.capacity - pos)
+        self._data[pos:pos + first] = samples[:first]
+        if first < m:
+            self._data[:m - first] = samples[first:]
+        self._written += n
+        return n
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Copy of samples [start, end); the overwritten part is skipped."""
+        start = max(start, end - self.capacity, self._written - self.capacity)
+        if end <= start:
+            return np.empty(0, dtype=np.float32)
+        a, b = start % self.capacity, end % self.capacity
+        if a < b or (b == 0 and end - start == self.capacity - a):
+            return self._data[a:a + (end - start)].copy()
+        return np.concatenate((self._data[a:], self._data[:b]))
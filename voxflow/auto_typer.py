@@ -12,6 +12,16 @@ MAX_AUTO_TYPE_LENGTH = 10000
 VALID_METHODS = {"clipboard", "keyboard"}
 
 
+def minimal_edit(old: str, new: str) -> tuple[int, str]:
+    """Backspaces and retyped tail that turn `old` (already typed) into `new`."""
+    keep = 0
+    for a, b in zip(old, new):
+        if a != b:
+            break
+        keep += 1
+    return len(old) - keep, new[keep:]
+
+
 class AutoTyper:
     """Types text into the currently active window/input field."""
 
@@ -41,6 +51,28 @@ class AutoTyper:
         elif method == "keyboard":
             AutoTyper._type_via_keyboard(text)
 
+    @staticmethod
+    def replace_tail(erase: int, text: str, method: str = "clipboard"):
+        """Delete the last `erase` typed characters and type `text` instead.
+
+        Corrects text already inserted into the active window with as few
+        keystrokes as possible. Unlike type_text(), `text` is not stripped
+        — a leading space may be exactly the part that changed.
+        """
+        import keyboard
+
+        time.sleep(0.1)
+        for _ in range(min(erase, MAX_AUTO_TYPE_LENGTH)):
+            keyboard.press_and_release("backspace")
+            time.sleep(0.005)
+        if not text:
+            return
+        text = text[:MAX_AUTO_TYPE_LENGTH]
+        if method == "keyboard":
+            AutoTyper._type_via_keyboard(text)
+        else:
+            AutoTyper._paste_via_clipboard(text)
+
     @staticmethod
     def _paste_via_clipboard(text: str):
         """Paste text using clipboard (Ctrl+V) - fastest and most reliable."""
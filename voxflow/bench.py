@@ -0,0 +1,222 @@
+"""VoxFlow Micro-benchmarks - Hot-path timings without a microphone or model.
+
+Usage: python -m voxflow.main --bench   (or: python -m voxflow.bench)
+
+Every benchmark drives the real code with synthetic audio, so the numbers
+reflect this machine and can be compared before/after a change. Decoder
+benchmarks need faster-whisper and the model (downloaded on first run) and
+are skipped without them.
+"""
+import time
+import numpy as np
+
+from voxflow.transcriber import synthetic_speech
+
+
+def _fmt_us(seconds: float) -> str:
+    return f"{seconds * 1e6:8.1f} µs"
+
+
+def bench_capture_callback(sample_rate: int = 16000, block_ms: int = 100,
+                           checkpoints=(10, 60, 300, 600), probe_blocks: int = 50):
+    """Cost of one AudioRecorder callback at growing recording lengths.
+
+    With a preallocated buffer the per-block cost must stay flat; the old
+    chunk-list approach re-summed every chunk on every block (quadratic
+    over a recording). Both are timed side by side.
+    """
+    from voxflow.recorder import AudioRecorder
+
+    block = int(sample_rate * block_ms / 1000)
+    indata = (np.random.randn(block, 1) * 0.05).astype(np.float32)
+    max_s = max(checkpoints) + 5
+
+    rec = AudioRecorder(sample_rate=sample_rate, max_duration=max_s)
+    rec._start_buffer()
+    rec._recording = True
+
+    legacy_chunks: list[np.ndarray] = []
+
+    def legacy_callback(data):
+        legacy_chunks.append(data.copy())
+        sum(c.shape[0] for c in legacy_chunks)
+
+    print(f"\n⏱️ Capture callback ({block_ms} ms blocks @ {sample_rate} Hz)")
+    print(f"   {'recorded':>9}  {'buffer':>11}  {'chunk list':>11}")
+    done = 0
+    for target_s in checkpoints:
+        target_blocks = int(target_s * 1000 / block_ms)
+        # Fill up to the checkpoint untimed, then time a probe window
+        while done < target_blocks - probe_blocks:
+            rec._audio_callback(indata, block, None, None)
+            legacy_callback(indata)
+            done += 1
+
+        t0 = time.perf_counter()
+        for _ in range(probe_blocks):
+            rec._audio_callback(indata, block, None, None)
+        t_buf = (time.perf_counter() - t0) / probe_blocks
+
+        t0 = time.perf_counter()
+        for _ in range(probe_blocks):
+            legacy_callback(indata)
+        t_old = (time.perf_counter() - t0) / probe_blocks
+        done += probe_blocks
+
+        print(f"   {target_s:>8}s  {_fmt_us(t_buf)}  {_fmt_us(t_old)}")
+
+    rec._recording = False
+    rec._buffer = None
+
+
+def bench_resampler(rates=(8000, 22050, 44100, 48000), seconds: float = 10.0,
+                    block_ms: int = 100):
+    """CPU cost of streaming conversion to 16 kHz, per second of audio."""
+    from voxflow.resampler import StreamingResampler, TARGET_RATE
+
+    print(f"\n⏱️ Streaming resampler → {TARGET_RATE} Hz ({block_ms} ms blocks)")
+    print(f"   {'input':>8}  {'CPU / 1 s audio':>15}  {'per block':>11}")
+    for rate in rates:
+        audio = (np.random.randn(int(rate * seconds)) * 0.05).astype(np.float32)
+        block = int(rate * block_ms / 1000)
+        resampler = StreamingResampler(rate, TARGET_RATE)
+        t0 = time.process_time()
+        for i in range(0, audio.shape[0], block):
+            resampler.process(audio[i:i + block])
+        resampler.flush()
+        cpu = time.process_time() - t0
+        n_blocks = -(-audio.shape[0] // block)
+        print(f"   {rate:>7}  {cpu / seconds * 1000:>12.2f} ms  {_fmt_us(cpu / n_blocks)}")
+
+
+def _has_faster_whisper() -> bool:
+    try:
+        import faster_whisper  # noqa: F401
+    except ImportError:
+        print("   ⏭️ faster-whisper niezainstalowany — pomijam")
+        return False
+    return True
+
+
+def _load_transcriber(model_size: str):
+    if not _has_faster_whisper():
+        return None
+    from voxflow.transcriber import VoxTranscriber
+
+    transcriber = VoxTranscriber(model_size=model_size)
+    try:
+        transcriber.load_model(warmup=False)
+    except RuntimeError as e:
+        print(f"   ⏭️ {e}")
+        return None
+    return transcriber
+
+
+def bench_short_context(model_size: str = "base", durations=(2, 5, 10, 20),
+                        repeats: int = 3):
+    """Full 30 s window vs. short-context decoding, per utterance length.
+
+    `window` is the encoder context the short mode ended up using: 30 s
+    means the accuracy guard (or the model backend) sent it back to the
+    full window, so that row pays for both attempts.
+    """
+    print(f"\n⏱️ Short-context encoding (model '{model_size}', best of {repeats})")
+    transcriber = _load_transcriber(model_size)
+    if transcriber is None:
+        return
+    transcriber.warmup()
+    print(f"   {'audio':>6}  {'30 s window':>11}  {'short':>9}  {'window':>7}  {'speed-up':>8}")
+    for seconds in durations:
+        audio = synthetic_speech(seconds)
+        times = {}
+        window = 0.0
+        for mode, limit in (("full", 0.0), ("short", float(max(durations)))):
+            transcriber.short_context_max = limit
+            best = float("inf")
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                result = transcriber.transcribe(audio, language="pl", vad_enabled=False,
+                                                auto_correct=False)
+                best = min(best, time.perf_counter() - t0)
+            times[mode] = best
+            window = result["encoder_window"]
+        print(f"   {seconds:>5}s  {times['full'] * 1000:>8.0f} ms  "
+              f"{times['short'] * 1000:>6.0f} ms  {window:>6.0f}s  "
+              f"{times['full'] / times['short']:>7.2f}×")
+    transcriber.unload_model()
+
+
+def bench_warmup(model_size: str = "base"):
+    """First-decode latency straight after loading vs. a warm model."""
+    print(f"\n⏱️ Model warmup (model '{model_size}')")
+    transcriber = _load_transcriber(model_size)
+    if transcriber is None:
+        return
+    stats = transcriber.warmup()
+    if stats:
+        print(f"   cold {stats['cold'] * 1000:.0f} ms → warm {stats['warm'] * 1000:.0f} ms "
+              f"({stats['cold'] / stats['warm']:.2f}×)")
+    transcriber.unload_model()
+
+
+def _dictation(seconds: float, sample_rate: int = 16000) -> tuple[np.ndarray, list]:
+    """Phrases of 3–8 s separated by short pauses, with their speech spans."""
+    rng = np.random.default_rng(0)
+    parts, spans, t = [], [], 0.0
+    while t < seconds:
+        phrase = float(rng.uniform(3.0, 8.0))
+        parts.append(synthetic_speech(phrase, sample_rate))
+        spans.append((t, t + phrase))
+        parts.append(np.zeros(int(0.5 * sample_rate), dtype=np.float32))
+        t += phrase + 0.5
+    return np.concatenate(parts), spans
+
+
+def bench_batched(model_size: str = "base", durations=(60, 180)):
+    """Real-time factor of long dictations: sequential vs. batched clips."""
+    from voxflow.transcriber import batched_pipeline_class
+
+    print(f"\n⏱️ Batched long-dictation decoding (model '{model_size}')")
+    if not _has_faster_whisper():
+        return
+    if batched_pipeline_class() is None:
+        print("   ⏭️ BatchedInferencePipeline niedostępny (faster-whisper < 1.1) — pomijam")
+        return
+    transcriber = _load_transcriber(model_size)
+    if transcriber is None:
+        return
+    print(f"   {'audio':>6}  {'sequential':>10}  {'batched':>9}  {'speed-up':>8}")
+    for seconds in durations:
+        audio, spans = _dictation(seconds)
+        duration = audio.shape[0] / 16000
+        rtf = {}
+        for mode, threshold in (("sequential", 0.0), ("batched", 1.0)):
+            transcriber.batch_threshold = threshold
+            t0 = time.perf_counter()
+            result = transcriber.transcribe(audio, language="pl", speech_spans=spans,
+                                            auto_correct=False)
+            rtf[mode] = (time.perf_counter() - t0) / duration
+            assert result["batched"] == (mode == "batched")
+        print(f"   {duration:>5.0f}s  {rtf['sequential']:>6.3f} RTF  {rtf['batched']:>5.3f} RTF  "
+              f"{rtf['sequential'] / rtf['batched']:>7.2f}×")
+    transcriber.unload_model()
+
+
+BENCHMARKS = [
+    bench_capture_callback,
+    bench_resampler,
+    bench_warmup,
+    bench_short_context,
+    bench_batched,
+]
+
+
+def main() -> int:
+    print("🏁 VoxFlow benchmarks")
+    for bench in BENCHMARKS:
+        bench()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
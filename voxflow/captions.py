@@ -0,0 +1,156 @@
+"""VoxFlow Live Captions - Partial transcripts in the overlay while recording.
+
+A separate small model (tiny/base, one CPU thread) re-decodes a rolling
+window of the recording every second or so. Raw partial results flicker —
+each pass may rewrite the last few words — so a local-agreement policy
+decides what to show as settled: a word is committed once two consecutive
+passes agree on it (and on everything before it). Committed words never
+change again; only the tentative tail after them does.
+
+The captions exist to catch problems early (wrong language, a dead or
+wrong microphone), not to replace the final transcript, so they are kept
+on a strict CPU budget: after every pass the captioner sleeps long enough
+that it uses at most `cpu_budget` of one core, and it stops the instant
+the recording ends so the final decode has the machine to itself.
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from voxflow.resampler import TARGET_RATE
+from voxflow.transcriber import VoxTranscriber
+
+# Committed words passed back as prompt context
+_CONTEXT_WORDS = 30
+
+
+def _common_prefix(a: list[str], b: list[str]) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x.lower().strip(".,!?;:") != y.lower().strip(".,!?;:"):
+            break
+        n += 1
+    return n
+
+
+class LiveCaptioner:
+    """Rolling-window draft decoder with local-agreement stabilisation."""
+
+    def __init__(
+        self,
+        model_size: str = "tiny",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_budget: float = 0.3,
+        window: float = 15.0,
+        min_interval: float = 0.7,
+    ):
+        # One thread, one worker: the captions must never compete with the
+        # final decode for more than a single core
+        self.transcriber = VoxTranscriber(
+            model_size=model_size, device=device, compute_type=compute_type,
+            cpu_threads=1, num_workers=1,
+        )
+        self.cpu_budget = cpu_budget  # fraction of one core
+        self.window = int(window * TARGET_RATE)
+        self.min_interval = min_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loading = False
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.transcriber.is_loaded
+
+    def load(self):
+        """Load the caption model (blocking — call from a background thread)."""
+        if self.is_loaded or self._loading:
+            return
+        self._loading = True
+        try:
+            self.transcriber.load_model()
+        finally:
+            self._loading = False
+
+    def start(self, recorder, language: str,
+              on_caption: Callable[[str, str, str], None]):
+        """Caption the recording that just started.
+
+        on_caption(stable, tentative, language) is called from the
+        captioner thread after every pass.
+        """
+        self.stop()
+        if not self.is_loaded:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(recorder, language, on_caption, self._stop),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self, recorder, language: str, on_caption, stop: threading.Event):
+        sr = TARGET_RATE
+        settled: list[str] = []      # committed words before the window
+        committed: list[str] = []    # committed words inside the window
+        previous: list[str] = []     # last pass's words for the window
+        window_start = 0
+        wait = self.min_interval
+        while not stop.wait(wait):
+            end = recorder.live_length
+            if end - window_start < sr:
+                wait = self.min_interval
+                continue
+            audio = np.array(recorder.live_audio(window_start, end), dtype=np.float32)
+            t0 = time.perf_counter()
+            try:
+                result = self.transcriber.transcribe_draft(
+                    audio, language=language,
+                    context=" ".join(settled[-_CONTEXT_WORDS:]),
+                )
+            except Exception as e:
+                print(f"[Captions] draft failed: {e}")
+                return
+            spent = time.perf_counter() - t0
+            if stop.is_set():
+                return
+
+            # Local agreement: commit what this pass and the last agree on
+            words = result["raw_text"].split()
+            agreed = _common_prefix(previous, words)
+            if agreed > len(committed):
+                committed = words[:agreed]
+            previous = words
+
+            if end - window_start > self.window:
+                # Slide the window past segments that are fully committed
+                consumed, cut = 0, 0.0
+                for seg in result["segments"]:
+                    n = len(seg["text"].split())
+                    if consumed + n > len(committed):
+                        break
+                    consumed += n
+                    cut = seg["end"]
+                if cut <= 0.0:
+                    # Nothing settled in a whole window: settle half of it
+                    consumed, cut = len(committed), (end - window_start) / sr / 2
+                settled += committed[:consumed]
+                committed = committed[consumed:]
+                previous = previous[consumed:]
+                window_start += int(cut * sr)
+
+            tentative = words[len(committed):] if len(words) > len(committed) else []
+            try:
+                on_caption(" ".join(settled + committed), " ".join(tentative),
+                           result["language"])
+            except Exception:
+                pass
+            # Keep the duty cycle within budget: spent / (spent + wait) <= budget
+            budget = max(0.05, min(1.0, self.cpu_budget))
+            wait = max(self.min_interval, spent * (1.0 - budget) / budget)
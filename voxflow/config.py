@@ -6,7 +6,7 @@ import json
 import os
 import re
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 
 def get_config_dir() -> Path:
@@ -24,9 +24,59 @@ _VALID_LANGUAGES = {"auto", "pl", "en", "de", "fr", "es", "it", "uk"}
 # arbitrary key names). We only enforce it's a safe non-empty string.
 _VALID_TYPING_METHODS = {"clipboard", "keyboard"}
 _VALID_THEMES = {"dark", "light"}
+_VALID_LATENCIES = {"low", "high"}
+_VALID_TASKS = {"transcribe", "translate"}
+MAX_PROFILES = 4
+MAX_ROUTES = 4
+
+# Longest recording held in RAM; spill-to-disk lifts the cap to the
+# validated max_recording_duration
+MAX_IN_MEMORY_DURATION = 600.0
+# A spilled recording is still transcribed from one float32 copy
+# (~230 MB per hour at 16 kHz), so its length stays bounded too
+MAX_SPILL_DURATION = 3600.0
 _HEX_COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
 
 
+def _validate_profiles(value: list) -> list:
+    """Well-formed hotkey profiles only, one per hotkey."""
+    profiles = []
+    for p in value:
+        if not isinstance(p, dict):
+            continue
+        hotkey = str(p.get("hotkey", "")).strip().lower()
+        profile = {
+            "hotkey": hotkey,
+            "model": p.get("model"),
+            "language": p.get("language", "auto"),
+            "task": p.get("task", "transcribe"),
+        }
+        if (not hotkey or profile["model"] not in _VALID_MODELS
+                or profile["language"] not in _VALID_LANGUAGES
+                or profile["task"] not in _VALID_TASKS
+                or any(q["hotkey"] == hotkey for q in profiles)):
+            continue
+        profiles.append(profile)
+    return profiles[:MAX_PROFILES]
+
+
+def _validate_routes(value: list) -> list:
+    """Well-formed length routes, shortest limit first."""
+    routes = []
+    for r in value:
+        if not isinstance(r, dict) or r.get("model") not in _VALID_MODELS:
+            continue
+        try:
+            routes.append({
+                "max_s": max(0.5, min(120.0, float(r["max_s"]))),
+                "model": r["model"],
+                "tier": max(0, min(4, int(r.get("tier", 0)))),
+            })
+        except (KeyError, TypeError, ValueError):
+            continue
+    return sorted(routes, key=lambda r: r["max_s"])[:MAX_ROUTES]
+
+
 def _validate_config(data: dict) -> dict:
     """Validate and sanitize configuration values loaded from JSON.
 
@@ -58,6 +108,9 @@ def _validate_config(data: dict) -> dict:
         elif expected_type in (float, "float") and (isinstance(value, bool) or not isinstance(value, (int, float))):
             validated[key] = default_val
             continue
+        elif expected_type in (list, "list") and not isinstance(value, list):
+            validated[key] = default_val
+            continue
 
         # Range and value validation
         if key == "model_size" and value not in _VALID_MODELS:
@@ -70,6 +123,16 @@ def _validate_config(data: dict) -> dict:
             # Accept any non-empty string — hotkey picker sets arbitrary keys
             s = str(value).strip().lower()
             validated[key] = s if s else default_val
+        elif key == "profiles":
+            validated[key] = _validate_profiles(value)
+        elif key == "language_candidates":
+            langs = [v for v in value if isinstance(v, str) and v in _VALID_LANGUAGES and v != "auto"]
+            langs = list(dict.fromkeys(langs))
+            validated[key] = langs or default_val
+        elif key == "routes":
+            validated[key] = _validate_routes(value)
+        elif key == "model_cache_mb":
+            validated[key] = max(0, min(65536, int(value)))
         elif key == "typing_method" and value not in _VALID_TYPING_METHODS:
             validated[key] = default_val
         elif key == "theme" and value not in _VALID_THEMES:
@@ -81,7 +144,7 @@ def _validate_config(data: dict) -> dict:
         elif key == "sample_rate" and (not isinstance(value, int) or value <= 0):
             validated[key] = default_val
         elif key == "max_recording_duration":
-            validated[key] = max(1.0, min(600.0, float(value)))
+            validated[key] = max(1.0, min(MAX_SPILL_DURATION, float(value)))
         elif key == "silence_threshold":
             validated[key] = max(0.001, min(1.0, float(value)))
         elif key == "silence_duration":
@@ -93,6 +156,34 @@ def _validate_config(data: dict) -> dict:
             validated[key] = max(700, min(1080, int(value)))
         elif key == "vad_silence_ms":
             validated[key] = max(50, min(5000, int(value)))
+        elif key == "audio_block_ms":
+            validated[key] = max(10, min(200, int(value)))
+        elif key == "audio_latency" and value not in _VALID_LATENCIES:
+            validated[key] = default_val
+        elif key == "preroll_ms":
+            validated[key] = max(0, min(2000, int(value)))
+        elif key == "tail_ms":
+            validated[key] = max(0, min(1000, int(value)))
+        elif key == "caption_model" and value not in _VALID_MODELS:
+            validated[key] = default_val
+        elif key == "draft_model" and value not in _VALID_MODELS:
+            validated[key] = default_val
+        elif key == "redecode_model" and value and value not in _VALID_MODELS:
+            validated[key] = default_val
+        elif key == "caption_cpu_budget":
+            validated[key] = max(0.05, min(1.0, float(value)))
+        elif key == "latency_target_s":
+            validated[key] = max(0.0, min(30.0, float(value)))
+        elif key == "batch_threshold_s":
+            validated[key] = max(0.0, min(3600.0, float(value)))
+        elif key == "short_context_max_s":
+            validated[key] = max(2.0, min(29.0, float(value)))
+        elif key == "stream_chunk_s":
+            validated[key] = max(3.0, min(30.0, float(value)))
+        elif key == "hands_free_cpu_budget":
+            validated[key] = max(1.0, min(600.0, float(value)))
+        elif key == "speculative_window_ms":
+            validated[key] = max(100, min(2000, int(value)))
         elif key == "audio_device_index":
             validated[key] = int(value)  # -1 = default device
         elif key == "duck_audio_level":
@@ -113,17 +204,35 @@ class VoxFlowConfig:
     compute_type: str = "int8"  # "int8" for CPU, "float16" for GPU
 
     # Audio settings
-    sample_rate: int = 16000
+    sample_rate: int = 16000  # capture rate when capture_native_rate is off
+    capture_native_rate: bool = True  # record at the mic's own rate, resample to 16 kHz
     channels: int = 1
     silence_threshold: float = 0.01
-    silence_duration: float = 2.0
+    silence_duration: float = 2.0  # hands-free: silence that ends an utterance
     max_recording_duration: float = 300.0  # 5 min max
+    spill_to_disk: bool = False  # stream long recordings to a crash-safe file
 
     # Audio device (-1 = system default)
     audio_device_index: int = -1
 
+    # Input stream
+    audio_block_ms: int = 100  # callback block size
+    audio_latency: str = "high"  # PortAudio suggested latency: "low" or "high"
+    warm_stream_enabled: bool = False  # keep the mic stream open between recordings
+    preroll_ms: int = 500  # warm stream: audio kept from before the key press
+    tail_ms: int = 250  # warm stream: audio still captured after release
+
     # Hotkey - hold-to-record
     hotkey: str = "f2"
+    # Extra hold-to-record hotkeys, each with its own model, language and
+    # task: [{"hotkey": "f3", "model": "base", "language": "en", "task": "transcribe"}]
+    profiles: list = field(default_factory=list)
+    # Combo hotkeys: open the mic when the first key goes down (cold stream only)
+    speculative_open_enabled: bool = False
+    speculative_window_ms: int = 400  # discard the stream if the combo isn't completed
+    # Hands-free: start on speech, stop after silence_duration, no key needed
+    hands_free_enabled: bool = False
+    hands_free_cpu_budget: float = 36.0  # listener CPU seconds per hour (1%)
 
     # Typing behavior
     auto_type_enabled: bool = True
@@ -144,9 +253,45 @@ class VoxFlowConfig:
 
     # Advanced
     beam_size: int = 5
+    # Stop decodes stuck in a hallucination loop, re-decode the rest
+    watchdog_enabled: bool = True
+    watchdog_retry_tail: bool = True
+    # Release-to-text target (s): cheaper decode settings when it would be missed; 0 = off
+    latency_target_s: float = 0.0
+    # RAM (MB) for models kept loaded side by side (profiles, re-decoding);
+    # 0 = one model besides the main one
+    model_cache_mb: int = 0
+    # Route utterances by speech length: up to max_s seconds → that model,
+    # at decode tier `tier` or cheaper (0 = full accuracy … 4 = greedy)
+    routing_enabled: bool = False
+    routes: list = field(default_factory=lambda: [{"max_s": 4.0, "model": "base", "tier": 3}])
+    # Decode low-confidence segments again (wider beam, or this model; "" = same)
+    redecode_weak_enabled: bool = False
+    redecode_model: str = ""
     vad_enabled: bool = True
     vad_silence_ms: int = 300
     auto_correct: bool = True
+    # Run Whisper in a worker process (applied on restart)
+    worker_process_enabled: bool = False
+    # Encode short dictations with a window cut to their length (faster encoder)
+    short_context_enabled: bool = False
+    short_context_max_s: float = 10.0  # longer recordings use the full 30 s
+    # Decode recordings at least this long (s) in batches of VAD clips; 0 = off
+    batch_threshold_s: float = 60.0
+    # Type a fast model's draft at once, then correct it with the main model
+    two_pass_enabled: bool = False
+    draft_model: str = "base"
+    # Decode finished chunks while still recording (needs VAD)
+    streaming_enabled: bool = False
+    stream_chunk_s: float = 8.0  # speech per background chunk
+    # Live partial captions in the recording overlay (separate small model)
+    live_captions_enabled: bool = False
+    caption_model: str = "tiny"
+    caption_cpu_budget: float = 0.3  # max fraction of one core
+
+    # Language "auto": identify it while recording, only among these
+    early_language_id: bool = False
+    language_candidates: list = field(default_factory=lambda: ["pl", "en"])
 
     # Translation (Whisper built-in translate task → English)
     translate_enabled: bool = False
@@ -180,6 +325,16 @@ class VoxFlowConfig:
         config.save()
         return config
 
+    @property
+    def recording_limit(self) -> float:
+        """Effective max recording length in seconds.
+
+        Only spill-to-disk recordings may exceed MAX_IN_MEMORY_DURATION.
+        """
+        if self.spill_to_disk:
+            return self.max_recording_duration
+        return min(self.max_recording_duration, MAX_IN_MEMORY_DURATION)
+
     @property
     def available_models(self) -> list:
         return ["tiny", "base", "small", "medium", "large-v3"]
@@ -0,0 +1,107 @@
+"""VoxFlow Decode Budget - Decode settings chosen to meet a latency target.
+
+The default settings (beam 5, best_of 3, patience 1.5, five-step
+temperature fallback, timestamps) are tuned for accuracy and cost the
+same per second of audio whether the recording is 1 s or 5 minutes. With
+a target release-to-text latency set, a LatencyController instead picks,
+per recording, the most accurate tier it predicts will finish in time:
+
+    predicted = audio seconds × measured RTF × tier cost
+
+The real-time factor is measured on this machine with the loaded model —
+seeded by the warmup decode, then learned from every transcription —
+and kept per length bucket, because short clips are dominated by the
+fixed per-window encoder cost and have a much higher RTF than long ones.
+"""
+import threading
+from typing import Optional
+
+# Cheaper tiers trade beam width, patience, timestamps and how far the
+# temperature fallback may go for speed. `cost` is decode time relative
+# to tier 0 (rough, measured on CPU int8 models).
+TIERS = [
+    {"beam_size": None, "best_of": 3, "patience": 1.5,
+     "temperature": [0.0, 0.2, 0.4, 0.6, 0.8], "without_timestamps": False, "cost": 1.0},
+    {"beam_size": None, "best_of": 3, "patience": 1.0,
+     "temperature": [0.0, 0.2, 0.4], "without_timestamps": False, "cost": 0.8},
+    {"beam_size": 3, "best_of": 2, "patience": 1.0,
+     "temperature": [0.0, 0.4], "without_timestamps": True, "cost": 0.55},
+    {"beam_size": 1, "best_of": 1, "patience": 1.0,
+     "temperature": [0.0, 0.6], "without_timestamps": True, "cost": 0.4},
+    {"beam_size": 1, "best_of": 1, "patience": 1.0,
+     "temperature": [0.0], "without_timestamps": True, "cost": 0.35},
+]
+# Upper edges (seconds of audio) of the RTF buckets
+_BUCKETS = (5.0, 15.0, 60.0, float("inf"))
+_ALPHA = 0.3  # EMA weight of the newest measurement
+
+
+def _bucket(duration: float) -> int:
+    for i, edge in enumerate(_BUCKETS):
+        if duration < edge:
+            return i
+    return len(_BUCKETS) - 1
+
+
+class LatencyController:
+    """Chooses a decode tier per recording and learns the machine's RTF."""
+
+    def __init__(self, target: float = 0.0):
+        self.target = target  # seconds from release to text; 0 = fixed settings
+        self._rtf: list[Optional[float]] = [None] * len(_BUCKETS)  # at tier 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Forget measurements (a different model was loaded)."""
+        with self._lock:
+            self._rtf = [None] * len(_BUCKETS)
+
+    def seed(self, elapsed: float, duration: float):
+        """Prior from the warmup decode (tier 0, synthetic speech)."""
+        if elapsed > 0 and duration > 0:
+            self.observe({"tier": 0}, duration, elapsed)
+
+    def rtf(self, duration: float) -> Optional[float]:
+        """Tier-0 RTF for audio of this length (nearest measured bucket)."""
+        b = _bucket(duration)
+        known = [(abs(i - b), r) for i, r in enumerate(self._rtf) if r is not None]
+        return min(known)[1] if known else None
+
+    def plan(self, duration: float, beam_size: int, min_tier: int = 0) -> dict:
+        """Decode settings for `duration` seconds of audio.
+
+        `beam_size` is the user's setting — the ceiling for every tier;
+        `min_tier` is the most accurate tier allowed (set by the router).
+        Returns faster-whisper kwargs plus the tier, its predicted
+        decode time and the target, for the result record.
+        """
+        rtf = self.rtf(duration)
+        tier = max(0, min(min_tier, len(TIERS) - 1))
+        predicted = None
+        if self.target > 0 and rtf is not None:
+            for tier in range(tier, len(TIERS)):
+                predicted = duration * rtf * TIERS[tier]["cost"]
+                if predicted <= self.target:
+                    break
+        settings = TIERS[tier]
+        beam = min(beam_size, settings["beam_size"] or beam_size)
+        return {
+            "beam_size": beam,
+            "best_of": min(beam, settings["best_of"]),
+            "patience": settings["patience"],
+            "temperature": list(settings["temperature"]),
+            "without_timestamps": settings["without_timestamps"],
+            "tier": tier,
+            "predicted": predicted,
+            "target": self.target,
+        }
+
+    def observe(self, plan: dict, duration: float, elapsed: float):
+        """Learn from one finished decode made with `plan`."""
+        if duration <= 0:
+            return
+        sample = elapsed / duration / TIERS[plan["tier"]]["cost"]
+        b = _bucket(duration)
+        with self._lock:
+            old = self._rtf[b]
+            self._rtf[b] = sample if old is None else old + _ALPHA * (sample - old)
@@ -0,0 +1,269 @@
+"""VoxFlow Device Registry - Cached input devices with background hotplug watch.
+
+PortAudio only sees the devices present when it was initialised, so picking
+up a newly plugged microphone means restarting it — which is only safe with
+no stream open. The registry owns that: a single background thread watches
+for hotplug, restarts PortAudio while the recorder is quiesced, enumerates
+the inputs and probes which sample rates each one accepts. The UI and the
+recorder only ever read the cached result, so nothing on the Tk thread or
+the record path waits for device enumeration.
+
+Hotplug signals:
+- Linux: udev "sound" events (pyudev, optional), else polling /dev/snd
+- Windows: polling the waveIn device count (winmm, a cheap kernel call)
+- elsewhere: manual rescan only (🔄 button)
+
+The last known list is persisted, so the microphone menu is filled
+instantly on the next start, before the first scan finishes.
+"""
+import json
+import os
+import sys
+import threading
+from contextlib import nullcontext
+from typing import Callable, Optional
+
+import sounddevice as sd
+
+from voxflow.config import get_config_dir
+
+# Rates probed per device (the native default rate is always included)
+PROBE_RATES = (8000, 16000, 22050, 32000, 44100, 48000)
+
+# Seconds between hotplug polls (Linux without pyudev, Windows)
+POLL_INTERVAL = 2.0
+
+# Seconds to wait before retrying a rescan deferred by a busy recorder
+RETRY_INTERVAL = 1.0
+
+
+def _cache_path():
+    return get_config_dir() / "devices.json"
+
+
+class DeviceRegistry:
+    """Background-maintained list of audio input devices.
+
+    `quiesce` is a context-manager factory supplied by the owner of the
+    streams (AudioRecorder.quiesced): entered around a PortAudio restart,
+    it closes any open stream and yields False if that is not possible
+    right now (recording), in which case the rescan is retried later.
+    """
+
+    def __init__(
+        self,
+        on_change: Optional[Callable[[list[dict]], None]] = None,
+        quiesce: Optional[Callable] = None,
+        poll_interval: float = POLL_INTERVAL,
+    ):
+        self.on_change = on_change
+        self.quiesce = quiesce
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._devices: list[dict] = []
+        self._default_index: Optional[int] = None
+        self._rescan = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._udev_observer = None
+        self._load_cache()
+
+    @property
+    def devices(self) -> list[dict]:
+        """Cached input devices (index, name, channels, sample_rate, rates)."""
+        with self._lock:
+            return list(self._devices)
+
+    def get(self, index: Optional[int]) -> Optional[dict]:
+        """Cached entry for a device index (None/-1 = system default)."""
+        with self._lock:
+            if index is None or index < 0:
+                index = self._default_index
+            for d in self._devices:
+                if d["index"] == index:
+                    return d
+        return None
+
+    def find_by_name(self, name: str) -> Optional[dict]:
+        with self._lock:
+            for d in self._devices:
+                if d["name"] == name:
+                    return d
+        return None
+
+    def supported_rates(self, index: Optional[int]) -> tuple:
+        entry = self.get(index)
+        return tuple(entry["rates"]) if entry else ()
+
+    def start(self):
+        """Start the watcher thread; the first scan runs right away."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._rescan.set()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._rescan.set()
+        if self._udev_observer is not None:
+            try:
+                self._udev_observer.stop()
+            except Exception:
+                pass
+            self._udev_observer = None
+        self._thread = None
+
+    def request_rescan(self):
+        """Ask the watcher thread for a fresh scan (non-blocking)."""
+        self._rescan.set()
+
+    # ─── Watcher thread ───────────────────────────────────────────
+
+    def _run(self):
+        signature = self._watch_signature()
+        if self._start_udev():
+            signature = None  # udev pushes events, no polling needed
+        first = True
+        while not self._stop.is_set():
+            self._rescan.wait(self.poll_interval if signature is not None else None)
+            if self._stop.is_set():
+                break
+            if signature is not None:
+                current = self._watch_signature()
+                if current != signature:
+                    signature = current
+                    self._rescan.set()
+            if not self._rescan.is_set():
+                continue
+            self._rescan.clear()
+            if not self._scan(reinit=not first):
+                # Recorder busy — try again shortly
+                self._stop.wait(RETRY_INTERVAL)
+                self._rescan.set()
+                continue
+            first = False
+
+    def _scan(self, reinit: bool) -> bool:
+        """Enumerate and probe inputs; returns False if the rescan was deferred."""
+        if reinit:
+            guard = self.quiesce() if self.quiesce else nullcontext(True)
+            with guard as ok:
+                if not ok:
+                    return False
+                try:
+                    sd._terminate()
+                    sd._initialize()
+                except Exception as e:
+                    print(f"[Devices] PortAudio restart failed: {e}")
+                devices, default = self._enumerate()
+        else:
+            devices, default = self._enumerate()
+
+        with self._lock:
+            changed = devices != self._devices
+            self._devices = devices
+            self._default_index = default
+        if changed:
+            self._save_cache(devices)
+        if self.on_change:
+            try:
+                self.on_change(list(devices))
+            except Exception:
+                pass
+        return True
+
+    @staticmethod
+    def _enumerate() -> tuple[list[dict], Optional[int]]:
+        try:
+            all_devices = sd.query_devices()
+        except Exception as e:
+            print(f"[Devices] query failed: {e}")
+            return [], None
+        devices = []
+        for i, dev in enumerate(all_devices):
+            if dev["max_input_channels"] <= 0:
+                continue
+            native = int(dev["default_samplerate"])
+            devices.append({
+                "index": i,
+                "name": dev["name"],
+                "channels": dev["max_input_channels"],
+                "sample_rate": native,
+                "rates": DeviceRegistry._probe_rates(i, native),
+            })
+        try:
+            default = sd.default.device[0]
+            default = int(default) if default is not None and int(default) >= 0 else None
+        except Exception:
+            default = None
+        return devices, default
+
+    @staticmethod
+    def _probe_rates(index: int, native: int) -> list[int]:
+        rates = []
+        for rate in sorted(set(PROBE_RATES) | {native}):
+            try:
+                sd.check_input_settings(device=index, samplerate=rate,
+                                        channels=1, dtype="float32")
+                rates.append(rate)
+            except Exception:
+                pass
+        return rates
+
+    # ─── Hotplug signals ──────────────────────────────────────────
+
+    def _start_udev(self) -> bool:
+        """Subscribe to udev sound events (Linux, pyudev installed)."""
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            import pyudev
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by(subsystem="sound")
+            observer = pyudev.MonitorObserver(
+                monitor, callback=lambda _device: self._rescan.set(), daemon=True
+            )
+            observer.start()
+        except Exception:
+            return False
+        self._udev_observer = observer
+        return True
+
+    @staticmethod
+    def _watch_signature():
+        """Cheap fingerprint of the attached audio hardware (None = unknown)."""
+        if sys.platform.startswith("linux"):
+            try:
+                return tuple(sorted(os.listdir("/dev/snd")))
+            except OSError:
+                return None
+        if sys.platform == "win32":
+            try:
+                import ctypes
+                return ctypes.windll.winmm.waveInGetNumDevs()
+            except Exception:
+                return None
+        return None
+
+    # ─── Persistence ──────────────────────────────────────────────
+
+    def _load_cache(self):
+        try:
+            data = json.loads(_cache_path().read_text(encoding="utf-8"))
+            if isinstance(data, list):
+                self._devices = [d for d in data if isinstance(d, dict) and "index" in d]
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _save_cache(devices: list[dict]):
+        try:
+            path = _cache_path()
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(devices, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass
@@ -0,0 +1,158 @@
+"""VoxFlow Echo Gate - Removes VoxFlow's own chimes from the recording.
+
+The start chime plays right after the stream opens, so on laptop speakers
+it lands in the first few hundred ms of audio (and a warm stream's tail
+catches the stop chime). Whisper then spends time decoding a beep — and
+sometimes hallucinates words or falls back to higher temperatures over it.
+
+We know both the exact waveform and roughly when it played, so:
+1. the playback time is mapped to a sample position in the recording,
+2. the template is located precisely by cross-correlation around it
+   (output/input latency and the driver's scheduling are unknown),
+3. the best-fitting scaled copy is subtracted and the located window,
+   plus a short reverb tail, is attenuated.
+
+Audio is held back only around a pending window, so the VAD never sees the
+chime and nothing downstream has to be re-done. If the template isn't
+found (headphones, muted speakers) the audio is left untouched.
+"""
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class EchoGate:
+    """Cancels known playback signals from a 16 kHz stream, block by block."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        search_before: float = 0.05,
+        search_after: float = 0.3,
+        reverb: float = 0.1,
+        min_match: float = 0.3,
+        residual_gain: float = 0.1,
+    ):
+        self.sample_rate = sample_rate
+        self.search_before = int(search_before * sample_rate)
+        self.search_after = int(search_after * sample_rate)
+        self.reverb = int(reverb * sample_rate)
+        self.min_match = min_match  # normalized correlation needed to act
+        self.residual_gain = residual_gain
+
+        self._requests: list[tuple[np.ndarray, float]] = []  # (template, time)
+        self._gates: list[tuple[np.ndarray, int, int]] = []  # (template, start, end)
+        self._held: list[np.ndarray] = []
+        self._released = 0  # output index of the first held sample
+        # Output indices [start, end) changed by _cancel and not released yet
+        self._dirty: Optional[tuple[int, int]] = None
+        self.cancelled: list[tuple[float, float]] = []  # located chimes (s)
+
+    def expect(self, template: np.ndarray, when: float):
+        """Register a playback of `template` started at perf_counter `when`.
+
+        Safe to call from any thread; positions are resolved by place().
+        """
+        self._requests.append((template, when))
+
+    @property
+    def active(self) -> bool:
+        return bool(self._requests or self._gates or self._held)
+
+    def place(self, to_index: Callable[[float], float]):
+        """Turn pending playback times into sample windows."""
+        while self._requests:
+            template, when = self._requests.pop(0)
+            start = int(to_index(when))
+            lo = max(self._released, start - self.search_before)
+            hi = start + self.search_after + template.shape[0] + self.reverb
+            if hi > lo:
+                self._gates.append((template, lo, hi))
+        self._gates.sort(key=lambda g: g[1])
+
+    def feed(self, block: np.ndarray, final: bool = False) -> tuple[np.ndarray, int, bool]:
+        """Add the next 16 kHz block; returns (released, offset, modified).
+
+        `released` starts at output index `offset`. It is the input block
+        itself when nothing is pending; `modified` says whether any of it
+        differs from what was fed in.
+        """
+        if not self.active:
+            offset = self._released
+            self._released += block.shape[0]
+            return block, offset, False
+
+        if block.shape[0]:
+            self._held.append(block)
+        held = np.concatenate(self._held) if len(self._held) != 1 else self._held[0]
+        start, end = self._released, self._released + held.shape[0]
+
+        # Resolve every gate whose window is complete (or the stream ended)
+        pending = []
+        for gate in self._gates:
+            if gate[2] <= end or final:
+                changed = self._cancel(held, start, gate)
+                if changed is not None:
+                    lo, hi = changed
+                    if self._dirty is not None:
+                        lo, hi = min(lo, self._dirty[0]), max(hi, self._dirty[1])
+                    self._dirty = (lo, hi)
+            else:
+                pending.append(gate)
+        self._gates = pending
+
+        if self._requests:
+            release_end = start  # positions unknown yet: hold everything
+        elif self._gates:
+            release_end = max(start, min(end, self._gates[0][1]))
+        else:
+            release_end = end
+        if final:
+            release_end = end
+
+        # A cancellation may have touched samples held back until now
+        modified = False
+        if self._dirty is not None:
+            modified = self._dirty[0] < release_end
+            if self._dirty[1] <= release_end:
+                self._dirty = None
+            elif modified:
+                self._dirty = (release_end, self._dirty[1])
+
+        n = release_end - start
+        released, rest = held[:n], held[n:]
+        self._held = [rest] if rest.shape[0] else []
+        self._released = release_end
+        return released, start, modified
+
+    def _cancel(self, audio: np.ndarray, offset: int, gate) -> Optional[tuple[int, int]]:
+        """Find and subtract one template inside its window (in place).
+
+        Returns the output indices [start, end) it changed, or None.
+        """
+        template, lo, hi = gate
+        lo, hi = max(lo, offset) - offset, min(hi, offset + audio.shape[0]) - offset
+        n = template.shape[0]
+        if hi - lo < n:
+            return None
+        from scipy.signal import correlate
+
+        segment = audio[lo:hi]
+        corr = correlate(segment, template, mode="valid", method="fft")
+        lag = int(np.argmax(np.abs(corr)))
+        window = segment[lag:lag + n]
+        energy = float(np.dot(template, template))
+        seg_energy = float(np.dot(window, window))
+        if energy <= 0.0 or seg_energy <= 0.0:
+            return None
+        match = abs(float(corr[lag])) / np.sqrt(energy * seg_energy)
+        if match < self.min_match:
+            return None
+
+        gain = float(corr[lag]) / energy
+        window -= gain * template
+        tail_end = min(segment.shape[0], lag + n + self.reverb)
+        segment[lag:tail_end] *= self.residual_gain
+        s = (offset + lo + lag) / self.sample_rate
+        self.cancelled.append((s, s + n / self.sample_rate))
+        return offset + lo + lag, offset + lo + tail_end
@@ -0,0 +1,136 @@
+"""VoxFlow Hands-free Listener - Starts dictation when speech begins.
+
+In hands-free mode the input stream stays warm and this listener watches
+it for speech onset; the recorder's endpointing then ends the utterance
+after `silence_duration` seconds of silence and the app transcribes it —
+no key held at any point.
+
+The listener is built to stay on all day: it wakes a few times per
+second, reads only the samples captured since its last look (decimated to
+~8 kHz — plenty for an energy gate) and feeds them to the same
+StreamingVAD the recorder uses. Its own CPU time is metered per hour and
+the poll interval stretches when it runs over budget, so an idle VoxFlow
+costs a bounded, configurable amount of CPU.
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+from voxflow.vad import StreamingVAD
+
+# Energy is estimated on every n-th sample down to about this rate
+_LISTEN_RATE = 8000
+
+
+class SpeechTrigger:
+    """Low-duty-cycle speech onset detector on top of a warm stream.
+
+    `source(mark)` returns (new samples, new mark) or None while nothing
+    is listening — AudioRecorder.recent_audio. `is_paused()` is polled so
+    the trigger stays quiet while a recording or transcription runs.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[int], Optional[tuple]],
+        stream_rate: Callable[[], int],
+        on_speech: Callable[[], None],
+        is_paused: Callable[[], bool],
+        threshold: float = 0.01,
+        min_speech_ms: int = 200,
+        cpu_budget: float = 36.0,
+        min_interval: float = 0.1,
+        max_interval: float = 0.5,
+    ):
+        self.source = source
+        self.stream_rate = stream_rate
+        self.on_speech = on_speech
+        self.is_paused = is_paused
+        self.threshold = threshold
+        self.min_speech_ms = min_speech_ms
+        self.cpu_budget = cpu_budget  # CPU seconds per hour of listening
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        self.interval = min_interval
+        self.cpu_last_hour = 0.0  # listener CPU seconds in the current hour
+        self._hour_start = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        # A fresh event per thread: a stopped thread still winding down
+        # must not be revived by a quick stop()/start()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self, stop: threading.Event):
+        vad, mark, step = None, None, 1
+        self._hour_start = time.monotonic()
+        self.cpu_last_hour = 0.0
+        while not stop.wait(self.interval):
+            t0 = time.thread_time()
+            if self.is_paused():
+                vad = None  # start afresh (new noise floor) after the pause
+            else:
+                got = self.source(mark or 0)
+                if got is None:
+                    vad = None
+                else:
+                    samples, new_mark = got
+                    if vad is None:
+                        # Skip whatever the ring already held: it may be the
+                        # tail of the utterance that was just transcribed
+                        rate = self.stream_rate()
+                        step = max(1, rate // _LISTEN_RATE)
+                        vad = StreamingVAD(
+                            sample_rate=rate // step,
+                            threshold=self.threshold,
+                            min_speech_ms=self.min_speech_ms,
+                        )
+                    elif samples.shape[0]:
+                        vad.process(samples[::step])
+                    mark = new_mark
+                    if vad.in_speech:
+                        vad = None
+                        self._account(time.thread_time() - t0)
+                        self._fire()
+                        continue
+            self._account(time.thread_time() - t0)
+
+    def _fire(self):
+        try:
+            self.on_speech()
+        except Exception as e:
+            print(f"[HandsFree] on_speech failed: {e}")
+
+    def _account(self, cpu: float):
+        """Charge one poll to the hourly budget and adapt the poll interval."""
+        now = time.monotonic()
+        if now - self._hour_start >= 3600.0:
+            self._hour_start = now
+            self.cpu_last_hour = 0.0
+        self.cpu_last_hour += cpu
+        # Polls left this hour at the current rate vs. budget left
+        remaining_s = max(1.0, 3600.0 - (now - self._hour_start))
+        budget_left = self.cpu_budget - self.cpu_last_hour
+        if budget_left <= 0:
+            self.interval = self.max_interval
+            return
+        allowed_rate = budget_left / remaining_s  # CPU s per wall s
+        spend_rate = cpu / self.interval
+        if spend_rate > allowed_rate:
+            self.interval = min(self.max_interval, self.interval * 1.25)
+        else:
+            self.interval = max(self.min_interval, self.interval * 0.9)
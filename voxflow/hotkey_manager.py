@@ -7,7 +7,13 @@ Supports:
 - Single function keys: f2, f3, ..., f10
 - Combo keys: ctrl+space, ctrl+shift+space
 - Special keys: caps lock, insert, scroll lock
+
+Combo hotkeys can optionally warn the app early: when the first key of the
+combo goes down, on_prepare fires so the microphone stream can start
+opening while the rest of the combo is typed. If the combo isn't completed
+within speculative_window seconds, on_prepare_cancel fires instead.
 """
+import queue
 import threading
 from typing import Optional, Callable
 
@@ -33,14 +39,26 @@ class HotkeyManager:
         hotkey: str = "f2",
         on_press: Optional[Callable] = None,
         on_release: Optional[Callable] = None,
+        on_prepare: Optional[Callable] = None,
+        on_prepare_cancel: Optional[Callable] = None,
+        speculative_window: float = 0.0,
     ):
         self.hotkey = hotkey.lower()
         self.on_press = on_press
         self.on_release = on_release
+        self.on_prepare = on_prepare
+        self.on_prepare_cancel = on_prepare_cancel
+        self.speculative_window = speculative_window  # seconds, 0 = disabled
         self._active = False
         self._is_held = False
         self._hook_ref = None
         self._is_combo = "+" in hotkey
+        self._spec_timer: Optional[threading.Timer] = None
+        self._spec_spent = False  # one speculation per press of the first key
+        self._spec_lock = threading.Lock()
+        # on_prepare / on_prepare_cancel run in order on one worker thread
+        self._spec_calls: "queue.Queue[Callable]" = queue.Queue()
+        self._spec_worker: Optional[threading.Thread] = None
 
     def start(self):
         """Start listening for the hold-to-record hotkey."""
@@ -76,6 +94,7 @@ class HotkeyManager:
                 self._hook_ref = None
         except Exception:
             pass
+        self._cancel_speculation()
         self._active = False
         self._is_held = False
 
@@ -150,21 +169,86 @@ class HotkeyManager:
             # Check if currently held keys match the combo
             keys = [k.strip() for k in self.hotkey.split("+")]
             all_pressed = all(keyboard.is_pressed(k) for k in keys)
+            name = (event.name or "").lower()
 
             if event.event_type == "down" and all_pressed:
                 if not self._is_held:
                     self._is_held = True
+                    # Combo completed — the prepared stream is now used
+                    self._end_speculation(fire_cancel=False)
                     if self.on_press:
                         threading.Thread(target=self.on_press, daemon=True).start()
+            elif event.event_type == "down" and not self._is_held:
+                if name not in keys:
+                    # Some other shortcut (e.g. Ctrl+C) — not our combo
+                    self._end_speculation(fire_cancel=True)
+                elif keyboard.is_pressed(keys[0]):
+                    self._begin_speculation()
             elif event.event_type == "up" and self._is_held:
                 main_key = keys[-1]
-                if event.name.lower() == main_key or not all_pressed:
+                if name == main_key or not all_pressed:
                     self._is_held = False
                     if self.on_release:
                         threading.Thread(target=self.on_release, daemon=True).start()
+            elif event.event_type == "up" and not keyboard.is_pressed(keys[0]):
+                # First key let go before the combo completed
+                self._end_speculation(fire_cancel=True)
+                self._spec_spent = False
         except Exception as e:
             print(f"Combo hotkey event error: {e}")
 
+    # ── Speculative preparation (combo hotkeys) ──────────────────
+
+    def _begin_speculation(self):
+        """First combo key is down — let the app start opening the stream."""
+        if self.speculative_window <= 0 or not self.on_prepare:
+            return
+        with self._spec_lock:
+            # Key auto-repeat sends a stream of "down" events — prepare once
+            if self._spec_timer is not None or self._spec_spent:
+                return
+            self._spec_spent = True
+            self._spec_timer = threading.Timer(
+                self.speculative_window, self._end_speculation, kwargs={"fire_cancel": True},
+            )
+            self._spec_timer.daemon = True
+            self._spec_timer.start()
+        self._run_speculative(self.on_prepare)
+
+    def _end_speculation(self, fire_cancel: bool = True):
+        """Stop the speculation window; optionally tell the app to discard."""
+        with self._spec_lock:
+            timer, self._spec_timer = self._spec_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        if fire_cancel and self.on_prepare_cancel:
+            self._run_speculative(self.on_prepare_cancel)
+
+    def _run_speculative(self, callback: Callable):
+        """Queue a speculation callback on the serial worker.
+
+        A cancel on its own thread could overtake the prepare it cancels,
+        which would then open a stream nobody closes — the mic stays on.
+        """
+        with self._spec_lock:
+            if self._spec_worker is None:
+                self._spec_worker = threading.Thread(target=self._spec_loop, daemon=True)
+                self._spec_worker.start()
+        self._spec_calls.put(callback)
+
+    def _spec_loop(self):
+        while True:
+            callback = self._spec_calls.get()
+            try:
+                callback()
+            except Exception as e:
+                print(f"Speculative hotkey callback error: {e}")
+
+    def _cancel_speculation(self):
+        self._end_speculation(fire_cancel=True)
+        self._spec_spent = False
+
     @property
     def is_active(self) -> bool:
         return self._active
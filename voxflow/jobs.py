@@ -0,0 +1,120 @@
+"""VoxFlow Job Queue - Decode recordings while the next one is being made.
+
+Without a queue the app refuses a new recording until the previous one is
+transcribed, so dictating several sentences in a row means waiting after
+each. Recordings are now handed to a TranscriptionQueue instead:
+
+- up to `workers` decodes run at the same time (the model is loaded with
+  as many CTranslate2 workers),
+- results are delivered strictly in submission order — a short sentence
+  finished early waits for the longer one said before it, so text is
+  typed in the order it was spoken,
+- depth and wait time are tracked so the UI can show the backlog.
+"""
+import collections
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TranscriptionJob:
+    """One recording's decode; `result` or `error` is set when done."""
+
+    __slots__ = ("seq", "fn", "submitted", "started", "finished", "result", "error")
+
+    def __init__(self, seq: int, fn: Callable[[], dict]):
+        self.seq = seq
+        self.fn = fn
+        self.submitted = time.perf_counter()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[Exception] = None
+
+    @property
+    def wait(self) -> float:
+        """Seconds spent queued before a worker picked the job up."""
+        return (self.started or time.perf_counter()) - self.submitted
+
+    @property
+    def run_time(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class TranscriptionQueue:
+    """Concurrent decode workers with in-order delivery.
+
+    `on_result(job)` is called from a worker thread, once per job, in
+    submission order — marshal to the UI thread before touching widgets.
+    """
+
+    def __init__(self, on_result: Callable[[TranscriptionJob], None],
+                 workers: int = 2, max_pending: int = 4):
+        self.on_result = on_result
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self._queue: "queue.Queue[TranscriptionJob]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._seq = 0
+        self._next = 0  # next seq to deliver
+        self._done: dict[int, TranscriptionJob] = {}
+        self._running = 0
+        self._waits: collections.deque = collections.deque(maxlen=20)
+        self.last_wait = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Jobs submitted but not yet delivered (queued, running or held)."""
+        return self._seq - self._next
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def is_full(self) -> bool:
+        return self.depth >= self.max_pending
+
+    @property
+    def average_wait(self) -> float:
+        return sum(self._waits) / len(self._waits) if self._waits else 0.0
+
+    def submit(self, fn: Callable[[], dict]) -> TranscriptionJob:
+        with self._lock:
+            job = TranscriptionJob(self._seq, fn)
+            self._seq += 1
+            if len(self._threads) < self.workers:
+                t = threading.Thread(target=self._work, daemon=True)
+                self._threads.append(t)
+                t.start()
+        self._queue.put(job)
+        return job
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            job.started = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self.last_wait = job.wait
+                self._waits.append(job.wait)
+            try:
+                job.result = job.fn()
+            except Exception as e:
+                job.error = e
+            job.finished = time.perf_counter()
+            with self._lock:
+                self._running -= 1
+                self._done[job.seq] = job
+                # Deliver under the lock so two workers can't reorder calls
+                while self._next in self._done:
+                    ready = self._done.pop(self._next)
+                    self._next += 1
+                    try:
+                        self.on_result(ready)
+                    except Exception as e:
+                        print(f"[Jobs] on_result failed: {e}")
@@ -0,0 +1,125 @@
+"""VoxFlow Early Language ID - Settle the language while the user talks.
+
+With language "auto", Whisper detects the language at decode time, after
+release: the cost sits on the critical path, the choice is between ~99
+languages (a Polish sentence with an English name can come out as
+Czech), and the initial prompt can only be the generic PL/EN one.
+
+EarlyLanguageID runs detection in the background on the first seconds of
+speech of the recording in progress, restricted to a candidate set such
+as {pl, en}. A confident answer ends it early; otherwise it tries again
+with more speech. At release the transcription starts with a fixed
+language and that language's prompt — and if the recording was too short
+to settle in time, detection runs once on the whole utterance, still
+restricted to the candidates.
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from voxflow.resampler import TARGET_RATE
+from voxflow.vad import collect_speech
+
+# Speech (s) needed before the first attempt, and more for each retry
+MIN_SPEECH_S = 1.5
+RETRY_STEP_S = 1.5
+# After this much speech the best guess is taken, confident or not
+MAX_SPEECH_S = 6.0
+# Probability (renormalised over the candidates) that settles it early
+CONFIDENT = 0.8
+POLL_S = 0.3
+
+
+class EarlyLanguageID:
+    """Background language ID for one recording.
+
+    `recorder` provides live_length, live_audio() and live_spans();
+    `transcriber` provides detect_language().
+    """
+
+    def __init__(self, transcriber, recorder, candidates: list[str],
+                 model_size: Optional[str] = None,
+                 on_language: Optional[Callable[[str], None]] = None):
+        self.transcriber = transcriber
+        self.recorder = recorder
+        self.candidates = list(candidates)
+        self.model_size = model_size
+        self.on_language = on_language  # called from the detection thread
+        self.language: Optional[str] = None
+        self.probability = 0.0
+        self.detect_time = 0.0  # seconds spent detecting in the background
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if len(self.candidates) == 1:
+            self._settle(self.candidates[0], 1.0)  # nothing to choose from
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """The recording is over — live audio may no longer be read."""
+        self._stop.set()
+
+    def finish(self, audio: np.ndarray, speech_spans: Optional[list] = None) -> tuple[str, float, str]:
+        """Language of the finished recording: (language, probability, stage).
+
+        stage is "early" if it was settled while recording, "release" if
+        it had to be detected now on `audio` (16 kHz, spans in seconds).
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()  # at most the detection in flight
+        if self.language is not None:
+            return self.language, self.probability, "early"
+        speech = collect_speech(audio, speech_spans) if speech_spans else audio
+        language, probability = self.transcriber.detect_language(
+            speech, candidates=self.candidates, model_size=self.model_size)
+        self._settle(language, probability, notify=False)
+        return language, probability, "release"
+
+    def _run(self):
+        tried = 0.0
+        while not self._stop.wait(POLL_S):
+            speech = self._speech()
+            speech_s = speech.shape[0] / TARGET_RATE
+            if speech_s < max(MIN_SPEECH_S, tried + RETRY_STEP_S) and speech_s < MAX_SPEECH_S:
+                continue
+            t0 = time.perf_counter()
+            try:
+                language, probability = self.transcriber.detect_language(
+                    speech, candidates=self.candidates, model_size=self.model_size)
+            except Exception as e:
+                print(f"[LangID] detection failed: {e}")
+                return  # finish() tries once more on the whole recording
+            self.detect_time += time.perf_counter() - t0
+            tried = speech_s
+            if probability >= CONFIDENT or speech_s >= MAX_SPEECH_S:
+                self._settle(language, probability)
+                return
+
+    def _speech(self) -> np.ndarray:
+        """Speech of the recording so far, up to MAX_SPEECH_S."""
+        n = self.recorder.live_length
+        spans = [(s / TARGET_RATE, e / TARGET_RATE) for s, e in self.recorder.live_spans()]
+        if not spans:
+            # No pause yet (or VAD off): only a long stretch is worth a try
+            limit = int(MAX_SPEECH_S * TARGET_RATE)
+            if n < limit:
+                return np.empty(0, dtype=np.float32)
+            return np.array(self.recorder.live_audio(0, limit), dtype=np.float32)
+        audio = np.array(self.recorder.live_audio(0, int(spans[-1][1] * TARGET_RATE)),
+                         dtype=np.float32)
+        return collect_speech(audio, spans)[:int(MAX_SPEECH_S * TARGET_RATE)]
+
+    def _settle(self, language: str, probability: float, notify: bool = True):
+        self.language = language
+        self.probability = probability
+        if notify and self.on_language:
+            try:
+                self.on_language(language)
+            except Exception as e:
+                print(f"[LangID] on_language failed: {e}")
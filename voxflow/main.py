@@ -1,12 +1,16 @@
 """VoxFlow - Local Speech-to-Text Application
-Usage: python -m voxflow.main
+Usage: python -m voxflow.main [--test | --bench]
 """
+import multiprocessing
 import sys
 import os
 
 
 def main():
     """Main entry point for VoxFlow."""
+    # The transcription worker process re-enters here in frozen builds
+    multiprocessing.freeze_support()
+
     # Set environment for better compatibility
     os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
 
@@ -55,6 +59,16 @@ def main():
             print("Run: pip install -r requirements.txt")
             return 1
 
+    # Handle --bench mode
+    if "--bench" in sys.argv:
+        try:
+            from voxflow.bench import main as bench_main
+        except ImportError as e:
+            print(f"\n❌ Import failed: {e}")
+            print("Run: pip install -r requirements.txt")
+            return 1
+        return bench_main()
+
     # Normal launch
     try:
         from voxflow.app import VoxFlowApp  # noqa: F811
@@ -0,0 +1,87 @@
+"""VoxFlow Memory - RAM checks before loading another model.
+
+Loading a Whisper model while the current one keeps serving means both
+are resident for a moment. These helpers estimate what a model needs and
+how much the system can still give, so a load that would push the
+machine into swap is refused up front instead.
+"""
+import sys
+from typing import Optional
+
+# Approximate resident size with int8 weights (MB), incl. CTranslate2 buffers
+_MODEL_RAM_MB = {
+    "tiny": 150,
+    "base": 250,
+    "small": 650,
+    "medium": 1700,
+    "large-v3": 3300,
+}
+# Weight size relative to int8
+_COMPUTE_FACTOR = {
+    "int8": 1.0,
+    "int8_float16": 1.0,
+    "int8_float32": 1.0,
+    "float16": 2.0,
+    "float32": 4.0,
+}
+# Left free for the OS and everything else on the machine (MB)
+HEADROOM_MB = 512
+
+
+def model_ram_mb(model_size: str, compute_type: str = "int8") -> int:
+    """Estimated RAM a loaded model occupies (MB)."""
+    base = _MODEL_RAM_MB.get(model_size, _MODEL_RAM_MB["large-v3"])
+    return int(base * _COMPUTE_FACTOR.get(compute_type, 1.0))
+
+
+def available_mb() -> Optional[int]:
+    """RAM available to new allocations (MB), or None if unknown."""
+    try:
+        import psutil
+
+        return int(psutil.virtual_memory().available / 2**20)
+    except ImportError:
+        pass
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ("dwLength", ctypes.c_ulong),
+                    ("dwMemoryLoad", ctypes.c_ulong),
+                    ("ullTotalPhys", ctypes.c_ulonglong),
+                    ("ullAvailPhys", ctypes.c_ulonglong),
+                    ("ullTotalPageFile", ctypes.c_ulonglong),
+                    ("ullAvailPageFile", ctypes.c_ulonglong),
+                    ("ullTotalVirtual", ctypes.c_ulonglong),
+                    ("ullAvailVirtual", ctypes.c_ulonglong),
+                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+                ]
+
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return int(status.ullAvailPhys / 2**20)
+        elif sys.platform.startswith("linux"):
+            with open("/proc/meminfo", encoding="ascii") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) // 1024
+    except Exception:
+        pass
+    return None
+
+
+def fits(model_size: str, compute_type: str = "int8",
+         freed_mb: int = 0) -> tuple[bool, int, Optional[int]]:
+    """Whether a model can be loaded next to everything already resident.
+
+    `freed_mb` is released before the load (models evicted to make room).
+    Returns (fits, needed_mb, available_mb); unknown availability fits.
+    """
+    needed = model_ram_mb(model_size, compute_type)
+    available = available_mb()
+    if available is None:
+        return True, needed, None
+    return needed + HEADROOM_MB <= available + freed_mb, needed, available
@@ -0,0 +1,156 @@
+"""VoxFlow Model Cache - Several Whisper models resident at once.
+
+A transcriber used to own exactly one model, so anything that wanted a
+different one — a hotkey profile, a stronger model for weak segments —
+meant a full reload. The cache keeps loaded models keyed by
+(size, compute_type, device) under a RAM budget:
+
+- a hit costs nothing; a miss loads the model, first evicting the least
+  recently used ones until the new one fits the budget,
+- pinned models (the transcriber's primary model) are never evicted,
+- before loading, the system's free RAM is checked as well (see
+  voxflow.memory), so the budget can't push the machine into swap.
+
+Evicting only drops the cache's reference — a decode still running on
+that model keeps it alive until it finishes.
+"""
+import collections
+import threading
+from typing import Callable
+
+from voxflow import memory
+
+ModelKey = tuple  # (size, compute_type, device)
+
+
+class ModelCache:
+    """LRU cache of loaded models; `load(key)` creates a missing one."""
+
+    def __init__(self, load: Callable[[ModelKey], object], budget_mb: int = 0):
+        self._load = load
+        self.budget_mb = budget_mb  # 0 = pinned models plus one more
+        self._models: "collections.OrderedDict[ModelKey, object]" = collections.OrderedDict()
+        self._pinned: set = set()
+        self._loading: dict[ModelKey, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: ModelKey) -> bool:
+        return key in self._models
+
+    @property
+    def resident(self) -> list:
+        """Keys of resident models, least recently used first."""
+        return list(self._models)
+
+    def resident_mb(self) -> int:
+        return sum(memory.model_ram_mb(size, compute_type)
+                   for size, compute_type, _device in self._models)
+
+    def get(self, key: ModelKey, pin: bool = False):
+        """The model for `key`, loaded now if it isn't resident (blocking).
+
+        With `pin`, the model is pinned as well — before anything is evicted
+        to make room, so it never counts as the spare model. Raises
+        RuntimeError if it doesn't fit in RAM or fails to load; nothing is
+        evicted for a load that is refused.
+        """
+        while True:
+            with self._lock:
+                if pin:
+                    self._pinned.add(key)
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return self._models[key]
+                loading = self._loading.get(key)
+                if loading is None:
+                    self._loading[key] = threading.Event()
+                    self.misses += 1
+                    victims = self._victims(key)
+                    break
+            loading.wait()  # someone else is loading it — share the result
+        loaded = False
+        try:
+            size, compute_type, device = key
+            if device == "cpu":
+                # What the evictions will free counts as available
+                freed = sum(memory.model_ram_mb(v[0], v[1]) for v in victims)
+                ok, needed, available = memory.fits(size, compute_type, freed_mb=freed)
+                if not ok:
+                    raise RuntimeError(f"Za mało pamięci RAM na model '{size}' "
+                                       f"(potrzeba ~{needed} MB, wolne {available} MB)")
+            with self._lock:
+                self._evict([v for v in victims if v not in self._pinned])
+            model = self._load(key)
+            with self._lock:
+                self._models[key] = model
+            loaded = True
+            return model
+        finally:
+            with self._lock:
+                if pin and not loaded:
+                    self._pinned.discard(key)
+                self._loading.pop(key).set()
+
+    def pin(self, key: ModelKey):
+        with self._lock:
+            self._pinned.add(key)
+
+    def unpin(self, key: ModelKey, release: bool = False):
+        """Let `key` be evicted again.
+
+        With `release` and no budget, the model is dropped right away —
+        the caller replaced it, so it mustn't take the one spare slot.
+        """
+        with self._lock:
+            self._pinned.discard(key)
+            if release and self.budget_mb <= 0 and self._models.pop(key, None) is not None:
+                self.evictions += 1
+                print(f"[ModelCache] released '{key[0]}' ({key[1]}, {key[2]})")
+            if self.budget_mb <= 0 or self.resident_mb() > self.budget_mb:
+                self._make_room(None)
+
+    def evict(self, key: ModelKey):
+        with self._lock:
+            if self._models.pop(key, None) is not None:
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._pinned.clear()
+
+    def _make_room(self, key):
+        """Evict LRU models until `key` (None = nothing new) fits the budget."""
+        self._evict(self._victims(key))
+
+    def _victims(self, key) -> list:
+        """Unpinned models to evict, LRU first, so `key` fits the budget.
+
+        Without a budget, one unpinned model stays resident next to the
+        pinned ones: `key` if it is loaded unpinned, else the most recently
+        used one.
+        """
+        unpinned = [k for k in self._models if k not in self._pinned and k != key]
+        if self.budget_mb <= 0:
+            spare = 0 if key is not None and key not in self._pinned else 1
+            return unpinned[:max(0, len(unpinned) - spare)]
+        need = memory.model_ram_mb(key[0], key[1]) if key else 0
+        victims = []
+        resident = self.resident_mb()
+        for victim in unpinned:
+            if resident + need <= self.budget_mb:
+                break
+            victims.append(victim)
+            resident -= memory.model_ram_mb(victim[0], victim[1])
+        return victims
+
+    def _evict(self, victims: list):
+        for victim in victims:
+            if self._models.pop(victim, None) is None:
+                continue
+            self.evictions += 1
+            print(f"[ModelCache] evicted '{victim[0]}' ({victim[1]}, {victim[2]})")
@@ -3,8 +3,13 @@
 Created fresh on show(), destroyed completely on hide().
 No persistent window, no fade tricks — guaranteed to appear
 only during active recording.
+
+With live captions on, the badge grows a caption line: settled words in
+full color, the still-changing tail dimmed, plus the detected language.
+A mic that delivers pure silence is flagged there too.
 """
 import math
+import time
 import tkinter as tk
 from typing import Optional
 
@@ -14,7 +19,13 @@ class RecordingOverlay:
 
     W = 240
     H = 50
+    CAPTION_W = 460
+    CAPTION_H = 30
+    CAPTION_CHARS = 70  # tail of the caption that fits on one line
     BOTTOM_MARGIN = 70
+    # Below this RMS for DEAD_MIC_S the mic is probably muted or wrong
+    DEAD_MIC_LEVEL = 1e-4
+    DEAD_MIC_S = 1.5
 
     def __init__(self):
         self._win: Optional[tk.Toplevel] = None
@@ -23,6 +34,12 @@ class RecordingOverlay:
         self._level = 0.0
         self._running = False
         self._parent = None
+        self.captions = False  # reserve a caption line (set before show())
+        self.expected_language: Optional[str] = None  # None = any
+        self._stable = ""
+        self._tentative = ""
+        self._language = ""
+        self._silent_since: Optional[float] = None
 
     # ── Public API ────────────────────────────────────────────────
 
@@ -32,6 +49,8 @@ class RecordingOverlay:
             return
         self._parent = parent
         self._running = True
+        self._stable = self._tentative = self._language = ""
+        self._silent_since = time.monotonic()
         if parent:
             parent.after(0, self._create)
 
@@ -44,6 +63,16 @@ class RecordingOverlay:
     def set_level(self, level: float):
         """Set current audio amplitude (0.0 – 1.0)."""
         self._level = max(0.0, min(1.0, level))
+        if level > self.DEAD_MIC_LEVEL:
+            self._silent_since = None
+        elif self._silent_since is None:
+            self._silent_since = time.monotonic()
+
+    def set_caption(self, stable: str, tentative: str, language: str = ""):
+        """Update the live caption: settled words + still-changing tail."""
+        self._stable = stable
+        self._tentative = tentative
+        self._language = language
 
     # ── Window ────────────────────────────────────────────────────
 
@@ -58,16 +87,17 @@ class RecordingOverlay:
             win.attributes("-topmost", True)
             win.attributes("-alpha", 0.95)
 
+            w, h = self._size()
             sw = win.winfo_screenwidth()
             sh = win.winfo_screenheight()
-            x = (sw - self.W) // 2
-            y = sh - self.H - self.BOTTOM_MARGIN
-            win.geometry(f"{self.W}x{self.H}+{x}+{y}")
+            x = (sw - w) // 2
+            y = sh - h - self.BOTTOM_MARGIN
+            win.geometry(f"{w}x{h}+{x}+{y}")
             win.configure(bg="#120d2b")
 
             self._canvas = tk.Canvas(
                 win,
-                width=self.W, height=self.H,
+                width=w, height=h,
                 bg="#120d2b",
                 highlightthickness=0,
                 bd=0,
@@ -95,6 +125,11 @@ class RecordingOverlay:
         self._win = None
         self._canvas = None
 
+    def _size(self) -> tuple[int, int]:
+        if self.captions:
+            return self.CAPTION_W, self.H + self.CAPTION_H
+        return self.W, self.H
+
     # ── Animation ─────────────────────────────────────────────────
 
     def _tick(self):
@@ -109,11 +144,12 @@ class RecordingOverlay:
 
     def _draw(self):
         c = self._canvas
-        W, H = self.W, self.H
+        W, full_h = self._size()
+        H = self.H
         c.delete("all")
 
         # Background with thin purple border
-        c.create_rectangle(0, 0, W, H, fill="#120d2b", outline="#5b21b6", width=2)
+        c.create_rectangle(0, 0, W, full_h, fill="#120d2b", outline="#5b21b6", width=2)
 
         cy = H // 2
 
@@ -162,3 +198,37 @@ class RecordingOverlay:
 
             c.create_rectangle(x, cy - amp, x + bw, cy + amp,
                                fill=col, outline="")
+
+        if self.captions:
+            self._draw_caption(c, W, H + self.CAPTION_H // 2 - 4)
+
+    def _draw_caption(self, c: tk.Canvas, W: int, y: int):
+        silent = (self._silent_since is not None
+                  and time.monotonic() - self._silent_since > self.DEAD_MIC_S)
+        if silent:
+            c.create_text(12, y, text="🔇 Brak sygnału — sprawdź mikrofon",
+                          fill="#f59e0b", font=("Segoe UI", 9), anchor="w")
+            return
+
+        x = 12
+        if self._language:
+            wrong = self.expected_language not in (None, self._language)
+            item = c.create_text(x, y, text=self._language.upper(),
+                                 fill="#f59e0b" if wrong else "#6b5e9b",
+                                 font=("Segoe UI", 8, "bold"), anchor="w")
+            x = c.bbox(item)[2] + 8
+
+        # Show the tail that fits; keep the settled/tentative split
+        stable, tentative = self._stable, self._tentative
+        excess = len(stable) + len(tentative) + 1 - self.CAPTION_CHARS
+        if excess > 0:
+            cut = min(excess, len(stable))
+            stable = "…" + stable[cut:].lstrip() if cut else stable
+            tentative = tentative[excess - cut:]
+        if stable:
+            item = c.create_text(x, y, text=stable, fill="#ede9fe",
+                                 font=("Segoe UI", 9), anchor="w")
+            x = c.bbox(item)[2] + 4
+        if tentative:
+            c.create_text(x, y, text=tentative, fill="#7c6fae",
+                          font=("Segoe UI", 9, "italic"), anchor="w")
@@ -1,16 +1,83 @@
-"""VoxFlow Audio Recorder - Captures microphone input with device selection."""
+"""VoxFlow Audio Recorder - Captures microphone input with device selection.
+
+Audio is captured at the device's native rate, downmixed to mono in the
+callback and converted to 16 kHz block by block on a worker thread (which
+also runs the incremental VAD), so stop() returns Whisper-ready audio.
+
+Two stream modes:
+- cold (default): the input stream is opened on start() and closed on stop().
+- warm (opt-in): the stream stays open between recordings and keeps the
+  last few hundred ms in a pre-roll ring, so a recording begins with audio
+  from *before* the key press and keeps a short tail after release.
+
+In cold mode the stream can also be opened speculatively with prepare()
+(e.g. when the first key of a combo hotkey goes down). A prepared stream
+discards every block until start() — nothing is kept if it's abandoned.
+
+Device enumeration and PortAudio restarts live in voxflow.devices; the
+recorder only reads cached device info and offers quiesced() for rescans.
+"""
 import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
 import numpy as np
 import sounddevice as sd
-from typing import Optional, Callable
+from typing import Optional, Callable, Union
+
+from voxflow.audio_buffer import CaptureBuffer, RingBuffer, StreamRing
+from voxflow.echo_gate import EchoGate
+from voxflow.resampler import TARGET_RATE, StreamingResampler, downmix
+from voxflow.spill import SpillWriter
+from voxflow.vad import StreamingVAD
+
+# Spill mode: seconds of native-rate audio the callback ring can hold
+# before the worker must have drained it
+SPILL_RING_SECONDS = 10.0
+
+# The capture VAD's absolute threshold never exceeds this share of the
+# loudest frame, so a quiet mic is judged by its noise floor instead
+VAD_PEAK_RATIO = 0.1
+
+# Upper bounds (µs) of the callback-duration histogram buckets
+CALLBACK_US_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class CallbackStats:
+    """Per-recording health of the real-time audio callback.
+
+    Written only by the callback (single writer), read after stop().
+    """
+
+    __slots__ = ("callbacks", "overflows", "underflows", "worker_overruns", "max_us", "histogram")
+
+    def __init__(self):
+        self.callbacks = 0
+        self.overflows = 0  # input overflow: blocks lost before we saw them
+        self.underflows = 0
+        self.worker_overruns = 0  # spill ring lapped the worker (written by the worker)
+        self.max_us = 0.0
+        # One slot per bucket plus the overflow bucket (> last bound)
+        self.histogram = [0] * (len(CALLBACK_US_BUCKETS) + 1)
+
+    def as_dict(self) -> dict:
+        labels = [f"<={b}us" for b in CALLBACK_US_BUCKETS] + [f">{CALLBACK_US_BUCKETS[-1]}us"]
+        return {
+            "callbacks": self.callbacks,
+            "overflows": self.overflows,
+            "underflows": self.underflows,
+            "worker_overruns": self.worker_overruns,
+            "max_callback_us": round(self.max_us, 1),
+            "callback_us_histogram": dict(zip(labels, self.histogram)),
+        }
 
 
 class AudioRecorder:
-    """Records audio from the microphone into a numpy buffer."""
+    """Records audio from the microphone into a preallocated numpy buffer."""
 
     def __init__(
         self,
-        sample_rate: int = 16000,
+        sample_rate: int = TARGET_RATE,
         channels: int = 1,
         silence_threshold: float = 0.01,
         silence_duration: float = 2.0,
@@ -19,8 +86,21 @@ class AudioRecorder:
         on_level_change: Optional[Callable[[float], None]] = None,
         on_device_fallback: Optional[Callable[[int], None]] = None,
         on_max_duration: Optional[Callable[[], None]] = None,
+        block_duration: float = 0.1,
+        latency: Union[str, float] = "high",
+        warm_stream: bool = False,
+        preroll: float = 0.5,
+        tail: float = 0.25,
+        vad_enabled: bool = True,
+        vad_silence_ms: int = 300,
+        capture_rate: Optional[int] = None,
+        spill: bool = False,
+        device_info: Optional[Callable[[Optional[int]], Optional[dict]]] = None,
     ):
-        self.sample_rate = sample_rate
+        self.sample_rate = sample_rate  # rate of the audio handed out by stop()
+        # Rate requested from the device; None = its native rate
+        self.capture_rate = capture_rate
+        self.stream_rate = capture_rate or sample_rate  # rate of the open stream
         self.channels = channels
         self.silence_threshold = silence_threshold
         self.silence_duration = silence_duration
@@ -29,136 +109,577 @@ class AudioRecorder:
         self.on_level_change = on_level_change
         self.on_device_fallback = on_device_fallback
         self.on_max_duration = on_max_duration
+        # Endpointing: after speech, stop once this many seconds were
+        # silent (None = only stop on release / limit). Needs the VAD.
+        self.endpoint_silence: Optional[float] = None
+        self.on_endpoint: Optional[Callable[[], None]] = None
+        # Cached device lookup (DeviceRegistry.get) — spares a PortAudio query per open
+        self.device_info = device_info
+        self.block_duration = block_duration  # seconds per callback block
+        self.latency = latency  # PortAudio suggested latency: "low", "high" or seconds
+        self.warm_stream = warm_stream
+        self.preroll = preroll  # warm mode: seconds kept from before start()
+        self.tail = tail  # warm mode: seconds still captured after stop()
+        self.vad_enabled = vad_enabled
+        self.vad_silence_ms = vad_silence_ms
+        # Stream 16 kHz int16 to a memory-mapped file instead of RAM
+        self.spill = spill
+        self.last_spill_path = None  # spill file of the last stopped recording
 
         self._recording = False
-        self._audio_chunks: list[np.ndarray] = []
+        self._buffer: Optional[CaptureBuffer] = None
+        self._preroll: Optional[RingBuffer] = None
         self._stream: Optional[sd.InputStream] = None
-        self._lock = threading.Lock()
-        self._silence_counter = 0
-        self._has_speech = False
+        # Serializes opening/closing the stream (UI, hotkey and timer threads)
+        self._stream_lock = threading.RLock()
+        self._start_t0: Optional[float] = None
+        # perf_counter time at which the first recorded sample hit the ADC
+        self._capture_t0: Optional[float] = None
+        self._input_latency = 0.0  # of the open stream, seconds
+        # Seconds from start() until audio of the press instant is captured
+        self.start_latency: Optional[float] = None
+
+        # Per-recording worker: resamples to 16 kHz and runs the VAD
+        self._output: Optional[CaptureBuffer] = None
+        self._resampler: Optional[StreamingResampler] = None
+        self._vad: Optional[StreamingVAD] = None
+        self._worker: Optional[threading.Thread] = None
+        self._worker_wake = threading.Event()
+        self._worker_done = threading.Event()
+        # Removes our own chimes from the recording (see expect_playback)
+        self._gate: Optional[EchoGate] = None
+        self.last_cancelled: list[tuple[float, float]] = []
+        # Speech spans (seconds) of the last stopped recording; None = VAD off
+        self.last_speech_spans: Optional[list[tuple[float, float]]] = None
+
+        # Callback health: xruns and timing, reset on every start()
+        self._stats = CallbackStats()
+        self.last_stats: Optional[dict] = None
 
     @property
     def is_recording(self) -> bool:
         return self._recording
 
+    @property
+    def duration(self) -> float:
+        """Seconds captured so far in the current recording (O(1))."""
+        buffer = self._buffer
+        return len(buffer) / self.stream_rate if buffer is not None else 0.0
+
+    @property
+    def has_speech(self) -> bool:
+        """True once the VAD has heard speech in the current recording."""
+        vad = self._vad
+        return vad is not None and bool(vad.spans())
+
+    @property
+    def is_warm(self) -> bool:
+        """True while a warm stream is open between recordings."""
+        return self.warm_stream and self._stream is not None
+
     def set_device(self, device_index: int):
-        """Change the audio input device. Takes effect on next start()."""
+        """Change the audio input device. Takes effect on next start().
+
+        A warm stream is reopened right away on the new device.
+        """
         self.device_index = device_index
+        if self.warm_stream and self._stream is not None and not self._recording:
+            self.close()
+            self.open_warm()
+
+    def switch_device(self, device_index: int):
+        """Switch input device, opening the new one before letting go of the old.
+
+        The new device is opened (not started) first, so a device that
+        cannot be opened raises here and the current one stays selected.
+        In warm mode the opened stream replaces the running one with only
+        a start() in between; in cold mode it is just a capability check.
+        Blocks on the device open — call it off the Tk thread.
+        """
+        device = None if device_index < 0 else device_index
+        with self._stream_lock:
+            # Opened under the lock: a PortAudio restart (quiesced) must
+            # not slip in between creating the stream and starting it
+            new_stream = self._make_stream(device)
+            if not self.warm_stream or self._recording or self._stream is None:
+                # Nothing running to hand over (or mid-recording: the
+                # device changes for the next recording)
+                new_stream.close()
+                self.device_index = device_index
+                return
+            self._close_stream()
+            self.device_index = device_index
+            self._stream = new_stream
+            self.stream_rate = int(new_stream.samplerate)
+            self._preroll = RingBuffer(int(self.preroll * self.stream_rate))
+            new_stream.start()
+
+    @property
+    def live_length(self) -> int:
+        """16 kHz samples of the current recording ready for reading."""
+        output = self._output
+        return len(output) if output is not None else 0
+
+    def live_audio(self, start: int, end: int) -> np.ndarray:
+        """16 kHz samples [start, end) of the current recording, mid-capture.
+
+        Lets a streaming decoder work on finished parts while the user is
+        still speaking. Only samples below live_length are complete.
+        """
+        output = self._output
+        if output is None:
+            return np.empty(0, dtype=np.float32)
+        return output.read(start, min(end, len(output)))
+
+    def live_spans(self) -> list[tuple[int, int]]:
+        """Finished speech spans of the current recording (16 kHz samples)."""
+        vad = self._vad
+        return vad.closed_spans() if vad is not None and self._recording else []
+
+    def expect_playback(self, samples: np.ndarray, when: float):
+        """Our own sound (at sample_rate) started playing at perf_counter `when`.
+
+        If the microphone picks it up, it is cancelled out of the current
+        recording before the VAD or Whisper ever see it.
+        """
+        gate = self._gate
+        if gate is not None and self._recording:
+            gate.expect(samples, when)
+
+    def recent_audio(self, mark: int) -> Optional[tuple[np.ndarray, int]]:
+        """Warm-stream audio captured since `mark`, at stream_rate.
+
+        Returns (samples, new_mark), or None when no warm stream is
+        listening (closed, or the ring is handed over to a recording).
+        """
+        preroll = self._preroll
+        if preroll is None or self._recording:
+            return None
+        return preroll.read_new(mark)
+
+    @contextmanager
+    def quiesced(self):
+        """Hold all streams closed for a PortAudio restart.
+
+        Yields False (and touches nothing) while recording. A warm stream
+        is reopened afterwards; start() waits on the lock meanwhile.
+        """
+        with self._stream_lock:
+            if self._recording:
+                yield False
+                return
+            reopen = self.warm_stream and self._stream is not None
+            self._close_stream()
+            self._preroll = None
+            try:
+                yield True
+            finally:
+                if reopen:
+                    try:
+                        self.open_warm()
+                    except Exception as e:
+                        print(f"Warm stream reopen failed: {e}")
+
+    @property
+    def is_prepared(self) -> bool:
+        """True while a speculatively opened stream waits for start()."""
+        return not self.warm_stream and not self._recording and self._stream is not None
+
+    def open_warm(self):
+        """Open the always-on input stream (warm mode only). Idempotent."""
+        with self._stream_lock:
+            if not self.warm_stream or self._stream is not None:
+                return
+            self._open_stream()
+            self._preroll = RingBuffer(int(self.preroll * self.stream_rate))
+
+    def prepare(self):
+        """Open the input stream ahead of start() to hide the open latency.
+
+        No-op in warm mode (the stream is already open) or while recording.
+        Blocks arriving before start() are dropped, never buffered.
+        """
+        with self._stream_lock:
+            if self.warm_stream or self._recording or self._stream is not None:
+                return
+            try:
+                self._open_stream()
+            except Exception as e:
+                # start() will retry and surface the error to the user
+                print(f"Speculative stream open failed: {e}")
+
+    def discard_prepared(self):
+        """Close a prepared stream that start() never claimed."""
+        with self._stream_lock:
+            if self.is_prepared:
+                self._close_stream()
+
+    def close(self):
+        """Close the input stream, whatever the mode. Captured audio is dropped."""
+        with self._stream_lock:
+            self._recording = False
+            self._close_stream()
+            self._buffer = None
+            self._output = None
+            self._preroll = None
+            self._worker_done.set()
+            self._worker_wake.set()
+
+    def _close_stream(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
 
     def start(self):
         """Start recording audio from the selected microphone."""
         if self._recording:
             return
 
-        self._audio_chunks = []
-        self._recording = True
-        self._silence_counter = 0
-        self._has_speech = False
+        self._start_t0 = time.perf_counter()
+        self.start_latency = None
+
+        if self.warm_stream:
+            with self._stream_lock:
+                if self._stream is None:
+                    self.open_warm()
+                self._start_buffer()
+                self._recording = True
+                # Seed the recording with the audio from just before the
+                # press. From here on the callback appends to the capture
+                # buffer and leaves the ring alone, so the snapshot only has
+                # to wait for a write that was already in flight.
+                preroll, seed = self._preroll, None
+                if preroll is not None:
+                    seed = preroll.snapshot()
+                    preroll.clear()
+                    if isinstance(self._buffer, CaptureBuffer):
+                        self._buffer.write_prefix(seed)
+                        seed = None
+                self._start_worker(seed)
+            self.start_latency = time.perf_counter() - self._start_t0
+            return
+
+        with self._stream_lock:
+            # Open first (or claim a prepared stream): the buffers are sized
+            # for the rate the device actually runs at. Blocks arriving
+            # before _recording flips are dropped.
+            if self._stream is None:
+                self._open_stream()
+            self._start_buffer()
+            self._recording = True
+            self._start_worker()
 
+    def _open_stream(self):
+        """Open and start the input stream, falling back to the default device."""
         # Resolve device: -1 → None (sounddevice default)
         device = None if self.device_index < 0 else self.device_index
 
         try:
-            self._stream = sd.InputStream(
-                device=device,
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                dtype="float32",
-                blocksize=int(self.sample_rate * 0.1),  # 100ms blocks
-                callback=self._audio_callback,
-            )
+            self._stream = self._make_stream(device)
             self._stream.start()
         except Exception as e:
-            self._recording = False
+            self._stream = None
             # Retry with default device if selected one fails
-            if device is not None:
-                print(f"Device {device} failed, falling back to default: {e}")
-                self.device_index = -1
-                # Notify app so it can update UI and config permanently
-                if self.on_device_fallback:
-                    try:
-                        self.on_device_fallback(-1)
-                    except Exception:
-                        pass
-                self._stream = sd.InputStream(
-                    samplerate=self.sample_rate,
-                    channels=self.channels,
-                    dtype="float32",
-                    blocksize=int(self.sample_rate * 0.1),
-                    callback=self._audio_callback,
-                )
-                self._recording = True
-                self._stream.start()
-            else:
+            if device is None:
                 raise
+            print(f"Device {device} failed, falling back to default: {e}")
+            self.device_index = -1
+            # Notify app so it can update UI and config permanently
+            if self.on_device_fallback:
+                try:
+                    self.on_device_fallback(-1)
+                except Exception:
+                    pass
+            self._stream = self._make_stream(None)
+            self._stream.start()
+        self.stream_rate = int(self._stream.samplerate)
+        self._input_latency = float(getattr(self._stream, "latency", 0.0) or 0.0)
+
+    def _resolve_capture_rate(self, device: Optional[int]) -> int:
+        """Requested capture rate, or the device's native rate."""
+        if self.capture_rate:
+            return int(self.capture_rate)
+        if self.device_info is not None:
+            info = self.device_info(device)
+            if info:
+                return int(info["sample_rate"])
+        try:
+            return int(sd.query_devices(device, "input")["default_samplerate"])
+        except Exception:
+            return self.sample_rate
+
+    def _make_stream(self, device: Optional[int]) -> sd.InputStream:
+        rate = self._resolve_capture_rate(device)
+        return sd.InputStream(
+            device=device,
+            samplerate=rate,
+            channels=self.channels,
+            dtype="float32",
+            blocksize=int(rate * self.block_duration),
+            latency=self.latency,
+            callback=self._audio_callback,
+        )
+
+    def _start_buffer(self):
+        """Reset per-recording state and allocate fresh buffers.
+
+        Room for the longest allowed recording is reserved up front, so the
+        audio callback only ever copies into place and bumps a cursor. The
+        buffers are never reused: the previous output may still be
+        referenced by a transcription running in the background.
+
+        In spill mode the callback writes into a small ring instead and the
+        worker moves the audio on to a memory-mapped file, so RAM use does
+        not depend on the recording length.
+        """
+        rate = self.stream_rate
+        self._stats = CallbackStats()
+        self._resampler = StreamingResampler(rate, self.sample_rate)
+        self._gate = EchoGate(self.sample_rate)
+        self._capture_t0 = None
+        self._worker_done = threading.Event()
+        self._worker_wake = threading.Event()
+        if self.spill:
+            self._output = SpillWriter(self.sample_rate)
+            self._buffer = StreamRing(int(SPILL_RING_SECONDS * rate))
+            return
+        capacity = int(np.ceil(self.max_duration * rate))
+        prefix = int(self.preroll * rate) if self.warm_stream else 0
+        buffer = CaptureBuffer(capacity, prefix=prefix)
+        if self._resampler.is_passthrough:
+            # Already at 16 kHz — the capture buffer is the output
+            self._output = buffer
+        else:
+            self._output = CaptureBuffer(self._resampler.output_length(capacity + prefix) + 1)
+        # Published last: the callback starts appending as soon as it sees it
+        self._buffer = buffer
 
     def stop(self) -> Optional[np.ndarray]:
-        """Stop recording and return the audio data as a numpy array.
+        """Stop recording and return the 16 kHz mono audio as a numpy array.
+
+        The result is a contiguous 1D view into the output buffer — no
+        concatenation copy. Resampling and VAD ran incrementally while
+        recording, so only the last block is left to process here. The
+        recorder lets go of the buffer, so the view stays valid for as
+        long as the caller holds it.
 
         Note: after hitting max_duration the callback flips _recording to
         False on its own, but the stream stays open and the captured audio
         must still be returned — so we key off the stream, not the flag.
         """
-        if not self._recording and self._stream is None:
+        if self.warm_stream:
+            # The stream stays open; keep capturing the tail so trailing
+            # consonants cut off by an early key release still make it in.
+            if self._recording and self.tail > 0:
+                time.sleep(self.tail)
+            self._recording = False
+            self._buffer = None
+            output, self._output = self._output, None
+        else:
+            with self._stream_lock:
+                if not self._recording and self._stream is None:
+                    return None
+
+                self._recording = False
+
+                if self._stream is not None:
+                    self._stream.stop()
+                    self._stream.close()
+                    self._stream = None
+
+                self._buffer = None
+                output, self._output = self._output, None
+
+        self.last_speech_spans = self._finish_worker()
+        self.last_stats = self._stats.as_dict()
+        self.last_cancelled = list(self._gate.cancelled) if self._gate else []
+        if self.last_cancelled:
+            print(f"[Recorder] removed own chime at {self.last_cancelled[0][0]:.2f}s")
+        if self.last_stats["overflows"]:
+            print(f"[Recorder] {self.last_stats['overflows']} input overflow(s) — audio was lost")
+
+        if isinstance(output, SpillWriter):
+            self.last_spill_path = output.path
+            audio = output.finalize()
+            return audio if len(audio) else None
+
+        if output is None or len(output) == 0:
             return None
+        return output.view()
 
-        self._recording = False
+    # ── Processing worker (resampling + incremental VAD) ─────────
 
-        if self._stream is not None:
-            self._stream.stop()
-            self._stream.close()
-            self._stream = None
+    def _start_worker(self, seed: Optional[np.ndarray] = None):
+        """Start the consumer thread for this recording.
 
-        with self._lock:
-            if not self._audio_chunks:
-                return None
-            audio = np.concatenate(self._audio_chunks, axis=0)
-            self._audio_chunks = []
+        It does everything the real-time callback must not: resampling,
+        VAD, level metering, the duration limit and the app callbacks.
+        """
+        vad = None
+        if self.vad_enabled or self.endpoint_silence:
+            vad = StreamingVAD(
+                sample_rate=self.sample_rate,
+                threshold=self.silence_threshold,
+                min_silence_ms=self.vad_silence_ms,
+                # Unnormalized audio: don't hold a quiet mic to the fixed level
+                peak_ratio=VAD_PEAK_RATIO,
+            )
+        self._vad = vad
+        self._worker = threading.Thread(
+            target=self._process_loop,
+            args=(self._buffer, self._output, self._resampler, vad,
+                  self._worker_wake, self._worker_done, seed),
+            daemon=True,
+        )
+        self._worker.start()
 
-        # Flatten to 1D mono
-        if audio.ndim > 1:
-            audio = audio[:, 0]
+    def _process_loop(self, capture, output, resampler: StreamingResampler,
+                      vad: Optional[StreamingVAD], wake: threading.Event,
+                      done: threading.Event, seed: Optional[np.ndarray] = None):
+        """Turn newly captured samples into 16 kHz audio + speech spans.
 
-        return audio
+        Runs off the audio thread. The capture buffer (or spill ring) is
+        append-only and the write position only advances after a block is
+        fully written, so everything below len(capture) is stable.
+        `seed` is pre-roll audio that goes out ahead of the capture.
+        """
+        copy_out = output is not capture
+        gate = self._gate
+        # 16 kHz samples ahead of the first sample captured after start()
+        pre = seed.shape[0] if seed is not None else getattr(capture, "prefix_length", 0)
+        pre_out = pre * self.sample_rate / self.stream_rate
 
-    def _audio_callback(self, indata: np.ndarray, frames: int, time_info, status):
-        """Callback for audio stream - stores chunks and monitors levels."""
-        if not self._recording:
-            return
+        def release(block: np.ndarray, final: bool = False):
+            if gate is not None:
+                t0 = self._capture_t0
+                if t0 is not None and gate.active:
+                    gate.place(lambda t: pre_out + (t - t0) * self.sample_rate)
+                block, offset, modified = gate.feed(block, final)
+                if modified and not copy_out:
+                    output.read(offset, offset + block.shape[0])[:] = block
+            if copy_out:
+                output.write(block)
+            if vad is not None:
+                vad.process(block)
+
+        def emit(block: np.ndarray):
+            release(resampler.process(block))
 
-        with self._lock:
-            self._audio_chunks.append(indata.copy())
+        if seed is not None and seed.shape[0]:
+            emit(seed)
+        processed = 0
+        level_window = max(1, int(self.stream_rate * self.block_duration))
+        limit = int(np.ceil(self.max_duration * self.stream_rate))
+        limit_reported = False
+        endpoint = self.endpoint_silence
+        endpoint_samples = int(endpoint * self.sample_rate) if endpoint else 0
+        endpoint_reported = vad is None or not endpoint
+        while True:
+            wake.wait(0.25)
+            wake.clear()
+            available = min(len(capture), limit)
+            if available > processed:
+                if available - processed > getattr(capture, "capacity", available):
+                    self._stats.worker_overruns += 1
+                block = capture.read(processed, available)
+                processed = available
+                self._report_level(block[-level_window:])
+                emit(block)
+                if not endpoint_reported and vad.trailing_silence >= endpoint_samples:
+                    endpoint_reported = True
+                    self._on_endpoint()
+            if processed >= limit and not limit_reported:
+                limit_reported = True
+                self._on_limit_reached()
+            if done.is_set() and min(len(capture), limit) == processed:
+                break
+        release(resampler.flush(), final=True)
+        if vad is not None:
+            vad.flush()
+
+    def _report_level(self, samples: np.ndarray):
+        """Send the RMS of the newest block to the UI."""
+        if not self.on_level_change or samples.shape[0] == 0:
+            return
+        level = float(np.sqrt(np.dot(samples, samples) / samples.shape[0]))
+        try:
+            self.on_level_change(level)
+        except Exception:
+            pass
 
-        # Calculate audio level (RMS)
-        level = float(np.sqrt(np.mean(indata ** 2)))
+    def _on_limit_reached(self):
+        """Capture buffer is full — max_duration reached."""
+        self._recording = False
+        # Let the app finish the recording (stop stream, transcribe) —
+        # otherwise the UI stays in "recording" state until key release.
+        if self.on_max_duration:
+            try:
+                self.on_max_duration()
+            except Exception:
+                pass
 
-        # Report level to UI
-        if self.on_level_change:
+    def _on_endpoint(self):
+        """The speaker has been silent for endpoint_silence seconds."""
+        if self.on_endpoint:
             try:
-                self.on_level_change(level)
+                self.on_endpoint()
             except Exception:
                 pass
 
-        # Track if we've heard any speech
-        if level > self.silence_threshold:
-            self._has_speech = True
-            self._silence_counter = 0
-        else:
-            self._silence_counter += 1
+    def _finish_worker(self) -> Optional[list[tuple[float, float]]]:
+        """Drain the worker and return the recording's speech spans."""
+        vad, worker = self._vad, self._worker
+        self._worker = None
+        if worker is None:
+            return None
+        self._worker_done.set()
+        self._worker_wake.set()
+        # Only the last block or two are left to process
+        worker.join(timeout=2.0)
+        if worker.is_alive():
+            # Still resampling or writing the spill file: finalizing the
+            # output or reading the spans now would race with it
+            print("[Recorder] capture worker slow to finish — waiting")
+            worker.join()
+        return vad.spans_seconds() if vad is not None else None
 
-        # Check recording limits
-        total_samples = sum(c.shape[0] for c in self._audio_chunks)
-        total_duration = total_samples / self.sample_rate
+    def _audio_callback(self, indata: np.ndarray, frames: int, time_info, status):
+        """Real-time callback: one copy into the lock-free buffer, then a signal.
 
-        if total_duration >= self.max_duration:
-            self._recording = False
-            # Let the app finish the recording (stop stream, transcribe) —
-            # otherwise the UI stays in "recording" state until key release.
-            if self.on_max_duration:
-                try:
-                    self.on_max_duration()
-                except Exception:
-                    pass
+        Runs on PortAudio's thread — no locks, no allocation beyond the
+        downmix, no UI calls. Everything else happens on the worker.
+        """
+        t0 = time.perf_counter()
+        stats = self._stats
+        if status:
+            if status.input_overflow:
+                stats.overflows += 1
+            if status.input_underflow:
+                stats.underflows += 1
+
+        # Mono at the native rate — resampling happens on the worker
+        mono = downmix(indata)
+        buffer = self._buffer
+        if self._recording and buffer is not None:
+            buffer.write(mono)
+            self._worker_wake.set()
+            if self._capture_t0 is None:
+                self._capture_t0 = t0 - frames / self.stream_rate - self._input_latency
+            if self.start_latency is None and self._start_t0 is not None:
+                self.start_latency = time.perf_counter() - self._start_t0
+        elif self._preroll is not None:
+            # Warm stream between recordings: only refresh the pre-roll
+            self._preroll.write(mono)
+
+        us = (time.perf_counter() - t0) * 1e6
+        stats.callbacks += 1
+        stats.histogram[bisect_left(CALLBACK_US_BUCKETS, us)] += 1
+        if us > stats.max_us:
+            stats.max_us = us
 
     @staticmethod
     def list_devices() -> list[dict]:
@@ -175,22 +696,6 @@ class AudioRecorder:
                 })
         return input_devices
 
-    @staticmethod
-    def refresh_device_list() -> list[dict]:
-        """Re-scan hardware and return the fresh input device list.
-
-        PortAudio caches devices at init time, so devices plugged in after
-        startup are invisible to query_devices() — restarting PortAudio is
-        the documented way to rescan. Must not be called while a stream
-        is open.
-        """
-        try:
-            sd._terminate()
-            sd._initialize()
-        except Exception:
-            pass
-        return AudioRecorder.list_devices()
-
     @staticmethod
     def get_default_device_name() -> str:
         """Get the name of the current default input device."""
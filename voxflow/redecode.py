@@ -0,0 +1,81 @@
+"""VoxFlow Selective Re-decoding - A second look at the weak segments only.
+
+Whisper reports how sure it was of every segment: the average token
+log-probability, the compression ratio of the text and whether it had to
+fall back to sampling. Most of a dictation decodes confidently; the
+errors cluster in a few segments — a mumbled word, a name, a noisy
+second. Running the whole recording again with a wider beam or a bigger
+model pays for all of it to fix those few.
+
+Instead, consecutive weak segments are grouped into regions, only their
+audio is decoded again (wider beam, or a larger model), and the result is
+spliced in place of the old segments — if it actually scored better.
+"""
+from typing import Optional
+
+# A segment is weak below this average log-probability…
+WEAK_LOGPROB = -0.8
+# …above this compression ratio (repetitive text)…
+WEAK_COMPRESSION = 2.0
+# …or if the temperature fallback kicked in. Segments that are most likely
+# silence are left alone — a better decode of nothing is still nothing
+SILENCE_PROB = 0.6
+# Audio kept around a region (s), never reaching into a confident neighbour
+REGION_PAD_S = 0.2
+# Regions shorter than this are widened — too little audio to decode well
+MIN_REGION_S = 1.0
+
+
+def is_weak(seg: dict) -> bool:
+    if seg["no_speech_prob"] > SILENCE_PROB:
+        return False
+    return (seg["avg_logprob"] < WEAK_LOGPROB
+            or seg["compression_ratio"] > WEAK_COMPRESSION
+            or seg["temperature"] > 0.0)
+
+
+def weak_regions(segments: list, duration: float) -> list[tuple[int, int, float, float]]:
+    """Runs of weak segments as (first, last, start_s, end_s), in order."""
+    regions = []
+    i = 0
+    while i < len(segments):
+        if not is_weak(segments[i]):
+            i += 1
+            continue
+        first = i
+        while i + 1 < len(segments) and is_weak(segments[i + 1]):
+            i += 1
+        last = i
+        lo = segments[first - 1]["end"] if first > 0 else 0.0
+        hi = segments[last + 1]["start"] if last + 1 < len(segments) else duration
+        start = max(lo, segments[first]["start"] - REGION_PAD_S)
+        end = min(hi, segments[last]["end"] + REGION_PAD_S)
+        if end - start < MIN_REGION_S:
+            grow = (MIN_REGION_S - (end - start)) / 2
+            start, end = max(lo, start - grow), min(hi, end + grow)
+        if end > start:
+            regions.append((first, last, start, end))
+        i += 1
+    return regions
+
+
+def score(segments: list) -> Optional[float]:
+    """Duration-weighted average log-probability, None for no segments."""
+    if not segments:
+        return None
+    weights = [max(seg["end"] - seg["start"], 0.1) for seg in segments]
+    return sum(w * seg["avg_logprob"] for w, seg in zip(weights, segments)) / sum(weights)
+
+
+def better(old: list, new: list) -> bool:
+    """Whether the re-decoded segments should replace the old ones."""
+    new_score = score(new)
+    if new_score is None:
+        return False
+    if any(seg["compression_ratio"] > WEAK_COMPRESSION for seg in new):
+        return False
+    return new_score > score(old)
+
+
+def splice(segments: list, first: int, last: int, new: list) -> list:
+    return segments[:first] + new + segments[last + 1:]
@@ -0,0 +1,121 @@
+"""VoxFlow Resampler - Streaming polyphase conversion to Whisper's 16 kHz.
+
+Microphones run at their native rate (typically 44.1 or 48 kHz). Forcing
+16 kHz on the device either fails (and used to trigger a fallback to the
+default mic) or leaves the conversion to a driver of unknown quality. We
+capture natively and convert block by block while recording, so the
+16 kHz signal is complete the moment the key is released.
+
+The filter is the same Kaiser-windowed low-pass that scipy's
+resample_poly designs, applied as a polyphase FIR with carried state.
+"""
+from math import gcd
+
+import numpy as np
+
+# Whisper models are trained on 16 kHz mono
+TARGET_RATE = 16000
+
+
+def downmix(block: np.ndarray) -> np.ndarray:
+    """Average all channels into one (float32). 1D input is returned as-is."""
+    if block.ndim == 1:
+        return block
+    if block.shape[1] == 1:
+        return block[:, 0]
+    return block.mean(axis=1, dtype=np.float32)
+
+
+class StreamingResampler:
+    """Rational-ratio polyphase resampler that processes audio in blocks.
+
+    Feeding a signal in arbitrary block sizes and calling flush() at the
+    end yields the same samples as resampling it in one go, with the
+    filter's group delay already compensated.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int = TARGET_RATE, half_len_per_factor: int = 10):
+        in_rate, out_rate = int(in_rate), int(out_rate)
+        g = gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // g
+        self.down = in_rate // g
+
+        if self.is_passthrough:
+            return
+
+        from scipy.signal import firwin
+
+        max_rate = max(self.up, self.down)
+        half_len = half_len_per_factor * max_rate
+        taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+        taps = (taps * self.up).astype(np.float32)
+
+        # Polyphase decomposition: phase p uses taps p, p+up, p+2*up, ...
+        self._n_taps = taps.shape[0]
+        self._sub_len = -(-self._n_taps // self.up)  # ceil
+        padded = np.zeros(self._sub_len * self.up, dtype=np.float32)
+        padded[:self._n_taps] = taps
+        self._phases = padded.reshape(self._sub_len, self.up).T.copy()  # (up, sub_len)
+        self._delay = half_len  # group delay, in upsampled samples
+
+        # State: the last sub_len-1 input samples (zeros before the start)
+        self._history = np.zeros(self._sub_len - 1, dtype=np.float32)
+        self._n_in = 0   # input samples consumed so far
+        self._n_out = 0  # output samples produced so far
+        self._lags = np.arange(self._sub_len)
+
+    @property
+    def is_passthrough(self) -> bool:
+        return self.up == self.down
+
+    @property
+    def ratio(self) -> float:
+        return self.out_rate / self.in_rate
+
+    def output_length(self, n_in: int) -> int:
+        """Total output samples for n_in input samples (after flush)."""
+        return -(-n_in * self.up // self.down)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample the next mono block; returns whatever output is ready."""
+        if self.is_passthrough:
+            return block
+        block = np.asarray(block, dtype=np.float32)
+        return self._run(block, final=False)
+
+    def flush(self) -> np.ndarray:
+        """Emit the remaining output at the end of the stream."""
+        if self.is_passthrough:
+            return np.empty(0, dtype=np.float32)
+        # Outputs near the end need input past the last sample — the
+        # filter's look-ahead — which is zero by definition.
+        pad = np.zeros(self._delay // self.up + self._sub_len, dtype=np.float32)
+        return self._run(pad, final=True)
+
+    def _run(self, block: np.ndarray, final: bool) -> np.ndarray:
+        ext = np.concatenate((self._history, block))
+        ext_start = self._n_in - self._history.shape[0]  # global index of ext[0]
+        n_avail = self._n_in + (0 if final else block.shape[0])
+        if final:
+            n_last = self.output_length(self._n_in)
+        else:
+            # y[k] needs x up to floor((k*down + delay) / up)
+            n_last = (n_avail * self.up - self._delay + self.down - 1) // self.down
+            n_last = max(n_last, self._n_out)
+        k = np.arange(self._n_out, n_last)
+
+        if not final:
+            self._n_in += block.shape[0]
+            keep = self._sub_len - 1
+            self._history = ext[ext.shape[0] - keep:] if keep else ext[:0]
+        self._n_out = n_last
+        if k.size == 0:
+            return np.empty(0, dtype=np.float32)
+
+        pos = k * self.down + self._delay
+        base = pos // self.up - ext_start
+        phase = pos % self.up
+        window = ext[base[:, None] - self._lags[None, :]]
+        return np.einsum("ij,ij->i", window, self._phases[phase]).astype(np.float32, copy=False)
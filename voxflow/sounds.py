@@ -4,6 +4,9 @@ Uses numpy to generate pleasant tones and sounddevice to play them.
 No external audio files needed — everything is generated programmatically.
 """
 import threading
+import time
+from contextlib import contextmanager
+
 import numpy as np
 
 
@@ -71,21 +74,83 @@ _SOUNDS = {
 }
 
 
+_resampled: dict[tuple[str, int], np.ndarray] = {}
+
+
+def waveform(name: str, sample_rate: int = _SAMPLE_RATE) -> np.ndarray:
+    """The exact samples of a sound effect, at the given rate (cached).
+
+    The recorder uses these to cancel our own chimes out of a recording.
+    """
+    key = (name, sample_rate)
+    if key not in _resampled:
+        sound = _SOUNDS[name]
+        if sample_rate != _SAMPLE_RATE:
+            from math import gcd
+            from scipy.signal import resample_poly
+            g = gcd(sample_rate, _SAMPLE_RATE)
+            sound = resample_poly(sound, sample_rate // g, _SAMPLE_RATE // g).astype(np.float32)
+        _resampled[key] = sound
+    return _resampled[key]
+
+
+# Chimes in flight vs. a PortAudio restart by the device registry
+_state_lock = threading.Lock()
+_playing = 0
+_restarting = False
+
+
+@contextmanager
+def quiesced():
+    """Keep chimes off PortAudio while it restarts.
+
+    Yields False (and touches nothing) while a chime is playing; otherwise
+    chimes requested meanwhile are skipped rather than played on a stream
+    the restart would kill.
+    """
+    global _restarting
+    with _state_lock:
+        busy = _playing > 0
+        if not busy:
+            _restarting = True
+    if busy:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        with _state_lock:
+            _restarting = False
+
+
 def play(name: str):
     """Play a named sound effect in a background thread.
 
     Args:
         name: One of 'start', 'stop', 'done', 'error'
+
+    Returns:
+        perf_counter time at which playback was requested, or None.
     """
     sound = _SOUNDS.get(name)
     if sound is None:
-        return
+        return None
 
     def _play():
+        global _playing
+        with _state_lock:
+            if _restarting:
+                return
+            _playing += 1
         try:
             import sounddevice as sd
             sd.play(sound, samplerate=_SAMPLE_RATE, blocking=True)
         except Exception:
             pass
+        finally:
+            with _state_lock:
+                _playing -= 1
 
+    requested = time.perf_counter()
     threading.Thread(target=_play, daemon=True).start()
+    return requested
@@ -0,0 +1,180 @@
+"""VoxFlow Spill Files - Crash-safe, disk-backed storage for long recordings.
+
+In spill mode the recorder streams 16 kHz int16 samples into a memory-mapped
+file while the user is speaking, instead of holding the whole recording as
+float32 in RAM. Memory stays bounded whatever the length, so the in-memory
+duration ceiling can be lifted, and a crash or forced quit mid-dictation no
+longer loses the audio: the next start finds the file and transcribes it.
+
+Each recording is a pair of files in <config dir>/recordings:
+    rec-<timestamp>.pcm   raw little-endian int16 mono samples
+    rec-<timestamp>.json  sidecar: sample rate, valid length, state
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from voxflow.config import get_config_dir
+
+# The file grows in steps of this many seconds of audio
+_GROW_SECONDS = 60
+# Persist samples + sidecar at least this often (seconds of audio)
+_SYNC_SECONDS = 1.0
+
+STATE_RECORDING = "recording"  # still being written (or the app died)
+STATE_CAPTURED = "captured"    # complete, waiting to be transcribed
+
+
+def get_spill_dir() -> Path:
+    """Directory holding spill files."""
+    spill_dir = get_config_dir() / "recordings"
+    spill_dir.mkdir(parents=True, exist_ok=True)
+    return spill_dir
+
+
+class SpillWriter:
+    """Appends float samples to a growing int16 memory-mapped file."""
+
+    def __init__(self, sample_rate: int = 16000, directory: Optional[Path] = None):
+        self.sample_rate = sample_rate
+        directory = directory or get_spill_dir()
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self.path = directory / f"rec-{stamp}.pcm"
+        self.meta_path = self.path.with_suffix(".json")
+        self.started = datetime.now().isoformat(timespec="seconds")
+
+        self._length = 0
+        self._synced = 0
+        self._grow = int(_GROW_SECONDS * sample_rate)
+        self._sync_every = int(_SYNC_SECONDS * sample_rate)
+        self._capacity = 0
+        self._mm: Optional[np.memmap] = None
+        # Readers copy out of the map while the writer may remap it to grow
+        self._map_lock = threading.Lock()
+        self.path.touch()
+        self._ensure_capacity(self._grow)
+        self._write_meta(STATE_RECORDING)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def write(self, samples: np.ndarray) -> int:
+        """Append float32 samples in [-1, 1]; returns the count written."""
+        n = samples.shape[0]
+        if n == 0:
+            return 0
+        self._ensure_capacity(self._length + n)
+        pcm = np.clip(samples, -1.0, 1.0) * 32767.0
+        self._mm[self._length:self._length + n] = pcm.astype(np.int16)
+        self._length += n
+        if self._length - self._synced >= self._sync_every:
+            self.sync()
+        return n
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Samples [start, end) written so far, as float32 (a copy)."""
+        with self._map_lock:
+            mm = self._mm
+            end = min(end, self._length)
+            if mm is None or end <= start:
+                return np.empty(0, dtype=np.float32)
+            return mm[start:end].astype(np.float32) / 32767.0
+
+    def sync(self):
+        """Flush dirty pages to disk, then record the new valid length."""
+        if self._mm is not None:
+            self._mm.flush()
+        self._synced = self._length
+        self._write_meta(STATE_RECORDING)
+
+    def finalize(self) -> np.ndarray:
+        """Close the file and return the recording as float32 audio.
+
+        The file is trimmed to its real length and marked as captured —
+        it stays on disk until the app discards it after transcription.
+        """
+        with self._map_lock:
+            if self._mm is not None:
+                self._mm.flush()
+                self._mm = None  # unmap before truncating (required on Windows)
+            with open(self.path, "r+b") as f:
+                f.truncate(self._length * 2)
+        self._synced = self._length
+        self._write_meta(STATE_CAPTURED)
+        return load_spill(self.path, self._length)
+
+    def _ensure_capacity(self, needed: int):
+        if needed <= self._capacity:
+            return
+        new_capacity = self._capacity
+        while new_capacity < needed:
+            new_capacity += self._grow
+        # No reader may hold the old map while the file is resized —
+        # truncating a mapped file fails on Windows
+        with self._map_lock:
+            if self._mm is not None:
+                self._mm.flush()
+                self._mm = None
+            with open(self.path, "r+b") as f:
+                f.truncate(new_capacity * 2)
+            self._mm = np.memmap(self.path, dtype="<i2", mode="r+", shape=(new_capacity,))
+            self._capacity = new_capacity
+
+    def _write_meta(self, state: str):
+        meta = {
+            "sample_rate": self.sample_rate,
+            "samples": self._synced,
+            "started": self.started,
+            "state": state,
+        }
+        tmp = self.meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, self.meta_path)
+
+
+def load_spill(path: Path, samples: Optional[int] = None) -> np.ndarray:
+    """Read a spill file back as float32 audio (only `samples` if given)."""
+    raw = np.fromfile(path, dtype="<i2", count=-1 if samples is None else samples)
+    return raw.astype(np.float32) / 32767.0
+
+
+def find_recoverable(directory: Optional[Path] = None) -> list[dict]:
+    """Spill files left behind by a crash or an unfinished transcription.
+
+    Returns dicts with path, sample_rate, started and the float32 audio,
+    oldest first. Unreadable leftovers are removed.
+    """
+    directory = directory or get_spill_dir()
+    found = []
+    for meta_path in sorted(directory.glob("rec-*.json")):
+        pcm_path = meta_path.with_suffix(".pcm")
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta.get("state") not in (STATE_RECORDING, STATE_CAPTURED):
+                continue
+            # A crash can leave unsynced samples past "samples" and
+            # preallocated zeros after them — only trust the synced part.
+            audio = load_spill(pcm_path, int(meta.get("samples", 0)))
+            found.append({
+                "path": pcm_path,
+                "sample_rate": int(meta.get("sample_rate", 16000)),
+                "started": meta.get("started", ""),
+                "audio": audio,
+            })
+        except (OSError, ValueError, TypeError):
+            discard(pcm_path)
+    return found
+
+
+def discard(path: Path):
+    """Delete a spill file and its sidecar (best-effort)."""
+    for p in (Path(path), Path(path).with_suffix(".json")):
+        try:
+            p.unlink()
+        except OSError:
+            pass
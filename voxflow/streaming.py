@@ -0,0 +1,247 @@
+"""VoxFlow Streaming Transcription - Decode while the key is still held.
+
+Without streaming, a 60 s dictation is decoded only after release, so the
+wait grows with the length of what was said. A StreamingSession runs next
+to a recording and finalises it piece by piece:
+
+- the capture-time VAD marks where pauses are; once enough speech has
+  piled up, the audio is cut in the middle of a pause and that chunk is
+  decoded in the background,
+- each chunk is decoded with the text so far as prompt context, and in
+  the language the first chunk detected,
+- on release only the tail after the last cut is left to decode.
+
+Time-to-text after release is then bounded by one chunk instead of the
+whole recording. Short dictations never reach a cut and are decoded in
+one piece, exactly as before.
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from voxflow.post_processor import post_process
+from voxflow.resampler import TARGET_RATE
+
+# Characters of already-decoded text passed as prompt context
+CONTEXT_CHARS = 200
+
+
+class StreamingSession:
+    """Chunked background decoding of one recording.
+
+    `recorder` provides live_length, live_audio() and live_spans();
+    `transcriber` provides transcribe_chunk().
+    """
+
+    def __init__(
+        self,
+        transcriber,
+        recorder,
+        language: str = "auto",
+        beam_size: int = 5,
+        task: str = "transcribe",
+        auto_correct: bool = True,
+        model_size: Optional[str] = None,
+        min_chunk: float = 8.0,
+        max_chunk: float = 20.0,
+        poll_interval: float = 0.3,
+    ):
+        self.transcriber = transcriber
+        self.recorder = recorder
+        self.language = language
+        self.beam_size = beam_size
+        self.task = task
+        self.auto_correct = auto_correct
+        self.model_size = model_size  # None = the transcriber's loaded model
+        self.sample_rate = TARGET_RATE
+        self.min_chunk = int(min_chunk * self.sample_rate)
+        self.max_chunk = int(max_chunk * self.sample_rate)
+        self.poll_interval = poll_interval
+
+        self._cut = 0  # samples before this are decoded (or being decoded)
+        self._chunks: list[dict] = []  # transcribe_chunk() results + offset
+        self._detected: Optional[str] = None
+        self._failed: Optional[Exception] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Decode time spent while recording vs. after release (seconds)
+        self.background_time = 0.0
+        self.tail_time = 0.0
+
+    @property
+    def decoded_seconds(self) -> float:
+        return self._cut / self.sample_rate
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def set_language(self, language: str):
+        """Language identified early (voxflow.langid) — used from the next chunk.
+
+        It overrides what a chunk detected on its own; chunks already
+        decoded in another language are decoded again by finish().
+        """
+        if self.language == "auto":
+            self._detected = language
+
+    def cancel(self):
+        """Stop without a result (recording discarded)."""
+        self._stop.set()
+
+    def stop(self):
+        """Stop cutting chunks — the recorder is about to move on to the
+        next recording. finish() still decodes everything after the last cut."""
+        self._stop.set()
+
+    def finish(
+        self,
+        audio: np.ndarray,
+        speech_spans: Optional[list] = None,
+        on_progress: Optional[Callable[[str], None]] = None,
+    ) -> dict:
+        """Decode what is left after the last cut and return the full result.
+
+        `audio` and `speech_spans` (seconds) are the final recording as
+        returned by AudioRecorder.stop(). Same dict as VoxTranscriber.transcribe().
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()  # at most the chunk in flight
+        if self._failed is not None:
+            raise RuntimeError(f"Błąd transkrypcji: {self._failed}") from self._failed
+
+        if on_progress:
+            on_progress("🔍 Transkrybuję końcówkę..." if self._chunks else "🔍 Transkrybuję...")
+        tail_spans = None
+        if speech_spans is not None:
+            start_s = self._cut / self.sample_rate
+            tail_spans = [(max(s, start_s) - start_s, e - start_s)
+                          for s, e in speech_spans if e > start_s]
+        tail = audio[self._cut:]
+        t0 = time.perf_counter()
+        try:
+            self._redecode_mismatched(audio, speech_spans)
+            if tail.shape[0] and tail_spans != []:
+                self._decode(tail, self._cut, tail_spans)
+        except Exception as e:
+            raise RuntimeError(f"Błąd transkrypcji: {e}") from e
+        self.tail_time = time.perf_counter() - t0
+        return self._result()
+
+    # ─── Background cutting ───────────────────────────────────────
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            cut = self._next_cut()
+            if cut is None or self._stop.is_set():
+                continue
+            audio = self.recorder.live_audio(self._cut, cut)
+            spans = [((max(s, self._cut) - self._cut) / self.sample_rate,
+                      (min(e, cut) - self._cut) / self.sample_rate)
+                     for s, e in self.recorder.live_spans() if e > self._cut and s < cut]
+            t0 = time.perf_counter()
+            try:
+                if spans:
+                    self._decode(np.array(audio, dtype=np.float32), self._cut, spans)
+            except Exception as e:
+                self._failed = e
+                return
+            self.background_time += time.perf_counter() - t0
+            self._cut = cut
+
+    def _next_cut(self) -> Optional[int]:
+        """Where to end the next chunk: inside a pause, once it is long enough."""
+        available = self.recorder.live_length
+        pause_ends = [e for _s, e in self.recorder.live_spans() if e > self._cut]
+        if not pause_ends:
+            return None
+        # Cut a little into the pause after the last finished span — the
+        # span closes only after the VAD's minimum silence, so it's there
+        cut = min(available, pause_ends[-1] + self.sample_rate // 10)
+        if cut - self._cut >= self.min_chunk:
+            return cut
+        if available - self._cut >= self.max_chunk and len(pause_ends) > 1:
+            return cut  # long run with few pauses: take what we have
+        return None
+
+    def _decode(self, audio: np.ndarray, offset: int, spans: Optional[list]):
+        language = self._detected or self.language
+        result = self.transcriber.transcribe_chunk(
+            audio,
+            language=language,
+            beam_size=self.beam_size,
+            task=self.task,
+            speech_spans=spans,
+            context=self._context(),
+            model_size=self.model_size,
+        )
+        if self._detected is None and self.language == "auto" and result["raw_text"]:
+            # Keep the whole dictation in one language
+            self._detected = result["language"]
+        result["offset"] = offset / self.sample_rate
+        self._chunks.append(result)
+
+    def _redecode_mismatched(self, audio: np.ndarray, speech_spans: Optional[list]):
+        """Decode again the chunks whose language isn't the settled one.
+
+        Chunks cut before early language ID answered were decoded in
+        whatever Whisper guessed for them — one dictation, one language.
+        """
+        if self.language != "auto" or self._detected is None:
+            return
+        if all(c["language"] == self._detected or not c["raw_text"] for c in self._chunks):
+            return
+        bounds = [int(round(c["offset"] * self.sample_rate)) for c in self._chunks] + [self._cut]
+        chunks, self._chunks = self._chunks, []
+        for chunk, start, end in zip(chunks, bounds, bounds[1:]):
+            spans = None
+            if speech_spans is not None:
+                start_s, end_s = start / self.sample_rate, end / self.sample_rate
+                spans = [(max(s, start_s) - start_s, min(e, end_s) - start_s)
+                         for s, e in speech_spans if e > start_s and s < end_s]
+            if chunk["language"] == self._detected or not chunk["raw_text"] or spans == []:
+                self._chunks.append(chunk)
+                continue
+            self._decode(audio[start:end], start, spans)
+
+    def _context(self) -> str:
+        text = " ".join(c["raw_text"] for c in self._chunks if c["raw_text"])
+        return text[-CONTEXT_CHARS:]
+
+    def _result(self) -> dict:
+        raw_text = " ".join(c["raw_text"] for c in self._chunks if c["raw_text"]).strip()
+        language = self._detected or (self._chunks[0]["language"] if self._chunks else "")
+        segments = []
+        for chunk in self._chunks:
+            for seg in chunk["segments"]:
+                segments.append({
+                    "start": seg["start"] + chunk["offset"],
+                    "end": seg["end"] + chunk["offset"],
+                    "text": seg["text"],
+                })
+        if self.auto_correct and raw_text:
+            text = post_process(
+                raw_text,
+                language=language,
+                fix_capitalization=True,
+                fix_punctuation=True,
+                remove_fillers=True,
+                fix_repetitions=True,
+                apply_corrections=True,
+            )
+        else:
+            text = raw_text
+        probs = [c["language_probability"] for c in self._chunks if c["raw_text"]]
+        return {
+            "text": text,
+            "raw_text": raw_text,
+            "language": language,
+            "language_probability": max(probs) if probs else 0.0,
+            "segments": segments,
+            "duration": sum(c["duration"] for c in self._chunks),
+            "translated": self.task == "translate",
+            "chunks": len(self._chunks),
+        }
@@ -6,29 +6,170 @@ Optimized for Polish and English with:
 - Audio normalization for consistent input levels
 - Post-processing auto-correction
 - Tuned VAD parameters for dictation
+- Speech spans from the capture-time VAD (skip / trim before decoding)
+- Chunk decoding with carried context for streaming (see voxflow.streaming)
+- Short-utterance mode: encoder context trimmed to the audio length
+- Batched decoding of long dictations, split on the capture-time VAD spans
+- Decode settings chosen per recording to meet a latency target
+- Watchdog that stops hallucination loops and re-decodes the rest
+- Selective re-decoding of low-confidence segments (see voxflow.redecode)
+- Several models resident at once, chosen per request (see voxflow.model_cache)
+- Routing by speech length: short utterances to a smaller model, cheaper tier
 """
+import copy
+import math
 import os
+import threading
+import time
+import weakref
 import numpy as np
 from typing import Optional
 from pathlib import Path
 
+from voxflow import memory, redecode
+from voxflow.decode_budget import LatencyController
+from voxflow.model_cache import ModelCache
 from voxflow.post_processor import post_process, get_initial_prompt
+from voxflow.resampler import TARGET_RATE, StreamingResampler, downmix
+from voxflow.vad import collect_speech
+from voxflow.watchdog import DecodeWatchdog
+
+# Whisper's fixed input window (seconds); the encoder always sees this much
+FULL_CONTEXT_S = 30.0
+# Audio context kept beyond the utterance in short-context mode (seconds)
+CONTEXT_MARGIN_S = 1.0
+# Accuracy guard: a short-context decode is kept only if every segment
+# clears these, otherwise the utterance is decoded again with 30 s
+SHORT_MIN_LOGPROB = -0.7
+SHORT_MAX_COMPRESSION = 2.0
+# Watchdog deadline: this many times the predicted decode time, at least
+# WATCHDOG_MIN_S (without an RTF estimate: WATCHDOG_MIN_S + 3 s per second)
+WATCHDOG_SLACK = 4.0
+WATCHDOG_MIN_S = 10.0
+# Longest clip handed to the batched pipeline (it trims to one 30 s window)
+BATCH_CLIP_S = 28.0
+# Beam for re-decoding weak segments with the same model
+REDECODE_BEAM = 8
+
+
+def synthetic_speech(seconds: float, sample_rate: int = TARGET_RATE) -> np.ndarray:
+    """Voiced buzz with a syllable-rate envelope — close enough to speech
+    for the encoder/decoder to do their usual amount of work."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 120 + 20 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    return (0.2 * voice * envelope).astype(np.float32)
+
+
+def batched_pipeline_class():
+    """faster-whisper's BatchedInferencePipeline, or None before 1.1."""
+    try:
+        from faster_whisper import BatchedInferencePipeline
+    except ImportError:
+        return None
+    return BatchedInferencePipeline
+
+
+def batch_clips(speech_spans: list, n_samples: int, max_s: float = BATCH_CLIP_S) -> list:
+    """Group speech spans (seconds) into clips of at most `max_s`.
+
+    Neighbouring spans share a clip while it fits — a clip keeps the short
+    pauses inside it, so phrases are decoded with their context — and a
+    span longer than `max_s` is split. Returns faster-whisper
+    clip_timestamps ({"start", "end"} in samples).
+    """
+    limit = int(max_s * TARGET_RATE)
+    clips: list[dict] = []
+    for start_s, end_s in speech_spans:
+        start = max(0, int(start_s * TARGET_RATE))
+        end = min(n_samples, int(end_s * TARGET_RATE))
+        if end <= start:
+            continue
+        if clips and end - clips[-1]["start"] <= limit:
+            clips[-1]["end"] = end
+            continue
+        while end - start > limit:
+            clips.append({"start": start, "end": start + limit})
+            start += limit
+        clips.append({"start": start, "end": end})
+    return clips
+
+
+class _ContextRejected(Exception):
+    """The CTranslate2 encoder refused a shortened input."""
 
 
 class VoxTranscriber:
     """Handles speech-to-text transcription using faster-whisper."""
 
-    def __init__(self, model_size: str = "small", device: str = "cpu", compute_type: str = "int8"):
+    def __init__(self, model_size: str = "small", device: str = "cpu", compute_type: str = "int8",
+                 cpu_threads: int = 0, num_workers: int = 2):
         self.model_size = model_size
         self.device = device
         self.compute_type = compute_type
+        self.cpu_threads = cpu_threads  # 0 = CTranslate2 default (all cores)
+        self.num_workers = num_workers
         self._model = None
         self._model_loaded = False
+        # Every model this transcriber loads lives here; the primary one is
+        # pinned, others (per-request sizes, re-decoding) come and go
+        self.models = ModelCache(self._create_model)
+        self._pinned_key: Optional[tuple] = None
+        # Short-context mode: utterances up to this long (seconds) are
+        # encoded with a window cut to their length. 0 = off
+        self.short_context_max = 0.0
+        # model -> whether it accepts a cut window; missing = not probed yet.
+        # Per model: cached and routed models each get their own answer
+        self._short_context_ok: "weakref.WeakKeyDictionary[object, bool]" = weakref.WeakKeyDictionary()
+        # Latency of the first and second warmup decode (seconds)
+        self.warmup_stats: dict = {}
+        self._swap_lock = threading.Lock()
+        # Recordings at least this long (seconds) are decoded in batches of
+        # VAD-split clips when the pipeline is available. 0 = never
+        self.batch_threshold = 0.0
+        self.batch_size = 8 if device == "cuda" else 4
+        self.latency = LatencyController()  # primary model
+        self._latencies: dict[str, LatencyController] = {}  # other sizes
+        # Stop looping decodes early; re-decode the rest unconditioned
+        self.watchdog_enabled = True
+        self.watchdog_retry = True
+        # Decode low-confidence segments again and splice them in; with
+        # redecode_model set ("medium", ...) that model does it, loaded on
+        # first use, otherwise this one with a wider beam
+        self.redecode_weak = False
+        self.redecode_model = ""
+        # Length routing: [{"max_s": 4.0, "model": "base", "tier": 3}, ...]
+        # — an utterance with at most max_s seconds of speech is decoded by
+        # that model at that decode tier or cheaper. Longer ones, or none
+        # set, use the loaded model
+        self.routes: list[dict] = []
 
     @property
     def is_loaded(self) -> bool:
         return self._model_loaded
 
+    @property
+    def latency_target(self) -> float:
+        """Release-to-text target (seconds) for transcribe(); 0 = fixed settings."""
+        return self.latency.target
+
+    @latency_target.setter
+    def latency_target(self, value: float):
+        self.latency.target = value
+        for controller in self._latencies.values():
+            controller.target = value
+
+    @property
+    def model_budget_mb(self) -> int:
+        """RAM (MB) resident models may take; 0 = one model besides the primary."""
+        return self.models.budget_mb
+
+    @model_budget_mb.setter
+    def model_budget_mb(self, value: int):
+        self.models.budget_mb = value
+
     @staticmethod
     def get_models_dir() -> Path:
         """Get the directory where models are cached."""
@@ -37,8 +178,14 @@ class VoxTranscriber:
         models_dir.mkdir(parents=True, exist_ok=True)
         return models_dir
 
-    def load_model(self, model_size: Optional[str] = None, on_progress: Optional[callable] = None):
-        """Load the Whisper model. Downloads on first use."""
+    def load_model(self, model_size: Optional[str] = None, on_progress: Optional[callable] = None,
+                   warmup: bool = True):
+        """Load the Whisper model. Downloads on first use.
+
+        With `warmup`, a short synthetic utterance is decoded before
+        returning, so the user's first dictation doesn't pay for
+        CTranslate2's lazy allocations and cold caches.
+        """
         if model_size:
             self.model_size = model_size
 
@@ -47,19 +194,18 @@ class VoxTranscriber:
             on_progress(f"⏳ Ładowanie modelu '{self.model_size}' ({size_info})...")
 
         try:
-            from faster_whisper import WhisperModel
-
-            models_dir = self.get_models_dir()
-
-            self._model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type=self.compute_type,
-                download_root=str(models_dir),
-                num_workers=2,  # Parallel decoding workers
-            )
+            key = self._key(self.model_size)
+            self._model = self.models.get(key, pin=True)  # instant if already resident
+            if self._pinned_key not in (None, key):
+                self.models.unpin(self._pinned_key, release=True)
+            self._pinned_key = key
             self._model_loaded = True
 
+            if warmup:
+                if on_progress:
+                    on_progress(f"🔥 Rozgrzewanie modelu '{self.model_size}'...")
+                self.warmup()
+
             if on_progress:
                 on_progress(f"✅ Model '{self.model_size}' gotowy")
 
@@ -70,6 +216,97 @@ class VoxTranscriber:
                 on_progress(error_msg)
             raise RuntimeError(error_msg) from e
 
+    def swap_model(self, model_size: str, on_progress: Optional[callable] = None):
+        """Replace the loaded model without a gap in service.
+
+        The new model is loaded and warmed up next to the current one,
+        which keeps serving meanwhile; only then are they switched (a
+        single reference swap — decodes already running finish on the old
+        model, which is freed when the last of them lets go). If memory
+        is short or loading fails, the current model stays in place and
+        RuntimeError is raised.
+        """
+        with self._swap_lock:
+            if not self._model_loaded:
+                self.load_model(model_size, on_progress=on_progress)
+                return
+            if self.device == "cpu" and self._key(model_size) not in self.models:
+                ok, needed, available = memory.fits(model_size, self.compute_type)
+                if not ok:
+                    msg = (f"Za mało pamięci RAM na model '{model_size}' "
+                           f"(potrzeba ~{needed} MB, wolne {available} MB)")
+                    if on_progress:
+                        on_progress(f"❌ {msg}")
+                    raise RuntimeError(msg)
+
+            staging = VoxTranscriber(
+                model_size=model_size, device=self.device, compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads, num_workers=self.num_workers,
+            )
+            staging.models = self.models  # a resident model loads instantly
+            staging._short_context_ok = self._short_context_ok
+            staging.short_context_max = self.short_context_max
+            staging.latency_target = self.latency_target
+            staging.load_model(on_progress=on_progress)  # raises; current model untouched
+
+            self._model = staging._model
+            self.warmup_stats = staging.warmup_stats
+            # RTF measured on the new model; the old one's is kept for later
+            self._latencies[self.model_size] = self.latency
+            self._latencies.pop(model_size, None)
+            self.latency = staging.latency
+            self.model_size = model_size
+            old_key, self._pinned_key = self._pinned_key, staging._pinned_key
+            if old_key not in (None, self._pinned_key):
+                # Load the new model, then release the old one
+                self.models.unpin(old_key, release=True)
+
+    def warmup(self, seconds: float = 2.0) -> dict:
+        """Decode synthetic audio twice; records cold vs. warm latency.
+
+        Uses the dictation settings (beam search, language detection, the
+        short-context path if enabled), so every code path of a real
+        request has run once. Failures are logged, never raised — a model
+        that loaded is usable even if warming it up went wrong.
+        """
+        self.warmup_stats = self._warm(self._model, self.model_size, self.latency, seconds)
+        return self.warmup_stats
+
+    def preload(self, model_size: str) -> bool:
+        """Make another model resident and warm for per-request use.
+
+        Blocking — call from a background thread. False if it didn't fit
+        in RAM or failed to load.
+        """
+        if model_size == self.model_size:
+            return self._model_loaded
+        try:
+            model = self.models.get(self._key(model_size))
+        except Exception as e:
+            print(f"[Transcriber] preloading '{model_size}' failed: {e}")
+            return False
+        self._warm(model, model_size, self._latency_for(model_size))
+        return True
+
+    def _warm(self, model, size: str, latency: LatencyController, seconds: float = 2.0) -> dict:
+        """Two synthetic decodes; seeds `latency` with the warm one."""
+        audio = self._prepare_audio(synthetic_speech(seconds))
+        kwargs = self._build_kwargs("auto", 5, "transcribe", vad_filter=False)
+        timings = []
+        try:
+            for _ in range(2):
+                t0 = time.perf_counter()
+                self._decode(audio, kwargs, model)
+                timings.append(time.perf_counter() - t0)
+        except Exception as e:
+            print(f"[Transcriber] warmup failed: {e}")
+            return {}
+        latency.reset()
+        latency.seed(timings[1], seconds)
+        print(f"[Transcriber] warmup '{size}': cold {timings[0] * 1000:.0f} ms, "
+              f"warm {timings[1] * 1000:.0f} ms")
+        return {"cold": timings[0], "warm": timings[1]}
+
     def transcribe(
         self,
         audio_data: np.ndarray,
@@ -79,6 +316,9 @@ class VoxTranscriber:
         auto_correct: bool = True,
         task: str = "transcribe",
         on_progress: Optional[callable] = None,
+        speech_spans: Optional[list] = None,
+        sample_rate: int = TARGET_RATE,
+        model_size: Optional[str] = None,
     ) -> dict:
         """Transcribe audio data to text with maximum quality.
 
@@ -90,13 +330,29 @@ class VoxTranscriber:
             auto_correct: Apply post-processing auto-correction
             task: "transcribe" (default) or "translate" (Whisper translates to English)
             on_progress: Callback for progress updates
+            speech_spans: (start, end) seconds of speech found while recording.
+                An empty list skips decoding entirely; otherwise the audio is
+                cut to the spans and faster-whisper's own VAD is not run again.
+                None = no capture-time VAD, use vad_enabled as before.
+            sample_rate: Rate of audio_data; anything but 16 kHz is resampled
+            model_size: Decode with this model instead of the loaded one
+                (from the model cache, loaded first if it isn't resident);
+                None lets the length routes choose
 
         Returns:
-            dict with keys: text, raw_text, language, segments, duration, translated
+            dict with keys: text, raw_text, language, segments, duration,
+            translated, model, route (the routing decision, or None), encoder_window (seconds of audio context used),
+            batched, decode_settings (what the latency controller chose),
+            watchdog (why decoding was cut short, or None),
+            redecode (weak regions decoded again, or None)
         """
         if not self._model_loaded or self._model is None:
             raise RuntimeError("Model nie jest załadowany. Wywołaj load_model() najpierw.")
 
+        if speech_spans == []:
+            # The capture VAD heard nothing — only a hint (a quiet mic can
+            # fool an energy gate): decode normally, Silero VAD decides
+            speech_spans, vad_enabled = None, True
         if audio_data is None or len(audio_data) == 0:
             return {
                 "text": "", "raw_text": "", "language": "",
@@ -104,6 +360,34 @@ class VoxTranscriber:
                 "duration": 0.0, "translated": False,
             }
 
+        route = None
+        if model_size is None and self.routes:
+            if speech_spans:
+                speech_s = sum(end - start for start, end in speech_spans)
+            else:
+                speech_s = len(audio_data) / sample_rate
+            route = self._route(speech_s)
+        try:
+            model, size = self._model_for(route["model"] if route else model_size, on_progress)
+        except RuntimeError as e:
+            if route is None:
+                raise
+            print(f"[Router] '{route['model']}' unavailable, using '{self.model_size}': {e}")
+            route = None
+            model, size = self._model, self.model_size
+        latency = self._latency_for(size)
+
+        if sample_rate != TARGET_RATE:
+            audio_data = self._resample(downmix(audio_data), sample_rate)
+
+        clips = None
+        if self._use_batched(audio_data.shape[0] / TARGET_RATE, speech_spans):
+            # Spans index the whole recording — cut it inside the pipeline
+            clips = batch_clips(speech_spans, audio_data.shape[0])
+        elif speech_spans:
+            # Trim leading/trailing (and long inner) silence up front
+            audio_data = collect_speech(audio_data, speech_spans)
+
         # ─── Prepare audio ────────────────────────────────────────
         audio_data = self._prepare_audio(audio_data)
 
@@ -111,60 +395,45 @@ class VoxTranscriber:
             on_progress("🔍 Transkrybuję...")
 
         # ─── Build transcription params ───────────────────────────
-        lang_code = None if language == "auto" else language
-
-        # Get initial_prompt — this is KEY for Polish quality
-        # It biases the model towards outputting proper Polish diacritics
-        initial_prompt = get_initial_prompt(language)
-
-        kwargs = {
-            "beam_size": beam_size,
-            "best_of": min(beam_size, 3),  # Sample multiple, pick best
-            "patience": 1.5,  # More patient beam search for accuracy
-            "initial_prompt": initial_prompt,
-            "condition_on_previous_text": True,  # Context from prev segments
-            "temperature": [0.0, 0.2, 0.4, 0.6, 0.8],  # Temperature fallback
-            "compression_ratio_threshold": 2.4,
-            "log_prob_threshold": -1.0,
-            "no_speech_threshold": 0.6,
-            "word_timestamps": False,
-            "task": task,  # "transcribe" or "translate" (-> EN)
-        }
-
-        if lang_code:
-            kwargs["language"] = lang_code
-
-        # VAD parameters tuned for dictation (short pauses OK)
-        if vad_enabled:
-            kwargs["vad_filter"] = True
-            kwargs["vad_parameters"] = {
-                "min_silence_duration_ms": 300,  # Short silence = still speaking
-                "speech_pad_ms": 250,  # Pad speech segments
-                "threshold": 0.35,  # Speech detection sensitivity
-                "min_speech_duration_ms": 100,  # Catch short words
-                "max_speech_duration_s": 60,  # Max segment length
-            }
+        # VAD off, or already done incrementally while recording
+        kwargs = self._build_kwargs(
+            language, beam_size, task, vad_filter=vad_enabled and speech_spans is None
+        )
+        if clips:
+            decoded_s = sum(c["end"] - c["start"] for c in clips) / TARGET_RATE
         else:
-            kwargs["vad_filter"] = False
+            decoded_s = audio_data.shape[0] / TARGET_RATE
+        plan = latency.plan(decoded_s, beam_size, min_tier=route["tier"] if route else 0)
+        for key in ("beam_size", "best_of", "patience", "temperature", "without_timestamps"):
+            kwargs[key] = plan[key]
 
         # ─── Transcribe ──────────────────────────────────────────
         try:
-            segments_gen, info = self._model.transcribe(audio_data, **kwargs)
-
-            segments = []
-            text_parts = []
-
-            for segment in segments_gen:
-                seg_text = segment.text.strip()
-                if seg_text:
-                    segments.append({
-                        "start": segment.start,
-                        "end": segment.end,
-                        "text": seg_text,
-                    })
-                    text_parts.append(seg_text)
-
-            raw_text = " ".join(text_parts)
+            t0 = time.perf_counter()
+            if clips:
+                segments, raw_text, info = self._decode_batched(audio_data, kwargs, clips, model)
+                meta = {"encoder_window": FULL_CONTEXT_S, "watchdog": None}
+            else:
+                segments, raw_text, info, meta = self._decode(audio_data, kwargs, model)
+            elapsed = time.perf_counter() - t0
+            latency.observe(plan, decoded_s, elapsed)
+            if route is not None:
+                # Confidence next to the choice, for tuning the thresholds
+                logprob = redecode.score(segments)
+                route = dict(route, model=size, tier=plan["tier"], avg_logprob=logprob)
+                print(f"[Router] {route['speech_s']:.1f}s of speech (≤ {route['max_s']:g}s) → "
+                      f"'{size}', tier {plan['tier']}, decoded in {elapsed:.2f}s, "
+                      f"avg logprob {logprob if logprob is not None else float('nan'):.2f}")
+            meta["redecode"] = None
+            if self.redecode_weak and plan["tier"] == 0:
+                # Not when the latency controller is already cutting corners
+                try:
+                    segments, meta["redecode"] = self._redecode_weak(
+                        audio_data, segments, kwargs, info.language, model, size)
+                except Exception as e:
+                    print(f"[Redecode] failed, keeping the first pass: {e}")
+                if meta["redecode"] and meta["redecode"]["replaced"]:
+                    raw_text = self._join(segments)
 
             # ─── Post-processing / auto-correction ────────────────
             if auto_correct and raw_text:
@@ -188,6 +457,11 @@ class VoxTranscriber:
                 "segments": segments,
                 "duration": info.duration,
                 "translated": task == "translate",
+                "model": size,
+                "route": route,
+                "batched": bool(clips),
+                "decode_settings": dict(plan, elapsed=elapsed),
+                **meta,
             }
 
             if on_progress:
@@ -209,15 +483,454 @@ class VoxTranscriber:
                 on_progress(error_msg)
             raise RuntimeError(error_msg) from e
 
+    def transcribe_chunk(
+        self,
+        audio_data: np.ndarray,
+        language: str = "auto",
+        beam_size: int = 5,
+        task: str = "transcribe",
+        speech_spans: Optional[list] = None,
+        context: str = "",
+        model_size: Optional[str] = None,
+    ) -> dict:
+        """Decode one piece of a longer dictation (see voxflow.streaming).
+
+        Like transcribe(), but without post-processing — the caller joins
+        the chunks and corrects the text once — and with `context` (the
+        text decoded so far) appended to the initial prompt, so a sentence
+        split across chunks keeps its casing, spelling and language.
+
+        Returns:
+            dict with keys: raw_text, language, language_probability,
+            segments (relative to the chunk), duration, encoder_window, watchdog
+        """
+        if not self._model_loaded or self._model is None:
+            raise RuntimeError("Model nie jest załadowany. Wywołaj load_model() najpierw.")
+        model, _size = self._model_for(model_size)
+        if speech_spans:
+            audio_data = collect_speech(audio_data, speech_spans)
+        audio_data = self._prepare_audio(audio_data)
+        kwargs = self._build_kwargs(language, beam_size, task, vad_filter=False)
+        if context:
+            kwargs["initial_prompt"] = f"{kwargs['initial_prompt']} {context}".strip()
+        segments, raw_text, info, meta = self._decode(audio_data, kwargs, model)
+        return {
+            "raw_text": raw_text,
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "segments": segments,
+            "duration": info.duration,
+            **meta,
+        }
+
+    def transcribe_draft(self, audio_data: np.ndarray, language: str = "auto",
+                         context: str = "") -> dict:
+        """Cheapest possible decode, for live previews.
+
+        Greedy, a single temperature and no conditioning between segments:
+        a wrong guess is simply replaced by the next draft, so none of the
+        accuracy machinery is worth its cost here.
+        """
+        if not self._model_loaded or self._model is None:
+            raise RuntimeError("Model nie jest załadowany. Wywołaj load_model() najpierw.")
+        kwargs = self._build_kwargs(language, 1, "transcribe", vad_filter=False)
+        kwargs.update({
+            "best_of": 1,
+            "patience": 1.0,
+            "temperature": 0.0,
+            "condition_on_previous_text": False,
+        })
+        if context:
+            kwargs["initial_prompt"] = f"{kwargs['initial_prompt']} {context}".strip()
+        segments, raw_text, info, meta = self._decode(self._prepare_audio(audio_data), kwargs)
+        return {
+            "raw_text": raw_text,
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "segments": segments,
+            "duration": info.duration,
+            **meta,
+        }
+
+    def detect_language(self, audio_data: np.ndarray, candidates: Optional[list] = None,
+                        model_size: Optional[str] = None) -> tuple[str, float]:
+        """Most likely language of 16 kHz audio among `candidates` (None = any).
+
+        Returns (language, probability renormalised over the candidates).
+        Costs one encoder pass over the first 30 s — nothing is decoded.
+        """
+        if not self._model_loaded or self._model is None:
+            raise RuntimeError("Model nie jest załadowany. Wywołaj load_model() najpierw.")
+        model, _size = self._model_for(model_size)
+        audio = self._prepare_audio(audio_data)
+        if hasattr(model, "detect_language"):  # faster-whisper 1.1+
+            _language, _probability, all_probs = model.detect_language(audio)
+        else:
+            # transcribe() detects the language up front; its segments are
+            # a lazy generator, closed here before anything is decoded
+            segments_gen, info = model.transcribe(audio, language=None, vad_filter=False)
+            if hasattr(segments_gen, "close"):
+                segments_gen.close()
+            all_probs = info.all_language_probs or [(info.language, info.language_probability)]
+        probs = dict(all_probs)
+        if candidates:
+            probs = {lang: probs.get(lang, 0.0) for lang in candidates}
+        language = max(probs, key=probs.get)
+        total = sum(probs.values())
+        return language, (probs[language] / total if total > 0 else 0.0)
+
+    @staticmethod
+    def _build_kwargs(language: str, beam_size: int, task: str, vad_filter: bool) -> dict:
+        """faster-whisper parameters tuned for dictation."""
+        lang_code = None if language == "auto" else language
+
+        # Get initial_prompt — this is KEY for Polish quality
+        # It biases the model towards outputting proper Polish diacritics
+        initial_prompt = get_initial_prompt(language)
+
+        kwargs = {
+            "beam_size": beam_size,
+            "best_of": min(beam_size, 3),  # Sample multiple, pick best
+            "patience": 1.5,  # More patient beam search for accuracy
+            "initial_prompt": initial_prompt,
+            "condition_on_previous_text": True,  # Context from prev segments
+            "temperature": [0.0, 0.2, 0.4, 0.6, 0.8],  # Temperature fallback
+            "compression_ratio_threshold": 2.4,
+            "log_prob_threshold": -1.0,
+            "no_speech_threshold": 0.6,
+            "word_timestamps": False,
+            "task": task,  # "transcribe" or "translate" (-> EN)
+        }
+
+        if lang_code:
+            kwargs["language"] = lang_code
+
+        # VAD parameters tuned for dictation (short pauses OK)
+        if vad_filter:
+            kwargs["vad_filter"] = True
+            kwargs["vad_parameters"] = {
+                "min_silence_duration_ms": 300,  # Short silence = still speaking
+                "speech_pad_ms": 250,  # Pad speech segments
+                "threshold": 0.35,  # Speech detection sensitivity
+                "min_speech_duration_ms": 100,  # Catch short words
+                "max_speech_duration_s": 60,  # Max segment length
+            }
+        else:
+            kwargs["vad_filter"] = False
+        return kwargs
+
+    def _decode(self, audio_data: np.ndarray, kwargs: dict,
+                model=None) -> tuple[list, str, object, dict]:
+        """Decode with the shortest safe encoder window, under the watchdog.
+
+        Returns (segments, raw_text, info, meta); meta has encoder_window
+        (seconds of audio context the encoder saw) and watchdog.
+        """
+        if model is None:
+            model = self._model  # one model per request, even across a swap
+        duration = audio_data.shape[0] / TARGET_RATE
+        window = self._context_window(duration, model)
+        if window:
+            try:
+                segments, info, report = self._run(model, audio_data, kwargs, window)
+            except _ContextRejected as e:
+                # The probe passed but this window was refused: never again
+                # for this model
+                self._short_context_ok[model] = False
+                print(f"[Transcriber] short context unsupported, using 30 s: {e}")
+            else:
+                if report is None and self._confident(segments, duration):
+                    return (segments, self._join(segments), info,
+                            {"encoder_window": window, "watchdog": None})
+        segments, info, report = self._run(model, audio_data, kwargs, None)
+        return (segments, self._join(segments), info,
+                {"encoder_window": FULL_CONTEXT_S, "watchdog": report})
+
+    def _redecode_weak(self, audio_data: np.ndarray, segments: list, kwargs: dict,
+                       language: str, model, size: str) -> tuple[list, Optional[dict]]:
+        """Decode the weak regions again; keep each one only if it improved.
+
+        Returns (segments, report or None when nothing was weak).
+        """
+        duration = audio_data.shape[0] / TARGET_RATE
+        regions = redecode.weak_regions(segments, duration)
+        if not regions:
+            return segments, None
+        t0 = time.perf_counter()
+        model, redecode_size = self._redecode_target(model, size)
+        retry = dict(kwargs, language=language, vad_filter=False,
+                     condition_on_previous_text=False, without_timestamps=False,
+                     temperature=[0.0, 0.2, 0.4, 0.6, 0.8])
+        retry.pop("vad_parameters", None)
+        retry.pop("clip_timestamps", None)
+        if redecode_size == size:
+            retry.update(beam_size=max(REDECODE_BEAM, kwargs["beam_size"]),
+                         best_of=5, patience=2.0)
+        prompt = get_initial_prompt(language)
+        replaced = 0
+        # Last region first, so the indices of earlier ones stay valid
+        for first, last, start, end in reversed(regions):
+            before = self._join(segments[max(0, first - 3):first])
+            retry["initial_prompt"] = f"{prompt} {before}".strip()
+            clip = audio_data[int(start * TARGET_RATE):int(end * TARGET_RATE)]
+            segments_gen, _info = model.transcribe(clip, **retry)
+            new = self._collect(segments_gen)
+            for seg in new:
+                seg["start"] = min(seg["start"] + start, end)
+                seg["end"] = min(seg["end"] + start, end)
+            if redecode.better(segments[first:last + 1], new):
+                segments = redecode.splice(segments, first, last, new)
+                replaced += 1
+        report = {
+            "regions": len(regions),
+            "replaced": replaced,
+            "seconds": sum(end - start for _f, _l, start, end in regions),
+            "model": redecode_size,
+            "elapsed": time.perf_counter() - t0,
+        }
+        print(f"[Redecode] {replaced}/{len(regions)} weak region(s) improved with "
+              f"'{redecode_size}' ({report['seconds']:.1f}s of {duration:.1f}s audio, "
+              f"{report['elapsed']:.2f}s)")
+        return segments, report
+
+    def _redecode_target(self, model, size: str) -> tuple[object, str]:
+        """(model, size) that re-decodes weak segments of a `size` decode.
+
+        The larger model comes from the model cache (loaded on first use);
+        if it doesn't fit in RAM or fails to load, the first pass's model
+        is used with a wider beam.
+        """
+        if not self.redecode_model or self.redecode_model == size:
+            return model, size
+        try:
+            return self.models.get(self._key(self.redecode_model)), self.redecode_model
+        except Exception as e:
+            print(f"[Redecode] '{self.redecode_model}' unavailable, "
+                  f"using '{size}' with a wider beam: {e}")
+            return model, size
+
+    def _route(self, speech_s: float) -> Optional[dict]:
+        """The tightest route covering `speech_s`, or None for the loaded model."""
+        for route in sorted(self.routes, key=lambda r: r["max_s"]):
+            if speech_s <= route["max_s"]:
+                return dict(route, speech_s=speech_s)
+        return None
+
+    def _key(self, model_size: str) -> tuple:
+        return (model_size, self.compute_type, self.device)
+
+    def _create_model(self, key: tuple):
+        """ModelCache loader."""
+        from faster_whisper import WhisperModel
+
+        size, compute_type, device = key
+        return WhisperModel(
+            size,
+            device=device,
+            compute_type=compute_type,
+            download_root=str(self.get_models_dir()),
+            cpu_threads=self.cpu_threads,
+            num_workers=self.num_workers,  # Parallel decoding workers
+        )
+
+    def _model_for(self, model_size: Optional[str],
+                   on_progress: Optional[callable] = None) -> tuple[object, str]:
+        """(model, size) a request runs on — the loaded model by default."""
+        if not model_size or model_size == self.model_size:
+            return self._model, self.model_size
+        key = self._key(model_size)
+        if key not in self.models and on_progress:
+            on_progress(f"⏳ Ładowanie modelu '{model_size}'...")
+        try:
+            return self.models.get(key), model_size
+        except Exception as e:
+            raise RuntimeError(f"Błąd ładowania modelu: {e}") from e
+
+    def _latency_for(self, size: str) -> LatencyController:
+        if size == self.model_size:
+            return self.latency
+        if size not in self._latencies:
+            self._latencies[size] = LatencyController(self.latency.target)
+        return self._latencies[size]
+
+    def _use_batched(self, duration: float, speech_spans: Optional[list]) -> bool:
+        return bool(
+            speech_spans and 0 < self.batch_threshold <= duration
+            and batched_pipeline_class() is not None
+        )
+
+    def _decode_batched(self, audio_data: np.ndarray, kwargs: dict,
+                        clips: list, model) -> tuple[list, str, object]:
+        """Decode all clips as batches; segments come back in order.
+
+        Clips are independent, so nothing is conditioned on the previous
+        text — the initial prompt still sets language and spelling.
+        """
+        pipeline = batched_pipeline_class()(model=model)
+        kwargs = dict(kwargs, vad_filter=False, clip_timestamps=clips,
+                      batch_size=self.batch_size, condition_on_previous_text=False)
+        kwargs.pop("vad_parameters", None)
+        segments_gen, info = pipeline.transcribe(audio_data, **kwargs)
+        segments = self._collect(segments_gen)
+        return segments, self._join(segments), info
+
+    def _context_window(self, duration: float, model) -> float:
+        """Encoder window for an utterance on `model`, or 0.0 for the full 30 s."""
+        if self.short_context_max <= 0 or duration > self.short_context_max:
+            return 0.0
+        if not self._short_context_supported(model):
+            return 0.0
+        window = float(math.ceil(duration + CONTEXT_MARGIN_S))
+        return window if window < FULL_CONTEXT_S else 0.0
+
+    def _short_context_supported(self, model) -> bool:
+        """Whether `model`'s encoder accepts fewer than 3000 frames.
+
+        Stock CTranslate2 builds the Whisper encoder for exactly 3000
+        frames. A tiny encode answers that once per model — during warmup
+        when the mode is on — so no dictation pays for a rejected decode.
+        """
+        ok = self._short_context_ok.get(model)
+        if ok is None:
+            try:
+                features = model.feature_extractor(np.zeros(TARGET_RATE, dtype=np.float32))
+                model.encode(features[..., :100])
+                ok = True
+            except Exception as e:
+                print(f"[Transcriber] short context unsupported, using 30 s: {e}")
+                ok = False
+            self._short_context_ok[model] = ok
+        return ok
+
+    @staticmethod
+    def _confident(segments: list, duration: float) -> bool:
+        """Accuracy guard for short-context decodes."""
+        if not segments:
+            return False
+        for seg in segments:
+            if (seg["avg_logprob"] < SHORT_MIN_LOGPROB
+                    or seg["compression_ratio"] > SHORT_MAX_COMPRESSION
+                    or seg["temperature"] > 0.0):  # the model had to fall back
+                return False
+        # Timestamps past the real audio: the model is guessing into padding
+        return segments[-1]["end"] <= duration + CONTEXT_MARGIN_S
+
+    def _run(self, model, audio_data: np.ndarray, kwargs: dict,
+             window: Optional[float]) -> tuple[list, object, Optional[dict]]:
+        """Run the model and collect the non-empty segments it keeps.
+
+        Returns (segments, info, watchdog report or None).
+        """
+        if window:
+            # faster-whisper pads every window to 3000 mel frames before
+            # encoding. A shallow per-call copy with its own encode() trims
+            # that padding, whisper.cpp audio_ctx-style, without touching
+            # the shared model other decodes may be using right now
+            shared, model = model, copy.copy(model)
+            model.encode = self._trimmed_encode(shared, int(window * 100))
+        duration = audio_data.shape[0] / TARGET_RATE
+        watchdog = self._watchdog(duration, kwargs)
+        segments_gen, info = model.transcribe(audio_data, **kwargs)
+        segments = self._collect(segments_gen, watchdog)
+        if watchdog is None:
+            return segments, info, None
+        report = watchdog.report()
+        if watchdog.tripped:
+            print(f"[Watchdog] stopped at {watchdog.cut:.1f}s ({watchdog.reason}), "
+                  f"{watchdog.dropped} segment(s) dropped")
+            if self.watchdog_retry:
+                tail = self._retry_tail(model, audio_data, kwargs, watchdog)
+                if tail is not None:
+                    segments += tail
+                    report["retried"] = True
+        return segments, info, report
+
+    def _watchdog(self, duration: float, kwargs: dict) -> Optional[DecodeWatchdog]:
+        if not self.watchdog_enabled:
+            return None
+        rtf = self.latency.rtf(duration)
+        if rtf is None:
+            deadline = WATCHDOG_MIN_S + 3.0 * duration
+        else:
+            deadline = max(WATCHDOG_MIN_S, WATCHDOG_SLACK * duration * rtf)
+        return DecodeWatchdog(
+            deadline=deadline,
+            compression_threshold=kwargs.get("compression_ratio_threshold", 2.4),
+        )
+
+    def _retry_tail(self, model, audio_data: np.ndarray, kwargs: dict,
+                    watchdog: DecodeWatchdog) -> Optional[list]:
+        """Decode the audio after the watchdog's cut once more.
+
+        Without conditioning, so the looping text isn't fed back in; after
+        a blown deadline also greedily, so the retry is cheap.
+        """
+        start = int(watchdog.cut * TARGET_RATE)
+        if audio_data.shape[0] - start < TARGET_RATE // 2:
+            return None
+        retry = dict(kwargs, condition_on_previous_text=False)
+        if watchdog.reason == "deadline":
+            retry.update(beam_size=1, best_of=1, patience=1.0, temperature=0.0)
+        guard = DecodeWatchdog(
+            deadline=watchdog.deadline,
+            compression_threshold=watchdog.compression_threshold,
+            no_speech_threshold=watchdog.no_speech_threshold,
+        )
+        segments_gen, _info = model.transcribe(audio_data[start:], **retry)
+        tail = self._collect(segments_gen, guard)
+        for seg in tail:
+            seg["start"] += watchdog.cut
+            seg["end"] += watchdog.cut
+        return tail
+
+    @staticmethod
+    def _collect(segments_gen, watchdog: Optional[DecodeWatchdog] = None) -> list:
+        """Non-empty segments, judged one by one as they are generated."""
+        segments = []
+        for segment in segments_gen:
+            seg_text = segment.text.strip()
+            if not seg_text:
+                continue
+            seg = {
+                "start": segment.start,
+                "end": segment.end,
+                "text": seg_text,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob,
+                "temperature": segment.temperature,
+            }
+            if watchdog is None or watchdog.accept(seg):
+                segments.append(seg)
+            if watchdog is not None and watchdog.tripped:
+                if watchdog.rewind:
+                    del segments[-watchdog.rewind:]
+                if hasattr(segments_gen, "close"):
+                    segments_gen.close()  # don't decode the rest of the windows
+                break
+        return segments
+
+    @staticmethod
+    def _join(segments: list) -> str:
+        return " ".join(seg["text"] for seg in segments)
+
+    @staticmethod
+    def _trimmed_encode(model, frames: int):
+        def encode(features):
+            try:
+                return model.encode(features[..., :frames])
+            except (ValueError, RuntimeError) as e:
+                raise _ContextRejected(str(e)) from e
+        return encode
+
     def _prepare_audio(self, audio_data: np.ndarray) -> np.ndarray:
         """Prepare audio for transcription: normalize, ensure format."""
         # Ensure float32
         if audio_data.dtype != np.float32:
             audio_data = audio_data.astype(np.float32)
 
-        # Ensure mono 1D
-        if audio_data.ndim > 1:
-            audio_data = audio_data[:, 0]
+        # Ensure mono 1D — average the channels, don't just drop them
+        audio_data = downmix(audio_data)
 
         # ─── Remove DC offset ────────────────────────────────────
         # Some microphones have a DC bias that hurts recognition.
@@ -238,10 +951,20 @@ class VoxTranscriber:
 
         return audio_data
 
+    @staticmethod
+    def _resample(audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Convert a whole clip to 16 kHz (the recorder does this live)."""
+        resampler = StreamingResampler(sample_rate, TARGET_RATE)
+        out = resampler.process(audio_data.astype(np.float32, copy=False))
+        return np.concatenate((out, resampler.flush()))
+
     def unload_model(self):
         """Unload the model to free memory."""
         self._model = None
         self._model_loaded = False
+        self.warmup_stats = {}
+        self.models.clear()
+        self._pinned_key = None
 
     @staticmethod
     def estimate_model_size(model_name: str) -> str:
@@ -0,0 +1,167 @@
+"""VoxFlow Streaming VAD - Incremental speech detection during capture.
+
+Runs block by block while the user is still speaking, so by the time the
+key is released the speech spans are already known. That lets the app:
+- trim leading/trailing silence before decoding,
+- turn off faster-whisper's own VAD (no second pass over the audio).
+Finding no speech at all is only a hint: the recording is then decoded
+with faster-whisper's VAD, as before.
+
+The detector is a frame-energy gate with an adaptive noise floor and
+hysteresis — cheap enough to run continuously on a laptop CPU. Audio is
+not normalized yet, so the absolute threshold can be relaxed to a share
+of the loudest frame so far (peak_ratio): a quiet or distant microphone
+is then judged by its noise floor alone.
+"""
+from typing import Optional
+
+import numpy as np
+
+
+class StreamingVAD:
+    """Incremental energy-based voice activity detector (16 kHz mono)."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        threshold: float = 0.01,
+        noise_ratio: float = 3.0,
+        min_speech_ms: int = 90,
+        min_silence_ms: int = 300,
+        peak_ratio: float = 0.0,
+    ):
+        self.sample_rate = sample_rate
+        self.frame = max(1, int(sample_rate * frame_ms / 1000))
+        self.threshold = threshold  # absolute RMS floor for speech
+        self.noise_ratio = noise_ratio  # speech must be this much above the noise floor
+        # > 0: the absolute floor drops to this share of the loudest frame
+        self.peak_ratio = peak_ratio
+        self._peak = 0.0
+        self._min_speech = max(1, round(min_speech_ms / frame_ms))
+        self._min_silence = max(1, round(min_silence_ms / frame_ms))
+
+        self._pending = np.empty(0, dtype=np.float32)  # leftover < one frame
+        self._frames_done = 0
+        self._noise: Optional[float] = None
+        self._in_speech = False
+        self._run = 0  # consecutive frames contradicting the current state
+        self._span_start = 0
+        self._last_speech_end = 0
+        self._spans: list[tuple[int, int]] = []
+
+    @property
+    def in_speech(self) -> bool:
+        return self._in_speech
+
+    @property
+    def samples_processed(self) -> int:
+        return self._frames_done * self.frame
+
+    @property
+    def trailing_silence(self) -> int:
+        """Samples since the last speech frame (since the start if none)."""
+        return self.samples_processed - self._last_speech_end
+
+    def process(self, samples: np.ndarray):
+        """Feed the next block of samples (any length)."""
+        if self._pending.size:
+            samples = np.concatenate((self._pending, samples))
+        n_frames = samples.shape[0] // self.frame
+        usable = n_frames * self.frame
+        self._pending = samples[usable:].copy()
+        if n_frames == 0:
+            return
+
+        frames = samples[:usable].reshape(n_frames, self.frame)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        for level in rms:
+            self._step(float(level))
+
+    def _step(self, level: float):
+        idx = self._frames_done
+        self._frames_done += 1
+
+        if self._noise is None:
+            # Never seed the floor above the absolute threshold: a recording
+            # may begin mid-word (pre-roll, hands-free trigger)
+            self._noise = min(level, self.threshold)
+        elif level < self._noise:
+            self._noise = level  # the floor drops immediately
+        threshold = self.threshold
+        if self.peak_ratio > 0:
+            self._peak = max(self._peak, level)
+            threshold = min(threshold, self._peak * self.peak_ratio)
+        is_speech = level > max(threshold, self._noise * self.noise_ratio)
+        if not is_speech:
+            # ...and rises slowly, only from non-speech frames
+            self._noise = self._noise * 0.98 + level * 0.02
+
+        if is_speech:
+            self._last_speech_end = (idx + 1) * self.frame
+        if is_speech != self._in_speech:
+            self._run += 1
+        else:
+            self._run = 0
+
+        if not self._in_speech and self._run >= self._min_speech:
+            self._in_speech = True
+            self._run = 0
+            self._span_start = (idx + 1 - self._min_speech) * self.frame
+        elif self._in_speech and self._run >= self._min_silence:
+            self._in_speech = False
+            self._run = 0
+            self._spans.append((self._span_start, self._last_speech_end))
+
+    def flush(self):
+        """Close a span that is still open at the end of the recording."""
+        if self._in_speech:
+            self._in_speech = False
+            self._run = 0
+            self._spans.append((self._span_start, self._last_speech_end))
+
+    def closed_spans(self) -> list[tuple[int, int]]:
+        """Spans that have already ended (safe to read from another thread)."""
+        return list(self._spans)
+
+    def spans(self) -> list[tuple[int, int]]:
+        """Finished speech spans as (start, end) sample offsets."""
+        spans = list(self._spans)
+        if self._in_speech:
+            spans.append((self._span_start, self._last_speech_end))
+        return spans
+
+    def spans_seconds(self) -> list[tuple[float, float]]:
+        sr = float(self.sample_rate)
+        return [(s / sr, e / sr) for s, e in self.spans()]
+
+
+def collect_speech(
+    audio: np.ndarray,
+    spans: list[tuple[float, float]],
+    sample_rate: int = 16000,
+    pad: float = 0.25,
+) -> np.ndarray:
+    """Cut audio down to the speech spans (in seconds), with padding.
+
+    Spans closer than twice the padding are merged, so short pauses inside
+    a sentence are kept intact; only leading/trailing silence and long
+    gaps are removed. Returns the input unchanged if there is nothing to
+    cut.
+    """
+    if not spans:
+        return audio
+    n = audio.shape[0]
+    pad_n = int(pad * sample_rate)
+    merged: list[list[int]] = []
+    for start, end in sorted(spans):
+        s = max(0, int(start * sample_rate) - pad_n)
+        e = min(n, int(end * sample_rate) + pad_n)
+        if merged and s <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    if len(merged) == 1:
+        s, e = merged[0]
+        return audio if (s == 0 and e == n) else audio[s:e]
+    return np.concatenate([audio[s:e] for s, e in merged])
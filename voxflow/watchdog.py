@@ -0,0 +1,118 @@
+"""VoxFlow Decode Watchdog - Stops Whisper when it starts looping.
+
+With condition_on_previous_text, a hallucinated phrase becomes the prompt
+for the next window, and Whisper can get stuck repeating it until the end
+of the recording — every window decoded at full cost, all of it garbage
+that post-processing only partly cleans up afterwards. The watchdog looks
+at each segment as the generator produces it:
+
+- repetition — the same text as the previous segments, or a short phrase
+  looping inside one segment,
+- compression ratio still above threshold after the temperature fallback,
+- text decoded confidently over what is almost surely silence — the
+  no-speech probability is very high, but the log-probability passes
+  faster-whisper's own filter (which only drops segments failing both),
+- a wall-clock deadline for the whole decode.
+
+Bad segments are dropped; a loop or a blown deadline stops the generator
+right there, and the transcriber can decode the rest of the audio again
+without conditioning on the text that caused the loop.
+"""
+import re
+import time
+from typing import Optional
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _norm(text: str) -> str:
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def _phrase_loop(words: list[str], max_n: int = 4, min_repeats: int = 4,
+                 min_word_repeats: int = 8) -> bool:
+    """True if some 1..max_n word phrase repeats back to back min_repeats times.
+
+    A single word needs min_word_repeats: "nie nie nie nie" is emphasis,
+    not a loop.
+    """
+    for n in range(1, max_n + 1):
+        repeats = min_word_repeats if n == 1 else min_repeats
+        for i in range(len(words) - n * repeats + 1):
+            phrase = words[i:i + n]
+            if all(words[i + k * n:i + (k + 1) * n] == phrase for k in range(1, repeats)):
+                return True
+    return False
+
+
+class DecodeWatchdog:
+    """Judges segments one by one; see accept()."""
+
+    def __init__(
+        self,
+        deadline: Optional[float] = None,
+        max_copies: int = 3,
+        compression_threshold: float = 2.4,
+        no_speech_threshold: float = 0.8,
+    ):
+        self.deadline = deadline  # seconds of wall clock, None = unlimited
+        self.max_copies = max_copies
+        self.compression_threshold = compression_threshold
+        # Stricter than faster-whisper's 0.6: the segment passed its logprob test
+        self.no_speech_threshold = no_speech_threshold
+
+        self.reason: Optional[str] = None  # why the decode was stopped
+        self.cut: Optional[float] = None   # audio time (s) to resume from
+        self.dropped = 0
+        self.rewind = 0  # already accepted segments that must go as well
+        self._started = time.perf_counter()
+        self._recent: list[tuple[str, float]] = []  # (text, start) accepted
+
+    @property
+    def tripped(self) -> bool:
+        return self.reason is not None
+
+    def accept(self, seg: dict) -> bool:
+        """Whether to keep `seg`; sets `reason` when decoding should stop."""
+        if self.deadline is not None and time.perf_counter() - self._started > self.deadline:
+            # Keep what just finished, stop before paying for more
+            self._stop("deadline", seg["end"])
+            return True
+
+        text = _norm(seg["text"])
+        if seg["compression_ratio"] > self.compression_threshold:
+            return self._drop("compression", seg)
+        if _phrase_loop(text.split()):
+            return self._drop("loop", seg)
+        if seg["no_speech_prob"] > self.no_speech_threshold:
+            # Words made up over silence; the rest of the audio may be fine
+            self.dropped += 1
+            return False
+
+        run = 0  # identical segments accepted right before this one
+        for prev, _start in reversed(self._recent):
+            if prev != text:
+                break
+            run += 1
+        if text and run + 1 >= self.max_copies:
+            # The loop began at the second copy: keep only the first
+            self.rewind = run - 1
+            self.dropped += run
+            self._stop("repetition", self._recent[-run + 1][1] if run > 1 else seg["start"])
+            return False
+        self._recent.append((text, seg["start"]))
+        return True
+
+    def _drop(self, reason: str, seg: dict) -> bool:
+        self.dropped += 1
+        self._stop(reason, seg["start"])
+        return False
+
+    def _stop(self, reason: str, at: float):
+        self.reason = reason
+        self.cut = at
+
+    def report(self) -> Optional[dict]:
+        if not self.tripped and not self.dropped:
+            return None
+        return {"reason": self.reason, "cut": self.cut, "dropped": self.dropped}
@@ -0,0 +1,409 @@
+"""VoxFlow Transcription Worker - Whisper in a separate process.
+
+Decoding in a thread of the UI process competes with Tk and the audio
+consumer for the GIL, and a model dropped with unload_model() rarely gives
+its memory back to the OS. With the worker process enabled, the
+WhisperModel lives in a child process instead:
+
+- audio is handed over through multiprocessing.shared_memory — one
+  memcpy into a shared block, nothing pickled — and the child decodes
+  straight from that block,
+- progress messages and results stream back over a pipe; several
+  requests can be in flight (the child runs each in its own thread, up to
+  the model's worker count),
+- if the child dies mid-decode it is restarted with the same model and
+  the request is retried once,
+- unloading ends the process, so the model's memory really is freed.
+
+RemoteTranscriber is a drop-in replacement for VoxTranscriber as far as
+the app, the job queue and StreamingSession are concerned.
+"""
+import itertools
+import multiprocessing
+import threading
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from voxflow import memory
+from voxflow.resampler import TARGET_RATE
+from voxflow.transcriber import VoxTranscriber
+
+
+class _WorkerDied(Exception):
+    """The child process exited before answering."""
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open a block the parent owns (and will unlink)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Spawned children share the parent's resource tracker, so the
+        # extra registration is a no-op and the parent's unlink clears it
+        return shared_memory.SharedMemory(name=name)
+
+
+def _serve(conn, settings: dict):
+    """Child process main loop: one thread per request."""
+    transcriber = VoxTranscriber(**settings["init"])
+    for name, value in settings["options"].items():
+        setattr(transcriber, name, value)
+    send_lock = threading.Lock()
+
+    def send(*msg):
+        with send_lock:
+            conn.send(msg)
+
+    def handle(op: str, req: int, payload: dict):
+        def on_progress(m: str):
+            send("progress", req, m)
+
+        try:
+            if op == "load":
+                transcriber.load_model(payload["model_size"], on_progress=on_progress,
+                                       warmup=payload["warmup"])
+                result = {"warmup_stats": transcriber.warmup_stats}
+            elif op == "preload":
+                result = transcriber.preload(payload["model_size"])
+            else:
+                shm = _attach(payload["shm"])
+                audio = None
+                try:
+                    audio = np.ndarray(payload["shape"], dtype=np.float32, buffer=shm.buf)
+                    if op == "transcribe":
+                        result = transcriber.transcribe(audio, on_progress=on_progress,
+                                                        **payload["kwargs"])
+                    elif op == "detect_language":
+                        result = transcriber.detect_language(audio, **payload["kwargs"])
+                    else:
+                        result = transcriber.transcribe_chunk(audio, **payload["kwargs"])
+                finally:
+                    audio = None  # no views may outlive the mapping
+                    try:
+                        shm.close()
+                    except BufferError:
+                        # A failed decode's traceback still holds a view;
+                        # the mapping goes with it — never mask the error
+                        pass
+            send("result", req, result)
+        except Exception as e:
+            send("error", req, str(e))
+
+    while True:
+        try:
+            op, req, payload = conn.recv()
+        except (EOFError, OSError):
+            break
+        if op == "quit":
+            break
+        if op == "set":
+            setattr(transcriber, payload["name"], payload["value"])
+            continue
+        threading.Thread(target=handle, args=(op, req, payload), daemon=True).start()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "on_progress")
+
+    def __init__(self, on_progress):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[Exception] = None
+        self.on_progress = on_progress
+
+
+class _Worker:
+    """One child process plus the thread reading its answers."""
+
+    def __init__(self, settings: dict):
+        ctx = multiprocessing.get_context("spawn")  # no forked Tk/PortAudio state
+        self._conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_serve, args=(child, settings),
+                                   name="voxflow-transcriber", daemon=True)
+        self.process.start()
+        child.close()
+        self._ids = itertools.count()
+        self._pending: dict[int, _Call] = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self.alive = True
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def call(self, op: str, payload: dict, on_progress=None):
+        call = _Call(on_progress)
+        with self._lock:
+            if not self.alive:
+                raise _WorkerDied("worker process is not running")
+            req = next(self._ids)
+            self._pending[req] = call
+        try:
+            self._send(op, req, payload)
+        except OSError as e:
+            self._fail_all(e)
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def set(self, name: str, value):
+        try:
+            self._send("set", -1, {"name": name, "value": value})
+        except OSError:
+            pass
+
+    def close(self, timeout: float = 2.0):
+        """End the process; its memory goes back to the OS."""
+        try:
+            self._send("quit", -1, None)
+        except OSError:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self._conn.close()
+
+    def retire(self):
+        """Close once the requests already running on it have finished."""
+        def wait_and_close():
+            while True:
+                with self._lock:
+                    calls = list(self._pending.values())
+                if not calls:
+                    break
+                for call in calls:
+                    call.done.wait()
+            self.close()
+        threading.Thread(target=wait_and_close, daemon=True).start()
+
+    def _send(self, op: str, req: int, payload):
+        with self._send_lock:
+            self._conn.send((op, req, payload))
+
+    def _read(self):
+        while True:
+            try:
+                kind, req, value = self._conn.recv()
+            except (EOFError, OSError) as e:
+                self._fail_all(e)
+                return
+            call = self._pending.get(req)
+            if call is None:
+                continue
+            if kind == "progress":
+                if call.on_progress:
+                    try:
+                        call.on_progress(value)
+                    except Exception:
+                        pass
+                continue
+            with self._lock:
+                self._pending.pop(req, None)
+            if kind == "error":
+                call.error = RuntimeError(value)
+            else:
+                call.result = value
+            call.done.set()
+
+    def _fail_all(self, cause: Exception):
+        with self._lock:
+            self.alive = False
+            calls, self._pending = list(self._pending.values()), {}
+        for call in calls:
+            call.error = _WorkerDied(f"proces transkrypcji zakończył się ({cause!r})")
+            call.done.set()
+
+
+class RemoteTranscriber:
+    """VoxTranscriber front end for a model running in a worker process."""
+
+    # Tuning attributes set by the app; mirrored into the worker process
+    OPTIONS = ("short_context_max", "batch_threshold", "latency_target",
+               "watchdog_enabled", "watchdog_retry", "redecode_weak", "redecode_model",
+               "model_budget_mb", "routes")
+
+    get_models_dir = staticmethod(VoxTranscriber.get_models_dir)
+    estimate_model_size = staticmethod(VoxTranscriber.estimate_model_size)
+
+    def __init__(self, model_size: str = "small", device: str = "cpu", compute_type: str = "int8",
+                 cpu_threads: int = 0, num_workers: int = 2):
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.warmup_stats: dict = {}
+        self.restarts = 0
+        self._options = {
+            "short_context_max": 0.0,
+            "batch_threshold": 0.0,
+            "latency_target": 0.0,
+            "watchdog_enabled": True,
+            "watchdog_retry": True,
+            "redecode_weak": False,
+            "redecode_model": "",
+            "model_budget_mb": 0,
+            "routes": [],
+        }
+        self._worker: Optional[_Worker] = None
+        self._lock = threading.Lock()  # load / swap / restart
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._worker is not None and self._worker.alive
+
+    def __getattr__(self, name):
+        # Only reached for attributes not found normally
+        options = self.__dict__.get("_options", {})
+        if name in options:
+            return options[name]
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name in self.OPTIONS:
+            self._options[name] = value
+            if self._worker is not None:
+                self._worker.set(name, value)
+        else:
+            super().__setattr__(name, value)
+
+    # ─── Model lifecycle ─────────────────────────────────────────
+
+    def load_model(self, model_size: Optional[str] = None, on_progress: Optional[callable] = None,
+                   warmup: bool = True):
+        """Start a worker process and load the model in it (blocking)."""
+        with self._lock:
+            if model_size:
+                self.model_size = model_size
+            old, self._worker = self._worker, None
+            if old is not None:
+                old.close()
+            self._worker = self._spawn(self.model_size, on_progress, warmup)
+
+    def swap_model(self, model_size: str, on_progress: Optional[callable] = None):
+        """Load `model_size` in a new process while the current one serves.
+
+        Switches once the new model is warm; the old process exits after
+        its running requests finish. On failure the current model stays.
+        """
+        with self._lock:
+            if self.is_loaded and self.device == "cpu":
+                ok, needed, available = memory.fits(model_size, self.compute_type)
+                if not ok:
+                    msg = (f"Za mało pamięci RAM na model '{model_size}' "
+                           f"(potrzeba ~{needed} MB, wolne {available} MB)")
+                    if on_progress:
+                        on_progress(f"❌ {msg}")
+                    raise RuntimeError(msg)
+            worker = self._spawn(model_size, on_progress, warmup=True)
+            old, self._worker = self._worker, worker
+            self.model_size = model_size
+            if old is not None:
+                old.retire()
+
+    def unload_model(self):
+        """End the worker process — the model's memory is returned to the OS."""
+        with self._lock:
+            old, self._worker = self._worker, None
+        if old is not None:
+            old.close()
+        self.warmup_stats = {}
+
+    def preload(self, model_size: str) -> bool:
+        """Make another model resident in the worker (see VoxTranscriber.preload)."""
+        worker = self._worker
+        if worker is None:
+            return False
+        try:
+            return worker.call("preload", {"model_size": model_size})
+        except Exception as e:
+            print(f"[Worker] preloading '{model_size}' failed: {e}")
+            return False
+
+    def _spawn(self, model_size: str, on_progress, warmup: bool) -> _Worker:
+        worker = _Worker({
+            "init": {
+                "model_size": model_size,
+                "device": self.device,
+                "compute_type": self.compute_type,
+                "cpu_threads": self.cpu_threads,
+                "num_workers": self.num_workers,
+            },
+            "options": dict(self._options),
+        })
+        try:
+            stats = worker.call("load", {"model_size": model_size, "warmup": warmup},
+                                on_progress=on_progress)
+        except Exception as e:
+            worker.close()
+            msg = str(e) if isinstance(e, RuntimeError) else f"Błąd ładowania modelu: {e}"
+            raise RuntimeError(msg) from e
+        self.warmup_stats = stats["warmup_stats"]
+        return worker
+
+    def _restart(self, dead: _Worker):
+        """Replace a crashed worker (once, however many requests noticed)."""
+        with self._lock:
+            if self._worker is not dead:
+                return  # already restarted, swapped or unloaded
+            self._worker = None
+            dead.close(timeout=0.5)
+            self.restarts += 1
+            print(f"[Worker] transcription process died — restarting ({self.restarts})")
+            self._worker = self._spawn(self.model_size, None, warmup=False)
+
+    # ─── Requests ────────────────────────────────────────────────
+
+    def transcribe(self, audio_data: np.ndarray, language: str = "auto", beam_size: int = 5,
+                   vad_enabled: bool = True, auto_correct: bool = True, task: str = "transcribe",
+                   on_progress: Optional[callable] = None, speech_spans: Optional[list] = None,
+                   sample_rate: int = TARGET_RATE, model_size: Optional[str] = None) -> dict:
+        """Same contract as VoxTranscriber.transcribe(), decoded in the worker."""
+        return self._request("transcribe", audio_data, {
+            "language": language, "beam_size": beam_size, "vad_enabled": vad_enabled,
+            "auto_correct": auto_correct, "task": task, "speech_spans": speech_spans,
+            "sample_rate": sample_rate, "model_size": model_size,
+        }, on_progress)
+
+    def transcribe_chunk(self, audio_data: np.ndarray, language: str = "auto", beam_size: int = 5,
+                         task: str = "transcribe", speech_spans: Optional[list] = None,
+                         context: str = "", model_size: Optional[str] = None) -> dict:
+        """Same contract as VoxTranscriber.transcribe_chunk(), decoded in the worker."""
+        return self._request("transcribe_chunk", audio_data, {
+            "language": language, "beam_size": beam_size, "task": task,
+            "speech_spans": speech_spans, "context": context, "model_size": model_size,
+        }, None)
+
+    def detect_language(self, audio_data: np.ndarray, candidates: Optional[list] = None,
+                        model_size: Optional[str] = None) -> tuple[str, float]:
+        """Same contract as VoxTranscriber.detect_language(), run in the worker."""
+        return self._request("detect_language", audio_data, {
+            "candidates": candidates, "model_size": model_size,
+        }, None)
+
+    def _request(self, op: str, audio_data: np.ndarray, kwargs: dict, on_progress) -> dict:
+        if audio_data is None:
+            audio_data = np.zeros(0, dtype=np.float32)
+        audio = np.asarray(audio_data, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+        try:
+            np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[...] = audio
+            payload = {"shm": shm.name, "shape": audio.shape, "kwargs": kwargs}
+            for attempt in range(2):
+                worker = self._worker
+                if worker is None:
+                    raise RuntimeError("Model nie jest załadowany. Wywołaj load_model() najpierw.")
+                try:
+                    return worker.call(op, payload, on_progress=on_progress)
+                except _WorkerDied as e:
+                    if attempt:
+                        raise RuntimeError(f"Błąd transkrypcji: {e}") from e
+                    try:
+                        self._restart(worker)
+                    except RuntimeError as restart_error:
+                        raise RuntimeError(f"Błąd transkrypcji: {e}") from restart_error
+        finally:
+            shm.close()
+            shm.unlink()